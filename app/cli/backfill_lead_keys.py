@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Populate the normalized dedup columns (phone_normalized, email_normalized,
+email_local, name_normalized) for leads created before de-duplication existed.
+
+Usage:
+    python -m app.cli.backfill_lead_keys [--batch-size 5000]
+"""
+
+import argparse
+
+from sqlalchemy import bindparam, select, update
+
+from app.core.database import SessionLocal
+from app.models.lead import Lead
+from app.services import lead_dedup
+
+import app.models  # noqa: F401  (register all mappers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    leads = Lead.__table__
+    stmt = update(leads).where(leads.c.id == bindparam("b_id")).values(
+        phone_normalized=bindparam("b_phone"),
+        email_normalized=bindparam("b_email"),
+        email_local=bindparam("b_email_local"),
+        name_normalized=bindparam("b_name"),
+    )
+    db = SessionLocal()
+    total = 0
+    last_id = None
+    try:
+        while True:
+            # Keyset pagination on the primary key keeps every batch an index range scan
+            q = select(Lead.id, Lead.customer_name, Lead.phone, Lead.email).order_by(Lead.id).limit(args.batch_size)
+            if last_id is not None:
+                q = q.where(Lead.id > last_id)
+            rows = db.execute(q).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                keys = lead_dedup.LeadKeys.build(row.customer_name, row.phone, row.email)
+                params.append({
+                    "b_id": row.id, "b_phone": keys.phone, "b_email": keys.email,
+                    "b_email_local": keys.email_local, "b_name": keys.name
+                })
+            db.execute(stmt, params)
+            db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"Backfilled {total} leads")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
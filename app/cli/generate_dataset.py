@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic, referentially consistent dataset at production scale.
+
+Every tenant is built independently by a worker process from its own RNG stream
+(seed + tenant index), so the data is identical for a given --seed and --scale
+whatever --workers is (dates are relative to today). Rows are streamed into Postgres with COPY, parents first,
+one transaction per tenant.
+
+Per tenant: loan products, agents and customers (password --password), leads with
+follow-up dates, agent-sourced applications with documents, one loan application
+per customer with documents, and for approved ones a disbursed loan with its EMI
+schedule and the payments made so far (some loans overdue, some completed).
+--scale 1 is 4 tenants x 2500 customers, roughly 450k rows; size grows linearly.
+
+Also writes a manifest of customer logins with an active loan for benchmarks/load.py.
+
+Usage:
+    python -m app.cli.generate_dataset [--scale 1] [--seed 42] [--workers 4] [--create-schema] [--truncate]
+                                       [--manifest benchmarks/manifest.json]
+"""
+
+import argparse
+import csv
+import enum
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core import finance
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.core.security import hash_password
+from app.models import (
+    Application, ApplicationDocument, Lead, Loan, LoanApplication, LoanDocument, LoanPayment, LoanProduct,
+    EMISchedule, Tenant, User
+)
+from app.models.application import ApplicationStatus
+
+import app.models  # noqa: F401  (register all mappers)
+
+TENANTS_PER_SCALE = 4
+AGENTS_PER_TENANT = 20
+CUSTOMERS_PER_TENANT = 2500
+LEADS_PER_AGENT = 50
+AGENT_APPLICATION_RATE = 0.3
+
+GENERATED_TABLES = [
+    m.__table__ for m in (Tenant, LoanProduct, User, Lead, Application, ApplicationDocument, LoanApplication,
+                          LoanDocument, Loan, EMISchedule, LoanPayment)
+]
+
+LOAN_TYPES = ["Personal Loan", "Business Loan", "Home Loan", "Car Loan"]
+FIRST_NAMES = ["Asha", "Vikram", "Meera", "Rahul", "Priya", "Arjun", "Kavya", "Rohan", "Divya", "Karan",
+               "Neha", "Aditya", "Sneha", "Manish", "Pooja", "Siddharth", "Anjali", "Nikhil", "Ritu", "Varun"]
+LAST_NAMES = ["Rao", "Singh", "Iyer", "Gupta", "Nair", "Shah", "Menon", "Das", "Patel", "Reddy",
+              "Kumar", "Joshi", "Verma", "Pillai", "Chopra", "Bose", "Kulkarni", "Mehta", "Sinha", "Jain"]
+APPLICATION_STATUSES = [("approved", 60), ("under_review", 20), ("documents_pending", 10), ("rejected", 8), ("cancelled", 2)]
+LEAD_STATUSES = [("new", 40), ("contacted", 30), ("qualified", 15), ("converted", 10), ("lost", 5)]
+
+# Smallest valid PDF; every generated document points at one copy of it
+SAMPLE_PDF = (
+    b"%PDF-1.1\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class CopyWriter:
+    """Buffers rows per table as CSV and COPYs them, parents first, once flush_bytes are pending"""
+
+    def __init__(self, cursor, flush_bytes: int = 8 << 20):
+        self.cursor = cursor
+        self.flush_bytes = flush_bytes
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, table, row: dict) -> None:
+        entry = self.buffers.get(table)
+        if entry is None:
+            buf = io.StringIO()
+            entry = self.buffers[table] = (buf, csv.writer(buf), list(row))
+        buf, writer, columns = entry
+        writer.writerow([_csv_value(row[c]) for c in columns])
+        self.counts[table.name] = self.counts.get(table.name, 0) + 1
+        if buf.tell() >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in Base.metadata.sorted_tables:
+            entry = self.buffers.get(table)
+            if entry is None or entry[0].tell() == 0:
+                continue
+            buf, _, columns = entry
+            buf.seek(0)
+            self.cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+            buf.seek(0)
+            buf.truncate()
+
+
+def _weighted(rng: random.Random, choices) -> str:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def _add_months(start: date, months: int) -> date:
+    index = start.year * 12 + start.month - 1 + months
+    return date(index // 12, index % 12 + 1, min(start.day, 28))
+
+
+def _at(day: date, rng: random.Random) -> datetime:
+    return datetime.combine(day, dt_time(rng.randrange(9, 19), rng.randrange(60)), tzinfo=timezone.utc)
+
+
+def generate_tenant(index: int, seed: int, customers: int, password_hash: str, document_path: str,
+                    manifest_limit: int) -> tuple:
+    """Build one tenant's rows and COPY them in a single transaction; returns (row counts, manifest entries)"""
+    rng = random.Random(f"{seed}:{index}")
+
+    def uid() -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    today = date.today()
+    manifest = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        out = CopyWriter(cursor)
+
+        tenant_id = uid()
+        out.add(Tenant.__table__, {"id": tenant_id, "name": f"Tenant {index:04d}", "domain": f"t{index}.example.test",
+                                   "logo_url": None, "theme": {}, "config": {}})
+        products = []
+        for loan_type in LOAN_TYPES:
+            product = {
+                "id": uid(), "tenant_id": tenant_id, "name": loan_type, "description": f"{loan_type} for tenant {index}",
+                "interest_rate": rng.choice([10.5, 11.25, 12.0, 13.5, 14.75]), "min_amount": 50_000,
+                "max_amount": 5_000_000, "tenure_months": [12, 24, 36, 48, 60], "active": True
+            }
+            products.append(product)
+            out.add(LoanProduct.__table__, {**product, "tenure_months": "{12,24,36,48,60}"})
+
+        def person(role: str, n: int) -> dict:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            return {
+                "id": uid(), "tenant_id": tenant_id, "name": f"{first} {last}",
+                "email": f"{role}{n}.t{index}@example.com", "phone": f"9{rng.randrange(10**9):09d}",
+                "password_hash": password_hash, "role": role, "is_active": True, "is_verified": True, "meta": {},
+                "created_at": _at(today - timedelta(days=rng.randrange(30, 1500)), rng)
+            }
+
+        agents = [person("agent", n) for n in range(AGENTS_PER_TENANT)]
+        for agent in agents:
+            out.add(User.__table__, agent)
+
+        for agent in agents:
+            for _ in range(LEADS_PER_AGENT):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                created = _at(today - timedelta(days=rng.randrange(0, 365)), rng)
+                status = _weighted(rng, LEAD_STATUSES)
+                phone = f"9{rng.randrange(10**9):09d}"
+                email = f"{first}.{last}{rng.randrange(10**4)}@mail.example.com".lower()
+                out.add(Lead.__table__, {
+                    "id": uid(), "tenant_id": tenant_id, "agent_id": agent["id"], "customer_name": f"{first} {last}",
+                    "phone": phone, "email": email, "source": rng.choice(["web", "referral", "walk_in", "campaign"]),
+                    "status": status, "notes": None,
+                    "next_followup": _at(today + timedelta(days=rng.randrange(1, 30)), rng)
+                    if status in ("new", "contacted", "qualified") else None,
+                    "phone_normalized": phone[-10:], "email_normalized": email, "email_local": email.split("@")[0],
+                    "name_normalized": f"{first} {last}".lower(), "duplicate_of": None,
+                    "created_at": created.replace(tzinfo=None), "updated_at": created.replace(tzinfo=None)
+                })
+
+        for n in range(customers):
+            customer = person("customer", n)
+            out.add(User.__table__, customer)
+            product = rng.choice(products)
+            amount = rng.randrange(50_000, 2_000_000, 5_000)
+            tenure = rng.choice(product["tenure_months"])
+            applied = today - timedelta(days=rng.randrange(1, 1500))
+
+            if rng.random() < AGENT_APPLICATION_RATE:
+                application_id = uid()
+                out.add(Application.__table__, {
+                    "id": application_id, "tenant_id": tenant_id, "user_id": customer["id"],
+                    "agent_id": rng.choice(agents)["id"], "loan_product_id": product["id"], "amount_requested": amount,
+                    "tenure": tenure, "status": rng.choice(list(ApplicationStatus)), "notes": None,
+                    "created_at": _at(applied, rng)
+                })
+                out.add(ApplicationDocument.__table__, {
+                    "id": uid(), "application_id": application_id, "uploaded_by": customer["id"], "document_type": "pan",
+                    "file_url": document_path, "mime_type": "application/pdf", "size_bytes": len(SAMPLE_PDF)
+                })
+
+            status = _weighted(rng, APPLICATION_STATUSES)
+            loan_application_id = uid()
+            out.add(LoanApplication.__table__, {
+                "id": loan_application_id, "user_id": customer["id"], "reference_number": f"CRD{index:04d}{n:08d}",
+                "loan_type": product["name"], "requested_amount": amount, "purpose": rng.choice(
+                    ["home renovation", "education", "working capital", "vehicle purchase", "medical", "wedding"]),
+                "employment_type": rng.choice(["salaried", "self_employed", "business"]),
+                "monthly_income": max(15_000, amount // rng.randrange(20, 60)), "existing_emis": 0,
+                "current_step": 3, "status": status, "application_data": {}, "created_at": _at(applied, rng)
+            })
+            document_ids = []
+            for doc_type in ("aadhar", "pan", "income_proof"):
+                document_ids.append(uid())
+                out.add(LoanDocument.__table__, {
+                    "id": document_ids[-1], "application_id": loan_application_id, "user_id": customer["id"],
+                    "document_type": doc_type, "file_name": f"{doc_type}.pdf", "file_path": document_path,
+                    "status": "verified" if status == "approved" else "uploaded"
+                })
+            if status != "approved":
+                continue
+
+            # Disbursed a week after applying; instalments fall due monthly from the month after
+            disbursed = applied + timedelta(days=7)
+            plan = finance.amortize(amount, product["interest_rate"], tenure)
+            due_dates = [_add_months(disbursed, k) for k in range(1, tenure + 1)]
+            fallen_due = sum(1 for d in due_dates if d <= today)
+            missed = min(fallen_due, rng.randrange(1, 4)) if rng.random() < 0.05 else 0
+            paid = fallen_due - missed
+            loan_id = uid()
+            loan_status = "completed" if paid == tenure else "overdue" if missed else "active"
+            out.add(Loan.__table__, {
+                "id": loan_id, "user_id": customer["id"], "account_number": f"LN{index:04d}{n:08d}",
+                "loan_type": product["name"], "principal_amount": amount, "disbursed_amount": amount,
+                "outstanding_balance": plan.schedule[paid - 1].balance if paid else plan.principal,
+                "monthly_emi": plan.emi, "interest_rate": product["interest_rate"], "tenure_months": tenure,
+                "tenure_remaining": tenure - paid, "next_due_date": due_dates[min(paid, tenure - 1)],
+                "status": loan_status, "created_at": _at(disbursed, rng)
+            })
+            for row, due in zip(plan.schedule, due_dates):
+                is_paid = row.number <= paid
+                out.add(EMISchedule.__table__, {
+                    "id": uid(), "loan_id": loan_id, "emi_number": row.number, "due_date": due,
+                    "emi_amount": row.emi, "principal_component": row.principal, "interest_component": row.interest,
+                    "penalty_component": 0, "paid_amount": row.emi if is_paid else 0, "is_paid": is_paid,
+                    "payment_date": due if is_paid else None
+                })
+                if is_paid:
+                    out.add(LoanPayment.__table__, {
+                        "id": uid(), "loan_id": loan_id, "payment_date": due, "amount_paid": row.emi,
+                        "principal_component": row.principal, "interest_component": row.interest,
+                        "penalty_component": 0, "prepayment_component": 0, "payment_type": "emi",
+                        "payment_method": rng.choice(["bank_transfer", "upi", "card"]),
+                        "payment_reference": f"TXN{rng.randrange(10**12):012d}", "status": "paid"
+                    })
+            if loan_status == "active" and tenure - paid > 6 and len(manifest) < manifest_limit:
+                manifest.append({
+                    "email": customer["email"], "user_id": str(customer["id"]), "loan_id": str(loan_id),
+                    "monthly_emi": plan.emi, "document_ids": [str(d) for d in document_ids]
+                })
+
+        out.flush()
+        raw.commit()
+        return out.counts, manifest
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def _worker_init():
+    engine.dispose(close=False)  # never share the parent's pooled connections
+
+
+def _run(job):
+    return generate_tenant(*job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--tenants", type=int, default=None, help=f"default: {TENANTS_PER_SCALE} x scale")
+    parser.add_argument("--customers", type=int, default=CUSTOMERS_PER_TENANT, help="customers per tenant")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--password", default="Bench@12345")
+    parser.add_argument("--manifest", default="benchmarks/manifest.json")
+    parser.add_argument("--manifest-users", type=int, default=1000)
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables first")
+    parser.add_argument("--truncate", action="store_true", help="empty the generated tables first")
+    args = parser.parse_args()
+
+    tenants = args.tenants or max(1, math.ceil(TENANTS_PER_SCALE * args.scale))
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+    if args.truncate:
+        with engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {', '.join(t.name for t in GENERATED_TABLES)} CASCADE"))
+
+    document_dir = os.path.join(settings.UPLOAD_DIR, "generated")
+    os.makedirs(document_dir, exist_ok=True)
+    document_path = os.path.abspath(os.path.join(document_dir, "sample.pdf"))
+    with open(document_path, "wb") as f:
+        f.write(SAMPLE_PDF)
+
+    per_tenant_manifest = math.ceil(args.manifest_users / tenants)
+    password_hash = hash_password(args.password)  # bcrypt once, not per user
+    jobs = [(i, args.seed, args.customers, password_hash, document_path, per_tenant_manifest) for i in range(tenants)]
+
+    started = time.perf_counter()
+    totals, manifest = {}, []
+    engine.dispose()
+    with multiprocessing.Pool(min(args.workers, tenants), initializer=_worker_init) as pool:
+        for done, (counts, entries) in enumerate(pool.imap(_run, jobs), start=1):
+            for table, n in counts.items():
+                totals[table] = totals.get(table, 0) + n
+            manifest.extend(entries)
+            rows = sum(totals.values())
+            print(f"\r{done}/{tenants} tenants, {rows} rows, {rows / (time.perf_counter() - started):,.0f} rows/s",
+                  end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print()
+
+    os.makedirs(os.path.dirname(args.manifest) or ".", exist_ok=True)
+    with open(args.manifest, "w") as f:
+        json.dump({"seed": args.seed, "scale": args.scale, "password": args.password,
+                   "users": manifest[:args.manifest_users]}, f, indent=1)
+    for table in GENERATED_TABLES:
+        print(f"{table.name:24} {totals.get(table.name, 0):>12,}")
+    print(f"{sum(totals.values()):,} rows in {elapsed:.1f}s; manifest of {min(len(manifest), args.manifest_users)} "
+          f"logins -> {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Bulk import leads from a CSV or NDJSON file.
+
+Usage:
+    python -m app.cli.import_leads leads.csv --tenant-id <uuid> [--agent-id <uuid>]
+        [--format csv|ndjson] [--batch-size 5000] [--errors-out errors.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.services import lead_service
+
+import app.models  # noqa: F401  (register all mappers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV (with header) or NDJSON file; '-' reads stdin")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="inferred from the file name if omitted")
+    parser.add_argument("--tenant-id", help="tenant for every row (overrides any tenant_id column)")
+    parser.add_argument("--agent-id", help="agent for rows without an agent_id column")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--errors-out", help="write the per-row error report to this JSON file")
+    args = parser.parse_args()
+
+    fmt = args.format or lead_service.detect_format(args.path)
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        report = lead_service.import_leads(
+            db, lead_service.iter_records(stream, fmt),
+            tenant_id=args.tenant_id,
+            agent_id=args.agent_id,
+            batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Imported {report.inserted}/{report.total} leads in {elapsed:.1f}s ({report.failed} failed)")
+    if args.errors_out:
+        with open(args.errors_out, "w") as f:
+            json.dump(report.model_dump(), f, indent=2)
+        print(f"Error report written to {args.errors_out}")
+    elif report.errors:
+        for err in report.errors[:20]:
+            print(f"  row {err.row}: {'; '.join(err.errors)}")
+        if report.failed > 20:
+            print(f"  ... {report.failed - 20} more (use --errors-out)")
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
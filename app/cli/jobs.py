@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Background job worker and queue tools.
+
+Usage:
+    python -m app.cli.jobs worker [--queues default,mail,reports,documents] [--concurrency 4] [--max-jobs N]
+    python -m app.cli.jobs enqueue <task> [--payload '{"tenant_id": "..."}'] [--queue Q] [--priority 100]
+    python -m app.cli.jobs status <job_id>
+    python -m app.cli.jobs list [--status queued] [--limit 20]
+    python -m app.cli.jobs tasks
+    python -m app.cli.jobs purge [--days 14]
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+
+import app.models  # noqa: F401  (register all mappers)
+
+
+def _print_job(job: Job) -> None:
+    print(json.dumps({
+        "id": str(job.id), "name": job.name, "queue": job.queue, "status": job.status,
+        "attempts": f"{job.attempts}/{job.max_attempts}", "run_at": job.run_at, "finished_at": job.finished_at,
+        "last_error": job.last_error, "result": job.result
+    }, default=str, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("worker", help="run worker processes until SIGTERM")
+    p.add_argument("--queues", default="default,mail,reports,documents")
+    p.add_argument("--concurrency", type=int, default=1, help="worker processes, one job at a time each")
+    p.add_argument("--max-jobs", type=int, default=None, help="exit each process after this many jobs")
+
+    p = sub.add_parser("enqueue", help="queue a task")
+    p.add_argument("task")
+    p.add_argument("--payload", default="{}", help="JSON object of task keyword arguments")
+    p.add_argument("--queue", default=None)
+    p.add_argument("--priority", type=int, default=100)
+
+    p = sub.add_parser("status", help="show one job")
+    p.add_argument("job_id")
+
+    p = sub.add_parser("list", help="recent jobs")
+    p.add_argument("--status", default=None)
+    p.add_argument("--limit", type=int, default=20)
+
+    sub.add_parser("tasks", help="registered task names")
+
+    p = sub.add_parser("purge", help="delete finished jobs older than --days")
+    p.add_argument("--days", type=int, default=settings.JOB_RESULT_TTL_DAYS)
+
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(processName)s - %(levelname)s - %(message)s")
+        queues = [q.strip() for q in args.queues.split(",") if q.strip()]
+        jobs.run_workers(queues, concurrency=args.concurrency, max_jobs=args.max_jobs)
+        return
+
+    if args.command == "tasks":
+        for name, spec in sorted(jobs.load_tasks().items()):
+            print(f"{name:36} queue={spec.queue} max_attempts={spec.max_attempts}")
+        return
+
+    db = SessionLocal()
+    try:
+        if args.command == "enqueue":
+            job = jobs.enqueue(db, args.task, json.loads(args.payload), queue=args.queue, priority=args.priority)
+            db.commit()
+            print(job.id)
+        elif args.command == "status":
+            job = db.get(Job, args.job_id)
+            if job is None:
+                print(f"Job {args.job_id} not found", file=sys.stderr)
+                sys.exit(1)
+            _print_job(job)
+        elif args.command == "list":
+            q = select(Job).order_by(Job.created_at.desc()).limit(args.limit)
+            if args.status:
+                q = q.where(Job.status == args.status)
+            for job in db.execute(q).scalars():
+                print(f"{job.id}  {job.status:10} {job.queue:10} {job.name:32} attempts={job.attempts} {job.created_at}")
+            counts = db.execute(select(Job.status, func.count()).group_by(Job.status)).all()
+            print(", ".join(f"{status}: {n}" for status, n in counts))
+        elif args.command == "purge":
+            cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+            result = db.execute(
+                delete(Job).where(Job.status.in_(["succeeded", "failed", "cancelled"]), Job.finished_at < cutoff)
+            )
+            db.commit()
+            print(f"Deleted {result.rowcount} jobs finished before {cutoff:%Y-%m-%d}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Partitioning and archival for loan_payments, otp_codes (monthly ranges) and
+emi_schedule (hash on loan_id).
+
+`convert` rebuilds an existing table as partitioned in one transaction and locks
+it meanwhile - run it in a maintenance window. `maintain` is safe to run daily
+(cron, or the partitions.maintain job): it creates the next
+PARTITION_PREMAKE_MONTHS months and detaches, archives (gzip CSV under
+--archive-dir) and drops months past the table's retention.
+
+Usage:
+    python -m app.cli.partitions convert loan_payments|otp_codes|emi_schedule
+    python -m app.cli.partitions maintain [--archive-dir archive] [--dry-run]
+    python -m app.cli.partitions list [table]
+"""
+
+import argparse
+import json
+import logging
+
+from app.core import partitions
+from app.core.database import engine
+
+import app.models  # noqa: F401  (register all mappers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="turn a plain table into its partitioned layout")
+    p.add_argument("table", choices=sorted(partitions.SPECS))
+
+    p = sub.add_parser("maintain", help="create upcoming partitions, retire expired ones")
+    p.add_argument("--archive-dir", default=None, help="'' to drop without archiving")
+    p.add_argument("--dry-run", action="store_true")
+
+    p = sub.add_parser("list", help="show partitions and their bounds")
+    p.add_argument("table", nargs="?", choices=sorted(partitions.SPECS))
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "convert":
+        partitions.convert(engine, args.table)
+    elif args.command == "maintain":
+        print(json.dumps(partitions.maintain(engine, archive_dir=args.archive_dir, dry_run=args.dry_run), indent=2))
+    elif args.command == "list":
+        with engine.connect() as conn:
+            for table in [args.table] if args.table else sorted(partitions.SPECS):
+                if not partitions.is_partitioned(conn, table):
+                    print(f"{table}: not partitioned")
+                    continue
+                print(f"{table}:")
+                for name, bound in partitions.list_partitions(conn, table):
+                    print(f"  {name:32} {bound}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the API, and the cold-start budget check for CI.
+
+Imports --module in a fresh interpreter with `python -X importtime` (--runs
+times, keeping the fastest run), then prints the total, the self time grouped by
+package (app modules individually, third-party ones by top-level package) and the
+slowest single modules. With --check the exit status is 1 when the total exceeds
+--budget-ms (STARTUP_IMPORT_BUDGET_MS), so a pipeline step fails when a change
+makes cold starts slower. --warmup also runs the warm-up against the configured
+database and prints its per-step timings.
+
+Usage:
+    python -m app.cli.startup_profile [--module app.main] [--runs 3] [--top 20] [--warmup]
+    python -m app.cli.startup_profile --check [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def profile(module: str) -> Tuple[float, List[Tuple[str, int, float, float]]]:
+    """(wall ms, [(module, depth, self ms, cumulative ms)]) for one cold import"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            rows.append((match.group(4), len(match.group(3)) // 2, int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+    return wall, rows
+
+
+def total_ms(rows, module: str) -> float:
+    return next((cumulative for name, depth, _, cumulative in rows if name == module and depth == 0), 0.0)
+
+
+def by_package(rows) -> Dict[str, float]:
+    groups = defaultdict(float)
+    for name, _, self_ms, _ in rows:
+        groups[name if name.startswith("app.") or name == "app" else name.split(".")[0]] += self_ms
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="exit 1 when over --budget-ms")
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_IMPORT_BUDGET_MS)
+    parser.add_argument("--warmup", action="store_true", help="also time the warm-up (needs the database)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    runs = [profile(args.module) for _ in range(max(1, args.runs))]
+    wall, rows = min(runs, key=lambda run: total_ms(run[1], args.module))
+    total = total_ms(rows, args.module)
+    packages = sorted(by_package(rows).items(), key=lambda item: item[1], reverse=True)[:args.top]
+    slowest = sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]
+    summary = {
+        "module": args.module, "import_ms": round(total, 1), "process_ms": round(wall, 1),
+        "budget_ms": args.budget_ms, "packages": {name: round(ms, 1) for name, ms in packages},
+        "modules": {name: round(self_ms, 1) for name, _, self_ms, _ in slowest},
+    }
+
+    if args.warmup:
+        import app.main  # noqa: F401
+        from app.core.warmup import warmup
+        summary["warmup"] = warmup.run()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"import {args.module}: {total:.0f} ms (interpreter total {wall:.0f} ms, best of {len(runs)})\n")
+        print(f"{'self ms':>9}  package")
+        for name, ms in packages:
+            print(f"{ms:>9.1f}  {name}")
+        print(f"\n{'self ms':>9}  module")
+        for name, _, self_ms, _ in slowest:
+            print(f"{self_ms:>9.1f}  {name}")
+        if args.warmup:
+            print(f"\nwarm-up: {summary['warmup']}")
+
+    if args.check and total > args.budget_ms:
+        print(f"\nimport {args.module} took {total:.0f} ms, over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
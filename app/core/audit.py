@@ -0,0 +1,154 @@
+"""Buffered audit trail.
+
+Routes record audit entries through the Auditor dependency; entries are queued in
+memory and a background thread bulk-inserts them into audit_logs when
+AUDIT_BATCH_SIZE entries are waiting or AUDIT_FLUSH_SECONDS have passed, so a
+request never pays for its own audit commit. stop() drains the buffer on shutdown.
+"""
+
+import logging
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.tenancy import TenantContext, get_tenant_context
+from app.models.audit_logs import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+def _uuid_or_none(value) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class AuditWriter:
+    def __init__(self, session_factory=SessionLocal, batch_size: int = None, flush_seconds: float = None,
+                 max_buffer: int = None):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.AUDIT_FLUSH_SECONDS
+        self.max_buffer = max_buffer or settings.AUDIT_MAX_BUFFER
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.dropped = 0
+
+    def record(self, action: str, object_type: str = None, object_id=None, tenant_id=None, user_id=None,
+               meta: dict = None) -> None:
+        entry = {
+            "id": uuid.uuid4(),
+            "tenant_id": _uuid_or_none(tenant_id),
+            "user_id": _uuid_or_none(user_id),
+            "action": action,
+            "object_type": object_type,
+            "object_id": _uuid_or_none(object_id),
+            "meta": meta or {},
+            "created_at": datetime.now(timezone.utc),
+        }
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer:
+                # Database unreachable for a long time: keep the newest entries, bound memory
+                self._buffer.popleft()
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning(f"Audit buffer full, {self.dropped} entries dropped so far")
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def flush(self) -> int:
+        """Write everything buffered so far in bulk INSERTs; returns the number of rows written"""
+        written = 0
+        while True:
+            with self._cond:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if not batch:
+                return written
+            db = self._session_factory()
+            try:
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+                written += len(batch)
+            except Exception:
+                db.rollback()
+                logger.exception(f"Failed to write {len(batch)} audit entries, will retry")
+                with self._cond:
+                    self._buffer.extendleft(reversed(batch))
+                return written
+            finally:
+                db.close()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and drain whatever is still buffered"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_seconds)
+                stopping = self._stopping
+            if stopping:
+                return
+            self.flush()
+
+
+audit_writer = AuditWriter()
+
+
+class Auditor:
+    """Request-bound audit recorder: actor, tenant and client address come from the request"""
+
+    def __init__(self, user_id=None, tenant_id=None, ip: str = None):
+        self.user_id = user_id
+        self.tenant_id = tenant_id
+        self.ip = ip
+
+    def __call__(self, action: str, object_type: str = None, object_id=None, user_id=None, tenant_id=None, **meta) -> None:
+        if not settings.AUDIT_ENABLED:
+            return
+        if self.ip:
+            meta.setdefault("ip", self.ip)
+        audit_writer.record(
+            action, object_type, object_id,
+            tenant_id=tenant_id or self.tenant_id,
+            user_id=user_id or self.user_id,
+            meta=meta
+        )
+
+
+def get_auditor(request: Request, tenant: TenantContext = Depends(get_tenant_context)) -> Auditor:
+    return Auditor(
+        user_id=tenant.user_id,
+        tenant_id=tenant.tenant_id,
+        ip=request.client.host if request.client else None
+    )
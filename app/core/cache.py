@@ -0,0 +1,174 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL (seconds)"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the cached value for key, calling loader() to fill it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Per-process LRU backend for the response cache"""
+
+    def __init__(self, maxsize: int = 4096):
+        self._cache = TTLCache(ttl=60, maxsize=maxsize)
+        self._counters: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Set key only if it is absent; returns whether it was set"""
+        with self._lock:
+            if self._cache.get(key) is not None:
+                return False
+            self._cache.set(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+
+class RedisBackend:
+    """Shared backend so every API worker sees the same entries and invalidations"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(key, value, ex=max(int(ttl), 1))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self._client.set(key, value, ex=max(int(ttl), 1), nx=True))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(key))
+
+    def counter(self, key: str) -> int:
+        value = self._client.get(key)
+        return int(value) if value else 0
+
+
+def create_backend(name: str, redis_url: Optional[str] = None, maxsize: int = 4096):
+    if name == "redis":
+        return RedisBackend(redis_url)
+    return MemoryBackend(maxsize=maxsize)
+
+
+class ResponseCache:
+    """Caches serialized JSON responses with ETags, keyed by route namespace, tenant and query.
+
+    Each namespace has a generation counter; bumping it (invalidate) orphans every
+    cached entry for that namespace without having to enumerate keys.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _key(self, namespace: str, request: Request, tenant_id: Optional[str]) -> str:
+        generation = self.backend.counter(f"gen:{namespace}")
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"resp:{namespace}:{generation}:{tenant_id or '-'}:{request.url.path}?{query}"
+
+    def respond(self, request: Request, namespace: str, ttl: float, build: Callable[[], Any], tenant_id: Optional[str] = None):
+        """Serve a cached response for this request, calling build() on a miss"""
+        key = self._key(namespace, request, tenant_id)
+        entry = self.backend.get(key)
+        if entry is None:
+            body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            self.backend.set(key, etag.encode("ascii") + b"\n" + body, ttl)
+        else:
+            etag_bytes, body = entry.split(b"\n", 1)
+            etag = etag_bytes.decode("ascii")
+
+        headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(ttl)}"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, namespace: str) -> None:
+        self.backend.incr(f"gen:{namespace}")
+
+
+response_cache = ResponseCache(
+    create_backend(settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES)
+)
@@ -0,0 +1,137 @@
+import gzip
+import zlib
+from typing import Iterable
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+
+def parse_content_types(value: str) -> tuple:
+    return tuple(t.strip().lower() for t in value.split(",") if t.strip())
+
+
+def _content_type_allowed(content_type: str, allowed: Iterable[str]) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    for pattern in allowed:
+        if pattern.endswith("/*"):
+            if media_type.startswith(pattern[:-1]):
+                return True
+        elif media_type == pattern:
+            return True
+    return False
+
+
+class CompressionMiddleware:
+    """Gzip/Brotli response compression for compressible content types.
+
+    Responses smaller than minimum_size, already encoded, or whose content type is
+    not on the allow-list (PDFs, images, octet-stream downloads) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, content_types: Iterable[str] = ("application/json",),
+                 gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1").lower()
+                break
+        if brotli is not None and "br" in accept_encoding:
+            encoding = "br"
+        elif "gzip" in accept_encoding:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message = None
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+
+    def _new_compressor(self):
+        if self.encoding == "br":
+            return brotli.Compressor(quality=self.middleware.brotli_quality)
+        # wbits=31 -> gzip container
+        return zlib.compressobj(self.middleware.gzip_level, zlib.DEFLATED, 31)
+
+    def _compress_chunk(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self.compressor.process(data)
+            return out + self.compressor.finish() if final else out + self.compressor.flush()
+        out = self.compressor.compress(data)
+        return out + self.compressor.flush() if final else out + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _compress_whole(self, body: bytes) -> bytes:
+        if self.encoding == "br":
+            return brotli.compress(body, quality=self.middleware.brotli_quality)
+        return gzip.compress(body, compresslevel=self.middleware.gzip_level, mtime=0)
+
+    def _should_compress(self, headers) -> bool:
+        content_type = ""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.decode("latin-1")
+        if content_type.lower().startswith("text/event-stream"):
+            return False  # compressor buffering would hold back pushed events
+        return _content_type_allowed(content_type, self.middleware.content_types)
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = list(self.start_message.get("headers", []))
+            if not self._should_compress(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            vary = [v for k, v in headers if k == b"vary"]
+            headers = [(k, v) for k, v in headers if k not in (b"content-length", b"vary")]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+            if not more_body:
+                body = self._compress_whole(body)
+                headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                await self._send({**self.start_message, "headers": headers})
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            self.compressor = self._new_compressor()
+            await self._send({**self.start_message, "headers": headers})
+
+        await self._send({
+            "type": "http.response.body",
+            "body": self._compress_chunk(body, final=not more_body),
+            "more_body": more_body
+        })
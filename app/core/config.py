@@ -2,7 +2,13 @@ import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
-load_dotenv()
+# load_dotenv() with no path walks the caller's stack and directories looking for a
+# .env; read the project-root one directly instead. ENV_FILE overrides it, and an
+# empty ENV_FILE skips the file entirely (containers get their environment injected).
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ENV_FILE = os.getenv("ENV_FILE", os.path.join(_PROJECT_ROOT, ".env"))
+if _ENV_FILE and os.path.isfile(_ENV_FILE):
+    load_dotenv(_ENV_FILE)
 
 class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL")
@@ -15,5 +21,89 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = os.getenv("SMTP_USERNAME", "sunil.jas@edgezenlabs.com")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "India143#")
     SMTP_SENDER_EMAIL: str = os.getenv("SMTP_SENDER_EMAIL", "sunil.jas@edgezenlabs.com")
+    TENANT_CACHE_TTL_SECONDS: int = int(os.getenv("TENANT_CACHE_TTL_SECONDS", "300"))
+    TENANT_CACHE_MAX_SIZE: int = int(os.getenv("TENANT_CACHE_MAX_SIZE", "1024"))
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")  # memory, redis
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "4096"))
+    LOAN_PRODUCT_CACHE_TTL_SECONDS: int = int(os.getenv("LOAN_PRODUCT_CACHE_TTL_SECONDS", "300"))
+    TENANT_RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("TENANT_RESPONSE_CACHE_TTL_SECONDS", "300"))
+    ROOT_CACHE_TTL_SECONDS: int = int(os.getenv("ROOT_CACHE_TTL_SECONDS", "3600"))
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_CONTENT_TYPES: str = os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,application/javascript,text/*,image/svg+xml"
+    )
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))  # needs the optional 'brotli' package
+    LEAD_IMPORT_BATCH_SIZE: int = int(os.getenv("LEAD_IMPORT_BATCH_SIZE", "5000"))
+    LEAD_IMPORT_MAX_ERRORS: int = int(os.getenv("LEAD_IMPORT_MAX_ERRORS", "10000"))
+    LEAD_DEDUP_POLICY: str = os.getenv("LEAD_DEDUP_POLICY", "flag")  # off, flag, merge
+    LEAD_DEDUP_MERGE_THRESHOLD: float = float(os.getenv("LEAD_DEDUP_MERGE_THRESHOLD", "0.9"))
+    LEAD_DEDUP_FLAG_THRESHOLD: float = float(os.getenv("LEAD_DEDUP_FLAG_THRESHOLD", "0.6"))
+    LEAD_DEDUP_NAME_MIN_OVERLAP: float = float(os.getenv("LEAD_DEDUP_NAME_MIN_OVERLAP", "0.6"))
+    LEAD_DEDUP_MAX_CANDIDATES: int = int(os.getenv("LEAD_DEDUP_MAX_CANDIDATES", "20000"))
+    LEAD_DEDUP_COUNTRY_CODE: str = os.getenv("LEAD_DEDUP_COUNTRY_CODE", "91")
+    FOLLOWUP_SCHEDULER_ENABLED: bool = os.getenv("FOLLOWUP_SCHEDULER_ENABLED", "true").lower() == "true"
+    FOLLOWUP_SCHEDULER_HORIZON_SECONDS: int = int(os.getenv("FOLLOWUP_SCHEDULER_HORIZON_SECONDS", "900"))  # how far ahead the heap is loaded
+    FOLLOWUP_REMINDER_LEAD_SECONDS: int = int(os.getenv("FOLLOWUP_REMINDER_LEAD_SECONDS", "0"))  # remind this long before due_at
+    SSE_HEARTBEAT_SECONDS: int = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    OUTBOX_DISPATCHER_ENABLED: bool = os.getenv("OUTBOX_DISPATCHER_ENABLED", "true").lower() == "true"
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    AUDIT_ENABLED: bool = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    AUDIT_FLUSH_SECONDS: float = float(os.getenv("AUDIT_FLUSH_SECONDS", "1"))
+    AUDIT_MAX_BUFFER: int = int(os.getenv("AUDIT_MAX_BUFFER", "50000"))
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    JOB_LOCK_TIMEOUT_SECONDS: int = int(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "1800"))  # running jobs whose lock is older than this are requeued
+    JOB_RESULT_TTL_DAYS: int = int(os.getenv("JOB_RESULT_TTL_DAYS", "14"))
+    MAIL_DELIVERY: str = os.getenv("MAIL_DELIVERY", "inline")  # inline, queue (sent by a 'mail' queue worker)
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))  # how long an in-flight key blocks retries
+    LOAN_APPLICATION_DUPLICATE_WINDOW_SECONDS: int = int(os.getenv("LOAN_APPLICATION_DUPLICATE_WINDOW_SECONDS", "300"))
+    AMORTIZATION_CACHE_SIZE: int = int(os.getenv("AMORTIZATION_CACHE_SIZE", "4096"))
+    QUOTE_GRID_MAX_CELLS: int = int(os.getenv("QUOTE_GRID_MAX_CELLS", "500"))
+    LATE_PAYMENT_PENALTY_RATE_PCT: float = float(os.getenv("LATE_PAYMENT_PENALTY_RATE_PCT", "24"))  # annual, on overdue instalment amounts
+    FORECLOSURE_CHARGE_PCT: float = float(os.getenv("FORECLOSURE_CHARGE_PCT", "0"))  # of principal outstanding
+    PREPAYMENT_DEFAULT_MODE: str = os.getenv("PREPAYMENT_DEFAULT_MODE", "reduce_tenure")  # reduce_tenure, reduce_emi
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")  # comma-separated; empty reads from the primary
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "10"))
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))  # reads stay on the primary after a user's write
+    PARTITION_PREMAKE_MONTHS: int = int(os.getenv("PARTITION_PREMAKE_MONTHS", "3"))
+    PARTITION_ARCHIVE_DIR: str = os.getenv("PARTITION_ARCHIVE_DIR", "archive")  # empty: drop expired partitions without archiving
+    LOAN_PAYMENTS_RETAIN_MONTHS: int = int(os.getenv("LOAN_PAYMENTS_RETAIN_MONTHS", "96"))
+    OTP_CODES_RETAIN_MONTHS: int = int(os.getenv("OTP_CODES_RETAIN_MONTHS", "3"))
+    EMI_SCHEDULE_HASH_PARTITIONS: int = int(os.getenv("EMI_SCHEDULE_HASH_PARTITIONS", "16"))
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_POOL_CONNECTIONS: int = int(os.getenv("WARMUP_POOL_CONNECTIONS", "5"))  # capped at the pool size
+    STARTUP_IMPORT_BUDGET_MS: int = int(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))  # app.cli.startup_profile --check
+    HEALTH_CACHE_SECONDS: float = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+    HEALTH_SMTP_CACHE_SECONDS: float = float(os.getenv("HEALTH_SMTP_CACHE_SECONDS", "60"))
+    HEALTH_DB_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))
+    HEALTH_POOL_MAX_SATURATION: float = float(os.getenv("HEALTH_POOL_MAX_SATURATION", "1.0"))  # not ready once the pool is fully checked out
+    HEALTH_MIN_FREE_DISK_MB: int = int(os.getenv("HEALTH_MIN_FREE_DISK_MB", "512"))  # on the UPLOAD_DIR volume
+    HEALTH_MAIL_QUEUE_MAX: int = int(os.getenv("HEALTH_MAIL_QUEUE_MAX", "1000"))  # due mail jobs before the queue counts as backed up
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))  # compiled-SQL cache entries per engine
+    DB_PREPARE_THRESHOLD: int = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))  # postgresql+psycopg only; -1 disables
+    DASHBOARD_CACHE_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_SECONDS", "30"))
+    DASHBOARD_MAX_ITEMS: int = int(os.getenv("DASHBOARD_MAX_ITEMS", "12"))  # most payments / EMIs one dashboard call returns
+    REQUIRED_DOCUMENT_TYPES: str = os.getenv("REQUIRED_DOCUMENT_TYPES", "aadhaar,pan,income_proof")  # comma-separated; "aadhar" counts as aadhaar
+    DOCUMENT_CLAIM_BATCH: int = int(os.getenv("DOCUMENT_CLAIM_BATCH", "10"))  # documents handed to a reviewer per claim
+    DOCUMENT_CLAIM_TIMEOUT_SECONDS: int = int(os.getenv("DOCUMENT_CLAIM_TIMEOUT_SECONDS", "1800"))  # unreviewed claims go back to the queue after this
+    DOCUMENT_PREVIEW_DIR: str = os.getenv("DOCUMENT_PREVIEW_DIR", "uploads/previews")
+    DOCUMENT_THUMBNAIL_PX: int = int(os.getenv("DOCUMENT_THUMBNAIL_PX", "240"))  # longest side
+    DOCUMENT_PREVIEW_PX: int = int(os.getenv("DOCUMENT_PREVIEW_PX", "1200"))  # longest side of the first-page preview
+    DOCUMENT_PREVIEW_QUALITY: int = int(os.getenv("DOCUMENT_PREVIEW_QUALITY", "75"))  # JPEG quality
+    DOCUMENT_PREVIEW_MAX_AGE_SECONDS: int = int(os.getenv("DOCUMENT_PREVIEW_MAX_AGE_SECONDS", "86400"))  # Cache-Control on previews
+    DOCUMENT_EXPORT_MAX_APPLICATIONS: int = int(os.getenv("DOCUMENT_EXPORT_MAX_APPLICATIONS", "50"))  # per ZIP export
+    DOCUMENT_EXPORT_CHUNK_BYTES: int = int(os.getenv("DOCUMENT_EXPORT_CHUNK_BYTES", str(256 * 1024)))
+    DOCUMENT_EXPORT_READ_CONCURRENCY: int = int(os.getenv("DOCUMENT_EXPORT_READ_CONCURRENCY", "4"))  # chunk reads in flight per export
+    QUOTE_MAX_TENURE_MONTHS: int = int(os.getenv("QUOTE_MAX_TENURE_MONTHS", "480"))  # longest tenure a quote may ask for
+    JOB_HEARTBEAT_SECONDS: float = float(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))  # how often a running job's lock is refreshed; keep well below JOB_LOCK_TIMEOUT_SECONDS
 
 settings = Settings()
@@ -2,7 +2,19 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+
+def engine_options(url: str) -> dict:
+    """create_engine() options shared by the primary and replica engines"""
+    options = {"future": True, "query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    # Server-side prepared statements: psycopg 3 prepares a statement once a connection has
+    # run it DB_PREPARE_THRESHOLD times. psycopg2 has no equivalent; -1 turns it off (needed
+    # behind PgBouncer in transaction mode).
+    if url and url.startswith("postgresql+psycopg:"):
+        threshold = settings.DB_PREPARE_THRESHOLD
+        options["connect_args"] = {"prepare_threshold": threshold if threshold >= 0 else None}
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
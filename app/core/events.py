@@ -0,0 +1,197 @@
+"""Domain events via a transactional outbox.
+
+State changes call record_event() on the session that makes the change, so the
+event row commits (or rolls back) together with it. OutboxDispatcher claims
+pending events in batches with FOR UPDATE SKIP LOCKED and hands them to the
+subscribers registered with subscribe(). Delivery is at-least-once: a batch whose
+subscriber raises is retried with backoff, so handlers must be idempotent.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+ALL_EVENTS = "*"
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    id: int
+    event_type: str
+    aggregate_type: str
+    aggregate_id: str
+    tenant_id: Optional[str]
+    payload: dict
+    created_at: Optional[datetime]
+
+
+# event type -> handlers taking a list of DomainEvent
+_subscribers: Dict[str, List[Callable[[List[DomainEvent]], None]]] = defaultdict(list)
+
+
+def subscribe(*event_types: str):
+    """Decorator registering handler(events) for the given event types (or ALL_EVENTS)"""
+    def decorator(handler):
+        for event_type in event_types or (ALL_EVENTS,):
+            _subscribers[event_type].append(handler)
+        return handler
+    return decorator
+
+
+def record_event(db: Session, event_type: str, aggregate_type: str, aggregate_id, payload: dict = None, tenant_id=None) -> OutboxEvent:
+    """Add an outbox row to the caller's transaction; it is published only if that transaction commits"""
+    row = OutboxEvent(
+        event_type=event_type,
+        aggregate_type=aggregate_type,
+        aggregate_id=str(aggregate_id),
+        tenant_id=tenant_id,
+        payload=payload or {}
+    )
+    db.add(row)
+    db.info["outbox_pending"] = True
+    return row
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("outbox_pending", False):
+        dispatcher.wake()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("outbox_pending", None)
+
+
+def _to_event(row: OutboxEvent) -> DomainEvent:
+    return DomainEvent(
+        id=row.id,
+        event_type=row.event_type,
+        aggregate_type=row.aggregate_type,
+        aggregate_id=row.aggregate_id,
+        tenant_id=str(row.tenant_id) if row.tenant_id else None,
+        payload=row.payload or {},
+        created_at=row.created_at
+    )
+
+
+class OutboxDispatcher:
+    def __init__(self, session_factory=SessionLocal, batch_size: int = None, poll_seconds: float = None,
+                 max_attempts: int = None):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_seconds = poll_seconds or settings.OUTBOX_POLL_SECONDS
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Outbox dispatcher started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                delivered = self.dispatch_batch()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                delivered = 0
+            if delivered < self.batch_size:
+                # Caught up: sleep until the next poll or a local commit that recorded events
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def dispatch_batch(self) -> int:
+        """Claim and deliver one batch of pending events; returns the number claimed"""
+        db = self._session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            rows = db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.status == "pending", OutboxEvent.available_at <= now)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not rows:
+                db.rollback()
+                return 0
+
+            by_type = defaultdict(list)
+            for row in rows:
+                by_type[row.event_type].append(row)
+            failed = {}
+            for handler, handler_rows in self._plan(by_type):
+                try:
+                    handler([_to_event(r) for r in handler_rows])
+                except Exception as e:
+                    logger.exception(f"Outbox subscriber {getattr(handler, '__name__', handler)} failed")
+                    for r in handler_rows:
+                        failed[r.id] = f"{getattr(handler, '__name__', handler)}: {e}"
+
+            for row in rows:
+                if row.id in failed:
+                    row.attempts += 1
+                    row.last_error = failed[row.id][:2000]
+                    if row.attempts >= self.max_attempts:
+                        row.status = "failed"
+                        logger.error(f"Outbox event {row.id} ({row.event_type}) gave up after {row.attempts} attempts")
+                    else:
+                        row.available_at = now + timedelta(seconds=min(2 ** row.attempts, 600))
+                else:
+                    row.status = "dispatched"
+                    row.dispatched_at = now
+            db.commit()
+            return len(rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _plan(by_type: Dict[str, list]):
+        """Group claimed rows per handler so each subscriber gets one call per batch"""
+        plan: Dict[Callable, list] = {}
+        for event_type, rows in by_type.items():
+            for handler in _subscribers.get(event_type, []) + _subscribers.get(ALL_EVENTS, []):
+                plan.setdefault(handler, []).extend(rows)
+        for handler, rows in plan.items():
+            rows.sort(key=lambda r: r.id)
+            yield handler, rows
+
+
+dispatcher = OutboxDispatcher()
+
+
+@subscribe(ALL_EVENTS)
+def _log_events(events: List[DomainEvent]) -> None:
+    for e in events:
+        logger.debug(f"Event {e.id} {e.event_type} {e.aggregate_type}:{e.aggregate_id} {e.payload}")
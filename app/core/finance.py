@@ -0,0 +1,122 @@
+"""Loan arithmetic shared by eligibility, quotes and repayment code (reducing-balance, monthly rests)"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+from app.core.config import settings
+
+
+def monthly_rate(annual_rate_pct: float) -> float:
+    return float(annual_rate_pct or 0) / 1200.0
+
+
+def emi(principal: float, annual_rate_pct: float, months: int) -> float:
+    """Equated monthly instalment for a reducing-balance loan"""
+    if months <= 0:
+        raise ValueError("months must be positive")
+    r = monthly_rate(annual_rate_pct)
+    if r == 0:
+        return float(principal) / months
+    growth = (1 + r) ** months
+    return float(principal) * r * growth / (growth - 1)
+
+
+def principal_for_emi(instalment: float, annual_rate_pct: float, months: int) -> float:
+    """Largest principal an instalment can service over `months` (inverse of emi())"""
+    if instalment <= 0 or months <= 0:
+        return 0.0
+    r = monthly_rate(annual_rate_pct)
+    if r == 0:
+        return instalment * months
+    return instalment * (1 - (1 + r) ** -months) / r
+
+
+@dataclass(frozen=True)
+class Instalment:
+    number: int
+    emi: float
+    principal: float
+    interest: float
+    balance: float
+
+
+@dataclass(frozen=True)
+class Amortization:
+    principal: float
+    annual_rate_pct: float
+    months: int
+    emi: float
+    total_interest: float
+    total_payable: float
+    schedule: Tuple[Instalment, ...]
+
+
+def amortize(principal, annual_rate_pct, months: int) -> Amortization:
+    """Full reducing-balance schedule, rounded to paise; memoized on the normalized inputs"""
+    return _amortize(round(float(principal), 2), round(float(annual_rate_pct or 0), 2), int(months))
+
+
+@lru_cache(maxsize=settings.AMORTIZATION_CACHE_SIZE)
+def _amortize(principal: float, annual_rate_pct: float, months: int) -> Amortization:
+    r = monthly_rate(annual_rate_pct)
+    instalment = round(emi(principal, annual_rate_pct, months), 2)
+    balance = principal
+    rows = []
+    for n in range(1, months + 1):
+        interest = round(balance * r, 2)
+        if n == months:
+            # Last instalment absorbs the rounding so the balance closes at exactly zero
+            principal_part = round(balance, 2)
+            amount = round(principal_part + interest, 2)
+        else:
+            principal_part = round(instalment - interest, 2)
+            amount = instalment
+        balance = round(balance - principal_part, 2)
+        rows.append(Instalment(n, amount, principal_part, interest, balance))
+    total_interest = round(sum(row.interest for row in rows), 2)
+    return Amortization(
+        principal=principal,
+        annual_rate_pct=annual_rate_pct,
+        months=months,
+        emi=instalment,
+        total_interest=total_interest,
+        total_payable=round(principal + total_interest, 2),
+        schedule=tuple(rows),
+    )
+
+
+def schedule_for_emi(principal, annual_rate_pct, instalment: float, max_months: int = 600) -> Tuple[Instalment, ...]:
+    """Schedule that keeps a fixed instalment and runs until the principal is repaid (reduce-tenure)"""
+    r = monthly_rate(annual_rate_pct)
+    balance = round(float(principal), 2)
+    instalment = round(float(instalment), 2)
+    if balance > 0 and instalment <= round(balance * r, 2):
+        raise ValueError("instalment does not cover the monthly interest")
+    rows = []
+    n = 0
+    while balance > 0:
+        n += 1
+        if n > max_months:
+            raise ValueError("schedule exceeds maximum tenure")
+        interest = round(balance * r, 2)
+        principal_part = min(round(instalment - interest, 2), balance)
+        balance = round(balance - principal_part, 2)
+        rows.append(Instalment(n, round(principal_part + interest, 2), principal_part, interest, balance))
+    return tuple(rows)
+
+
+def emi_grid(amounts: Sequence[float], annual_rate_pct: float, tenures: Sequence[int]) -> List[List[float]]:
+    """EMIs for every amount x tenure: the annuity factor is computed once per tenure, then scaled"""
+    r = monthly_rate(annual_rate_pct)
+    grid = []
+    for months in tenures:
+        if months <= 0:
+            raise ValueError("months must be positive")
+        if r == 0:
+            factor = 1.0 / months
+        else:
+            growth = (1 + r) ** months
+            factor = r * growth / (growth - 1)
+        grid.append([round(float(amount) * factor, 2) for amount in amounts])
+    return grid
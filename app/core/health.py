@@ -0,0 +1,164 @@
+"""Dependency checks behind GET /readyz.
+
+Each Check keeps its last result for HEALTH_CACHE_SECONDS and only one thread
+refreshes it at a time (the others return the previous result meanwhile), so
+however often the orchestrator probes, each worker touches Postgres at most once
+per interval per check. The database checks go through their own one-connection
+engine with short connect and statement timeouts: a probe never queues behind an
+exhausted application pool, and a hung database fails the probe instead of
+hanging it.
+
+Critical checks (database, pool, disk, warm-up) decide readiness; the others
+(mail queue, SMTP, replicas) are reported but only mark the worker degraded.
+"""
+
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.replicas import replica_router
+from app.core.warmup import warmup
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_probe_engine: Optional[Engine] = None
+_probe_engine_lock = threading.Lock()
+
+
+def probe_engine() -> Engine:
+    """Single-connection engine for the checks, created on first use"""
+    global _probe_engine
+    with _probe_engine_lock:
+        if _probe_engine is None:
+            timeout = settings.HEALTH_DB_TIMEOUT_SECONDS
+            _probe_engine = create_engine(
+                settings.DATABASE_URL, future=True, pool_size=1, max_overflow=0, pool_timeout=timeout,
+                pool_pre_ping=False,
+                connect_args={"connect_timeout": max(1, int(timeout)),
+                              "options": f"-c statement_timeout={int(timeout * 1000)}"}
+            )
+        return _probe_engine
+
+
+class Check:
+    def __init__(self, name: str, probe: Callable[[], Tuple[bool, dict]], critical: bool = True, ttl: float = None):
+        self.name = name
+        self.probe = probe
+        self.critical = critical
+        self.ttl = settings.HEALTH_CACHE_SECONDS if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._result: Optional[dict] = None
+        self._checked_at = float("-inf")
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.ttl
+
+    def result(self) -> dict:
+        if self._fresh():
+            return self._result
+        # Wait for a refresh in progress only when there is nothing to answer with yet
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if not self._fresh():
+                self._result = self._run()
+                self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._result
+
+    def _run(self) -> dict:
+        started = time.perf_counter()
+        try:
+            ok, detail = self.probe()
+        except Exception as e:
+            logger.warning(f"Health check {self.name} failed: {e}")
+            message = str(e).strip().splitlines()[0][:200] if str(e).strip() else ""
+            ok, detail = False, {"error": f"{type(e).__name__}: {message}"}
+        return {"ok": ok, "critical": self.critical, "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                **detail}
+
+
+def check_database() -> Tuple[bool, dict]:
+    with probe_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return True, {}
+
+
+def check_pool() -> Tuple[bool, dict]:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return True, {"pool": type(pool).__name__}
+    capacity = pool.size() + max(0, getattr(pool, "_max_overflow", 0))
+    in_use = pool.checkedout()
+    saturation = in_use / capacity if capacity else 0.0
+    return saturation < settings.HEALTH_POOL_MAX_SATURATION, {
+        "in_use": in_use, "capacity": capacity, "saturation": round(saturation, 2)
+    }
+
+
+def check_disk() -> Tuple[bool, dict]:
+    path = os.path.abspath(settings.UPLOAD_DIR)
+    while not os.path.exists(path):  # not created until the first upload
+        path = os.path.dirname(path)
+    usage = shutil.disk_usage(path)
+    free_mb = usage.free // (1024 * 1024)
+    return free_mb >= settings.HEALTH_MIN_FREE_DISK_MB, {
+        "path": path, "free_mb": free_mb, "used_pct": round(usage.used / usage.total * 100, 1)
+    }
+
+
+def check_mail_queue() -> Tuple[bool, dict]:
+    with probe_engine().connect() as conn:
+        depth, oldest = conn.execute(
+            select(func.count(), func.min(Job.run_at))
+            .where(Job.queue == "mail", Job.status == "queued", Job.run_at <= func.now())
+        ).one()
+    detail = {"depth": depth}
+    if oldest is not None:
+        detail["oldest_queued_at"] = oldest.isoformat()
+    return depth <= settings.HEALTH_MAIL_QUEUE_MAX, detail
+
+
+def check_smtp() -> Tuple[bool, dict]:
+    with socket.create_connection((settings.SMTP_SERVER, settings.SMTP_PORT), timeout=settings.HEALTH_DB_TIMEOUT_SECONDS):
+        pass
+    return True, {"host": settings.SMTP_SERVER}
+
+
+def check_replicas() -> Tuple[bool, dict]:
+    """Last measured lag only; the router re-measures on its own schedule"""
+    status = replica_router.status()
+    healthy = [r for r in status if r["lag_seconds"] is not None and r["lag_seconds"] <= replica_router.max_lag]
+    return not status or bool(healthy), {"replicas": status}
+
+
+def check_warmup() -> Tuple[bool, dict]:
+    return warmup.ready.is_set(), {"timings_ms": dict(warmup.timings)}
+
+
+CHECKS: List[Check] = [
+    Check("database", check_database),
+    Check("pool", check_pool, ttl=0),
+    Check("disk", check_disk),
+    Check("warmup", check_warmup, ttl=0),
+    Check("mail_queue", check_mail_queue, critical=False),
+    Check("smtp", check_smtp, critical=False, ttl=settings.HEALTH_SMTP_CACHE_SECONDS),
+    Check("replicas", check_replicas, critical=False, ttl=0),
+]
+
+
+def readiness() -> Tuple[bool, Dict[str, dict]]:
+    results = {check.name: check.result() for check in CHECKS}
+    ready = all(r["ok"] for r in results.values() if r["critical"])
+    return ready, results
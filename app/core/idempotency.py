@@ -0,0 +1,65 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.cache import create_backend
+from app.core.config import settings
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a request body, to catch a key being reused for a different request"""
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    """Idempotency-Key handling on the cache backend (shared across workers with CACHE_BACKEND=redis).
+
+    begin() reserves the key (or returns the stored response to replay), complete()
+    stores the response for IDEMPOTENCY_TTL_SECONDS, release() frees the key after a
+    failure so the client can retry.
+    """
+
+    def __init__(self, backend, ttl: int, lock_ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+
+    @staticmethod
+    def _key(scope: str, owner: str, key: str) -> str:
+        return f"idem:{scope}:{owner}:{key}"
+
+    def begin(self, scope: str, owner: str, key: str, request_fingerprint: str) -> Optional[JSONResponse]:
+        store_key = self._key(scope, owner, key)
+        pending = json.dumps({"state": "pending", "fingerprint": request_fingerprint}).encode("utf-8")
+        if self.backend.add(store_key, pending, self.lock_ttl):
+            return None
+        raw = self.backend.get(store_key)
+        if raw is None:
+            # Expired between add() and get(): take it over
+            self.backend.set(store_key, pending, self.lock_ttl)
+            return None
+        entry = json.loads(raw)
+        if entry["fingerprint"] != request_fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if entry["state"] == "pending":
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still being processed")
+        return JSONResponse(status_code=entry["status_code"], content=entry["body"], headers={"Idempotent-Replayed": "true"})
+
+    def complete(self, scope: str, owner: str, key: str, request_fingerprint: str, status_code: int, body: Any) -> None:
+        entry = {"state": "done", "fingerprint": request_fingerprint, "status_code": status_code, "body": jsonable_encoder(body)}
+        self.backend.set(self._key(scope, owner, key), json.dumps(entry).encode("utf-8"), self.ttl)
+
+    def release(self, scope: str, owner: str, key: str) -> None:
+        self.backend.delete(self._key(scope, owner, key))
+
+
+idempotency_store = IdempotencyStore(
+    create_backend(settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES),
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_ttl=settings.IDEMPOTENCY_LOCK_SECONDS
+)
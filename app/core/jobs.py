@@ -0,0 +1,307 @@
+"""Postgres-backed background jobs.
+
+API code enqueue()s a job row inside its own transaction; worker processes started
+with `python -m app.cli.jobs worker` claim runnable jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers on any number of
+hosts can share a queue without double-running a job. Failed jobs are retried
+with exponential backoff up to max_attempts. While a job runs, a heartbeat thread
+refreshes its lock every JOB_HEARTBEAT_SECONDS, so only jobs left 'running' by a
+worker that died (lock older than JOB_LOCK_TIMEOUT_SECONDS) are requeued, however
+long a live job takes.
+
+Tasks are plain functions registered with @task (see app/services/job_tasks.py),
+called as fn(ctx, **payload) and may return a JSON-serializable result.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+TASK_MODULES = ("app.services.job_tasks",)
+
+
+@dataclass
+class TaskSpec:
+    name: str
+    func: Callable
+    queue: str
+    max_attempts: int
+
+
+_tasks: Dict[str, TaskSpec] = {}
+
+
+def task(name: str, queue: str = "default", max_attempts: int = 3):
+    """Register a function as a job task"""
+    def decorator(func):
+        _tasks[name] = TaskSpec(name, func, queue, max_attempts)
+        return func
+    return decorator
+
+
+def load_tasks() -> Dict[str, TaskSpec]:
+    for module in TASK_MODULES:
+        importlib.import_module(module)
+    return _tasks
+
+
+def get_task(name: str) -> TaskSpec:
+    spec = load_tasks().get(name)
+    if spec is None:
+        raise ValueError(f"Unknown job task: {name}")
+    return spec
+
+
+def enqueue(db: Session, name: str, payload: dict = None, queue: str = None, priority: int = 100,
+            run_at: datetime = None, tenant_id=None, created_by=None, max_attempts: int = None) -> Job:
+    """Add a job to the caller's transaction; workers see it once the caller commits"""
+    spec = get_task(name)
+    job = Job(
+        name=name,
+        payload=payload or {},
+        queue=queue or spec.queue,
+        priority=priority,
+        max_attempts=max_attempts or spec.max_attempts,
+        tenant_id=tenant_id,
+        created_by=created_by
+    )
+    if run_at is not None:
+        job.run_at = run_at
+    db.add(job)
+    db.flush()
+    return job
+
+
+class JobContext:
+    """Handed to task functions: job identity plus a session opened for the job"""
+
+    def __init__(self, job: Job, db: Session):
+        self.job_id = job.id
+        self.tenant_id = job.tenant_id
+        self.attempt = job.attempts
+        self.db = db
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def claim_job(db: Session, queues: Iterable[str], worker_id: str) -> Optional[Job]:
+    """Lock the next runnable job of the given queues and mark it running"""
+    job = db.execute(
+        select(Job)
+        .where(Job.status == "queued", Job.queue.in_(list(queues)), Job.run_at <= _now())
+        .order_by(Job.priority, Job.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalars().first()
+    if job is None:
+        db.rollback()
+        return None
+    job.status = "running"
+    job.locked_by = worker_id
+    job.locked_at = _now()
+    job.started_at = job.locked_at
+    job.attempts += 1
+    db.commit()
+    return job
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Return jobs whose worker vanished (lock older than JOB_LOCK_TIMEOUT_SECONDS) to the queue"""
+    cutoff = _now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    result = db.execute(
+        update(Job)
+        .where(Job.status == "running", Job.locked_at < cutoff)
+        .values(status="queued", locked_by=None, locked_at=None, last_error="worker lock expired")
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def run_job(db: Session, job: Job) -> None:
+    """Execute a claimed job and record success, retry or failure"""
+    try:
+        spec = get_task(job.name)
+        result = spec.func(JobContext(job, db), **(job.payload or {}))
+    except Exception as e:
+        db.rollback()
+        job = db.get(Job, job.id)
+        job.last_error = "".join(traceback.format_exception_only(type(e), e)).strip()[:4000]
+        job.locked_by = None
+        job.locked_at = None
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.run_at = _now() + timedelta(seconds=min(30 * 2 ** (job.attempts - 1), 3600))
+            logger.warning(f"Job {job.id} ({job.name}) attempt {job.attempts} failed, retrying: {job.last_error}")
+        else:
+            job.status = "failed"
+            job.finished_at = _now()
+            logger.error(f"Job {job.id} ({job.name}) failed after {job.attempts} attempts: {job.last_error}")
+        db.commit()
+        return
+    job = db.get(Job, job.id)
+    job.status = "succeeded"
+    job.result = result
+    job.finished_at = _now()
+    job.locked_by = None
+    job.locked_at = None
+    db.commit()
+    logger.info(f"Job {job.id} ({job.name}) finished")
+
+
+class Heartbeat:
+    """Refreshes a running job's locked_at from a background thread until the block exits"""
+
+    def __init__(self, job_id, worker_id: str, session_factory=SessionLocal, interval: float = None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.session_factory = session_factory
+        self.interval = interval or settings.JOB_HEARTBEAT_SECONDS
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stopped.set()
+        self._thread.join()
+
+    def beat(self) -> bool:
+        """Bump the lock in its own short transaction; False once the job is no longer ours"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.status == "running", Job.locked_by == self.worker_id)
+                .values(locked_at=_now())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return bool(result.rowcount)
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                if not self.beat():
+                    # Finished (a beat can land just after run_job's last commit) or requeued
+                    logger.debug(f"Job {self.job_id} is no longer locked by {self.worker_id}, heartbeat stopped")
+                    return
+            except Exception as e:
+                # A missed beat is harmless until the lock timeout; try again next interval
+                logger.warning(f"Heartbeat of job {self.job_id} failed: {e}")
+
+
+def cancel_job(db: Session, job_id) -> Optional[Job]:
+    """Cancel a job that has not started yet"""
+    job = db.get(Job, job_id)
+    if job is None:
+        return None
+    if job.status == "queued":
+        job.status = "cancelled"
+        job.finished_at = _now()
+        db.commit()
+    return job
+
+
+class Worker:
+    """Single-threaded job loop; run several processes for concurrency"""
+
+    def __init__(self, queues: Iterable[str], session_factory=SessionLocal, poll_seconds: float = None,
+                 max_jobs: int = None):
+        self.queues = list(queues)
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds or settings.JOB_POLL_SECONDS
+        self.max_jobs = max_jobs
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+
+    def stop(self, *_):
+        self._stopping.set()
+
+    def run(self) -> int:
+        load_tasks()
+        done = 0
+        next_reap = 0.0
+        logger.info(f"Job worker {self.worker_id} started on queues {','.join(self.queues)}")
+        while not self._stopping.is_set():
+            db = self.session_factory()
+            try:
+                if time.monotonic() >= next_reap:
+                    requeue_stale_jobs(db)
+                    next_reap = time.monotonic() + 60
+                job = claim_job(db, self.queues, self.worker_id)
+                if job is not None:
+                    with Heartbeat(job.id, self.worker_id, self.session_factory):
+                        run_job(db, job)
+                    done += 1
+            except Exception:
+                logger.exception("Job worker loop failed")
+                job = None
+            finally:
+                db.close()
+            if self.max_jobs and done >= self.max_jobs:
+                break
+            if job is None:
+                self._stopping.wait(self.poll_seconds)
+        logger.info(f"Job worker {self.worker_id} stopped after {done} jobs")
+        return done
+
+
+def _worker_main(queues, poll_seconds, max_jobs):
+    from app.core.database import engine
+    from app.core.replicas import replica_router
+    engine.dispose(close=False)  # never share the parent's pooled connections
+    for replica in replica_router.replicas:
+        replica.engine.dispose(close=False)
+    worker = Worker(queues, poll_seconds=poll_seconds, max_jobs=max_jobs)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+def run_workers(queues: Iterable[str], concurrency: int = 1, poll_seconds: float = None, max_jobs: int = None) -> None:
+    """Run `concurrency` worker processes (one job at a time each) until SIGTERM/SIGINT"""
+    queues = list(queues)
+    if concurrency <= 1:
+        _worker_main(queues, poll_seconds, max_jobs)
+        return
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=(queues, poll_seconds, max_jobs), name=f"job-worker-{i}")
+        for i in range(concurrency)
+    ]
+    for p in processes:
+        p.start()
+
+    def _forward(signum, _frame):
+        for p in processes:
+            if p.is_alive():
+                os.kill(p.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for p in processes:
+        p.join()
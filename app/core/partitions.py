@@ -0,0 +1,212 @@
+"""Partition management for the high-volume tables.
+
+loan_payments and otp_codes are RANGE-partitioned by month (payment_date,
+created_at) so queries bounded in time only scan recent partitions and old months
+can be detached, archived to gzip CSV and dropped instead of DELETEd. emi_schedule
+is HASH-partitioned on loan_id: every schedule query is per loan, so each one
+touches a single, much smaller partition and index.
+
+convert() turns an existing plain table into its partitioned layout (one
+transaction, takes an ACCESS EXCLUSIVE lock - run it in a maintenance window);
+maintain() is the recurring part: pre-create upcoming months, then detach,
+archive and drop months older than the retention. Both are driven by
+`python -m app.cli.partitions` and the partitions.maintain job task.
+"""
+
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RangeSpec:
+    table: str
+    column: str
+    retain_months: int
+    timestamptz: bool = False  # bounds need an explicit UTC offset
+
+    def bound(self, month: date) -> str:
+        return f"'{month.isoformat()} 00:00:00+00'" if self.timestamptz else f"'{month.isoformat()}'"
+
+
+@dataclass(frozen=True)
+class HashSpec:
+    table: str
+    column: str
+    modulus: int
+
+
+SPECS = {
+    "loan_payments": RangeSpec("loan_payments", "payment_date", settings.LOAN_PAYMENTS_RETAIN_MONTHS),
+    "otp_codes": RangeSpec("otp_codes", "created_at", settings.OTP_CODES_RETAIN_MONTHS, timestamptz=True),
+    "emi_schedule": HashSpec("emi_schedule", "loan_id", settings.EMI_SCHEDULE_HASH_PARTITIONS),
+}
+
+_MONTH_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _MONTH_SUFFIX.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    kind = conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}).scalar()
+    return kind == "p"
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, str]]:
+    """(name, bound expression) of the table's attached partitions"""
+    return [tuple(row) for row in conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:t) ORDER BY c.relname"
+    ), {"t": table})]
+
+
+def _create_month(conn: Connection, spec: RangeSpec, month: date) -> str:
+    name = partition_name(spec.table, month)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {spec.table} "
+        f"FOR VALUES FROM ({spec.bound(month)}) TO ({spec.bound(add_months(month, 1))})"
+    ))
+    return name
+
+
+def ensure_partitions(conn: Connection, spec: RangeSpec, today: date = None) -> List[str]:
+    """Create this month's and the next PARTITION_PREMAKE_MONTHS months' partitions"""
+    first = month_start(today or date.today())
+    return [_create_month(conn, spec, add_months(first, i)) for i in range(settings.PARTITION_PREMAKE_MONTHS + 1)]
+
+
+def expired_partitions(conn: Connection, spec: RangeSpec, today: date = None) -> List[str]:
+    """Monthly partitions that end before the retention window"""
+    cutoff = add_months(month_start(today or date.today()), -spec.retain_months)
+    return [
+        name for name, _ in list_partitions(conn, spec.table)
+        if partition_month(name) and add_months(partition_month(name), 1) <= cutoff
+    ]
+
+
+def archive_table(conn: Connection, table: str, directory: str) -> str:
+    """COPY a (detached) partition to <directory>/<table>.csv.gz; the file only appears once complete"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{table}.csv.gz")
+    partial = path + ".part"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        with gzip.open(partial, "wb") as f:
+            cursor.copy_expert(f"COPY {table} TO STDOUT WITH (FORMAT csv, HEADER)", f)
+    finally:
+        cursor.close()
+    os.replace(partial, path)
+    return path
+
+
+def convert(engine: Engine, name: str, today: date = None) -> None:
+    """Rebuild a plain table as its partitioned layout, copying rows, FKs and the model's indexes"""
+    spec = SPECS[name]
+    table = Base.metadata.tables[spec.table]
+    old = f"{spec.table}_unpartitioned"
+    with engine.begin() as conn:
+        if is_partitioned(conn, spec.table):
+            logger.info(f"{spec.table} is already partitioned")
+            return
+        foreign_keys = conn.execute(text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(:t) AND contype = 'f'"
+        ), {"t": spec.table}).all()
+        conn.execute(text(f"ALTER TABLE {spec.table} RENAME TO {old}"))
+        method = "RANGE" if isinstance(spec, RangeSpec) else "HASH"
+        conn.execute(text(
+            f"CREATE TABLE {spec.table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY {method} ({spec.column})"
+        ))
+
+        if isinstance(spec, RangeSpec):
+            oldest = conn.execute(text(f"SELECT min({spec.column}) FROM {old}")).scalar()
+            first = month_start(today or date.today())
+            month = month_start(oldest.date() if hasattr(oldest, "date") else oldest) if oldest else first
+            while month < first:
+                _create_month(conn, spec, month)
+                month = add_months(month, 1)
+            ensure_partitions(conn, spec, today)
+            # Catches rows outside the created months (e.g. a far-future date) instead of failing the insert
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {spec.table}_default PARTITION OF {spec.table} DEFAULT"))
+        else:
+            for remainder in range(spec.modulus):
+                conn.execute(text(
+                    f"CREATE TABLE {spec.table}_h{remainder:02d} PARTITION OF {spec.table} "
+                    f"FOR VALUES WITH (MODULUS {spec.modulus}, REMAINDER {remainder})"
+                ))
+
+        moved = conn.execute(text(f"INSERT INTO {spec.table} SELECT * FROM {old}")).rowcount
+        conn.execute(text(f"DROP TABLE {old}"))
+        # A partitioned table's primary key must contain the partition key
+        key = "id" if spec.column == "id" else f"id, {spec.column}"
+        conn.execute(text(f"ALTER TABLE {spec.table} ADD PRIMARY KEY ({key})"))
+        for constraint_name, definition in foreign_keys:
+            conn.execute(text(f"ALTER TABLE {spec.table} ADD CONSTRAINT {constraint_name} {definition}"))
+        for index in table.indexes:
+            index.create(conn)
+    logger.info(f"Converted {spec.table} to {method} partitions ({moved} rows moved)")
+
+
+def maintain(engine: Engine, today: date = None, archive_dir: str = None, dry_run: bool = False) -> dict:
+    """Pre-create upcoming monthly partitions; detach, archive and drop expired ones"""
+    archive_dir = archive_dir if archive_dir is not None else settings.PARTITION_ARCHIVE_DIR
+    summary = {"created": [], "archived": [], "dropped": [], "skipped": [], "errors": []}
+    for spec in SPECS.values():
+        if not isinstance(spec, RangeSpec):
+            continue
+        with engine.begin() as conn:
+            if not is_partitioned(conn, spec.table):
+                summary["skipped"].append(spec.table)
+                continue
+            existing = {name for name, _ in list_partitions(conn, spec.table)}
+            if not dry_run:
+                ensure_partitions(conn, spec, today)
+            upcoming = [partition_name(spec.table, add_months(month_start(today or date.today()), i))
+                        for i in range(settings.PARTITION_PREMAKE_MONTHS + 1)]
+            summary["created"] += [name for name in upcoming if name not in existing]
+            expired = expired_partitions(conn, spec, today)
+        for name in expired:
+            if dry_run:
+                summary["dropped"].append(name)
+                continue
+            # Own transaction per partition: one bad archive must not hold up the rest
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {spec.table} DETACH PARTITION {name}"))
+                    if archive_dir:
+                        summary["archived"].append(archive_table(conn, name, os.path.join(archive_dir, spec.table)))
+                    conn.execute(text(f"DROP TABLE {name}"))
+                summary["dropped"].append(name)
+                logger.info(f"Dropped expired partition {name}")
+            except Exception as e:
+                logger.exception(f"Could not retire partition {name}")
+                summary["errors"].append(f"{name}: {e}")
+    return summary
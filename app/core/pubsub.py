@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """In-process topic fan-out to asyncio subscriber queues.
+
+    publish() is safe to call from sync route handlers running in the threadpool:
+    messages are handed to each subscriber's event loop with call_soon_threadsafe.
+    A slow subscriber loses its oldest queued messages rather than blocking publishers.
+    Only subscribers in the same process are reached, so streams always start with
+    a full snapshot and treat pushed messages as deltas on top of it.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[topic]
+
+    def publish(self, topic: str, message: dict) -> int:
+        """Deliver message to every current subscriber of topic; returns how many there were"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, message)
+            except RuntimeError:
+                pass  # subscriber's loop already closed
+        return len(subscribers)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, message: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    def subscriber_count(self, topic: str = None) -> int:
+        with self._lock:
+            if topic is not None:
+                return len(self._subscribers.get(topic, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+
+broker = Broker(queue_size=settings.SSE_QUEUE_SIZE)
+
+
+def user_topic(user_id) -> str:
+    return f"user:{user_id}"
+
+
+# Called with the user id on every publish_user_event, e.g. to drop per-user cached views
+_user_event_hooks: List[Callable] = []
+
+
+def on_user_event(hook):
+    """Decorator registering hook(user_id) to run whenever a change is pushed for a user"""
+    _user_event_hooks.append(hook)
+    return hook
+
+
+def publish_user_event(user_id, event: str, data: dict) -> None:
+    """Push a loan-status delta to the user's open streams (call after the change is committed)"""
+    if user_id is None:
+        return
+    for hook in _user_event_hooks:
+        try:
+            hook(user_id)
+        except Exception:
+            logger.exception(f"User event hook {hook.__name__} failed")
+    broker.publish(user_topic(user_id), {"event": event, "data": data})
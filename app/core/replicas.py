@@ -0,0 +1,170 @@
+"""Read-replica routing.
+
+Reports, admin listings and quotes take their session from get_read_db
+(app/core/tenancy.py), which binds it to a streaming replica from
+DATABASE_REPLICA_URLS instead of the primary. Replicas are picked round-robin
+among those whose replay lag is within REPLICA_MAX_LAG_SECONDS (re-measured at
+most every REPLICA_LAG_CHECK_SECONDS); with none healthy, reads go to the primary.
+Responses kept in response_cache are built on the primary, never on a replica:
+a replica that has not replayed a write yet would re-cache the old response
+right after the write invalidated it.
+
+A user who has just written (any successful non-GET request) keeps reading from
+the primary for READ_YOUR_WRITES_SECONDS so they never see their own change
+missing. The marker lives on the cache backend, so it holds across workers with
+CACHE_BACKEND=redis.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.core.cache import create_backend
+from app.core.config import settings
+from app.core.database import SessionLocal, engine_options
+from app.core.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction; 0 when the replica has replayed everything it received
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def parse_urls(value: str) -> List[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, pool_pre_ping=True, **engine_options(url))
+        self.lag: Optional[float] = None  # None: unreachable or not checked yet
+        self.checked_at = float("-inf")
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str], max_lag: float, check_seconds: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def _measure(self, replica: Replica) -> None:
+        try:
+            with replica.engine.connect() as conn:
+                replica.lag = float(conn.execute(LAG_QUERY).scalar() or 0)
+        except Exception as e:
+            if replica.lag is not None:
+                logger.warning(f"Replica {replica.name} unavailable: {e}")
+            replica.lag = None
+        replica.checked_at = time.monotonic()
+        if replica.lag is not None and replica.lag > self.max_lag:
+            logger.warning(f"Replica {replica.name} lagging {replica.lag:.1f}s, reading from primary")
+
+    def _healthy(self, replica: Replica) -> bool:
+        if time.monotonic() - replica.checked_at >= self.check_seconds:
+            # One request re-measures; others use the last known lag meanwhile
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._measure(replica)
+                finally:
+                    self._lock.release()
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    def choose(self) -> Optional[Engine]:
+        """Engine of the next healthy replica, or None to use the primary"""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._cycle)]
+            if self._healthy(replica):
+                return replica.engine
+        return None
+
+    def check_all(self) -> None:
+        """Measure every replica now (opens its first connection too)"""
+        with self._lock:
+            for replica in self.replicas:
+                self._measure(replica)
+
+    def status(self) -> List[dict]:
+        return [{"replica": r.name, "lag_seconds": r.lag} for r in self.replicas]
+
+
+class WriteTracker:
+    """Remembers users who wrote recently so their reads stay on the primary"""
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def mark(self, user_id) -> None:
+        if user_id and self.ttl > 0:
+            self.backend.set(f"ryw:{user_id}", b"1", self.ttl)
+
+    def recently_wrote(self, user_id) -> bool:
+        return bool(user_id) and self.backend.get(f"ryw:{user_id}") is not None
+
+
+class ReadYourWritesMiddleware:
+    """Marks the caller in write_tracker after every successful non-GET request"""
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app, tracker: WriteTracker = None):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS or not replica_router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self._mark(scope)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _mark(self, scope) -> None:
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        if not authorization.lower().startswith("bearer "):
+            return
+        payload = decode_token(authorization[7:]) or {}
+        (self.tracker or write_tracker).mark(payload.get("user_id"))
+
+
+replica_router = ReplicaRouter(
+    parse_urls(settings.DATABASE_REPLICA_URLS),
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_seconds=settings.REPLICA_LAG_CHECK_SECONDS
+)
+
+write_tracker = WriteTracker(
+    create_backend(settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES),
+    ttl=settings.READ_YOUR_WRITES_SECONDS
+)
+
+
+def read_session(user_id=None):
+    """New session on a healthy replica, or on the primary if there is none or user_id has just written"""
+    bind = None
+    if replica_router.enabled and not write_tracker.recently_wrote(user_id):
+        bind = replica_router.choose()
+    return SessionLocal(bind=bind) if bind is not None else SessionLocal()
@@ -1,13 +1,15 @@
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
 from app.core.config import settings
 from typing import Optional
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import bcrypt
 import hashlib
 
+# jose (with its cryptography backend) and bcrypt are imported on first use rather than
+# at startup; app.core.warmup pulls them in before the instance reports ready.
+
 def hash_password(password: str) -> str:
+    import bcrypt
     # Ensure password doesn't exceed bcrypt's 72 byte limit
     if len(password.encode('utf-8')) > 72:
         # Use SHA256 for longer passwords and then hash that
@@ -16,6 +18,7 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 def verify_password(plain: str, hashed: str) -> bool:
+    import bcrypt
     # Ensure password doesn't exceed bcrypt's 72 byte limit during verification
     if len(plain.encode('utf-8')) > 72:
         # Use SHA256 for longer passwords and then verify that
@@ -24,6 +27,7 @@ def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode('utf-8'), hashed.encode('utf-8'))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
@@ -31,6 +35,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return token
 
 def decode_token(token: str) -> Optional[dict]:
+    from jose import jwt, JWTError
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
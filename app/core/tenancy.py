@@ -0,0 +1,104 @@
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.orm import with_loader_criteria
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import Base, SessionLocal
+from app.core.replicas import read_session
+from app.core.security import decode_token
+
+# In-process cache of tenant rows (theme/config blobs) keyed by tenant id
+tenant_cache = TTLCache(ttl=settings.TENANT_CACHE_TTL_SECONDS, maxsize=settings.TENANT_CACHE_MAX_SIZE)
+
+optional_security = HTTPBearer(auto_error=False)
+
+
+class TenantContext:
+    """Tenant and caller resolved once per request from the JWT"""
+
+    def __init__(self, tenant_id: Optional[str] = None, user_id: Optional[str] = None, role: Optional[str] = None):
+        self.tenant_id = tenant_id
+        self.user_id = user_id
+        self.role = role
+
+    @property
+    def is_scoped(self) -> bool:
+        return self.tenant_id is not None
+
+    def resolve(self, requested_tenant_id: Optional[str] = None) -> Optional[str]:
+        """Tenant to filter on: the caller's own tenant, else whatever was asked for"""
+        return self.tenant_id or requested_tenant_id
+
+
+def get_tenant_context(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> TenantContext:
+    """Resolve the tenant from the bearer token; anonymous callers get an unscoped context"""
+    if not credentials:
+        return TenantContext()
+    payload = decode_token(credentials.credentials) or {}
+    return TenantContext(
+        tenant_id=payload.get("tenant_id"),
+        user_id=payload.get("user_id"),
+        role=payload.get("role")
+    )
+
+
+def get_tenant_db(tenant: TenantContext = Depends(get_tenant_context)):
+    """Session whose ORM queries are automatically restricted to the caller's tenant"""
+    db = SessionLocal()
+    db.info["tenant_id"] = tenant.tenant_id
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(tenant: TenantContext = Depends(get_tenant_context)):
+    """Session for read-only endpoints: a healthy replica unless the caller has just written"""
+    db = read_session(tenant.user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_tenant_read_db(tenant: TenantContext = Depends(get_tenant_context)):
+    """get_read_db, restricted to the caller's tenant like get_tenant_db"""
+    db = read_session(tenant.user_id)
+    db.info["tenant_id"] = tenant.tenant_id
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@lru_cache(maxsize=1)
+def tenant_scoped_models() -> tuple:
+    """All mapped classes that carry a tenant_id column"""
+    return tuple(
+        mapper.class_ for mapper in Base.registry.mappers
+        if "tenant_id" in mapper.columns
+    )
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _add_tenant_criteria(state):
+    tenant_id = state.session.info.get("tenant_id")
+    if not tenant_id or state.execution_options.get("skip_tenant_scope", False):
+        return
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    tenant_uuid = uuid.UUID(str(tenant_id))
+    for model in tenant_scoped_models():
+        state.statement = state.statement.options(
+            with_loader_criteria(model, lambda cls: cls.tenant_id == tenant_uuid, include_aliases=True)
+        )
+
+
+def invalidate_tenant(tenant_id) -> None:
+    tenant_cache.delete(str(tenant_id))
@@ -22,7 +22,7 @@ def generate_otp():
 def get_expiry_time(minutes=5):
     return datetime.now(timezone.utc) + timedelta(minutes=minutes)
 
-def send_email_otp(recipient_email: str, otp_code: str):
+def send_email_otp(recipient_email: str, otp_code: str, raise_errors: bool = False):
     subject = "Your CredoSafe OTP Code"
     body = f"""
     Dear User,
@@ -45,8 +45,11 @@ def send_email_otp(recipient_email: str, otp_code: str):
             server.send_message(msg)
     except Exception as e:
         print(f"[Error] Failed to send OTP email: {e}")
+        if raise_errors:  # job path: let the queue retry with backoff
+            raise
 
-def send_password_reset_email(recipient_email: str, reset_token: str, base_url: str = "http://localhost:5000"):
+def send_password_reset_email(recipient_email: str, reset_token: str, base_url: str = "http://localhost:5000",
+                              raise_errors: bool = False):
     """Send password reset email with reset link"""
     reset_link = f"{base_url}/reset-password?token={reset_token}"
     
@@ -79,4 +82,6 @@ def send_password_reset_email(recipient_email: str, reset_token: str, base_url:
         return True
     except Exception as e:
         print(f"[Error] Failed to send password reset email: {e}")
+        if raise_errors:  # job path: let the queue retry with backoff
+            raise
         return False
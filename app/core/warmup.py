@@ -0,0 +1,110 @@
+"""Start-up warm-up.
+
+A fresh worker otherwise pays on its first requests for work that does not depend
+on the request: configuring the ORM mappers, importing jose/cryptography and
+bcrypt, opening pool connections and compiling the SQL of the hot queries into
+the engine's compiled cache. warmup.start() (from the startup hook) does all of it
+in a background thread and sets warmup.ready when done, so the readiness probe
+only passes once the worker is warm; a failing step is logged and does not keep
+the worker out of rotation.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.replicas import replica_router
+
+logger = logging.getLogger(__name__)
+
+# Matches nothing: the queries run for their compilation, not their rows
+NO_ID = str(uuid.UUID(int=0))
+
+
+def _hot_queries() -> List[Tuple[str, Callable]]:
+    """The statements behind login, tenant resolution and the customer loan screens"""
+    from app.crud import crud
+    from app.services.loan_management_service import LoanManagementService
+
+    return [
+        ("user_by_email", lambda db: crud.get_user_by_email(db, "warmup@example.com")),
+        ("tenant", lambda db: crud.get_tenant(db, NO_ID)),
+        ("loan_products", lambda db: crud.list_loan_products(db, tenant_id=NO_ID, limit=1)),
+        ("loan_status", lambda db: LoanManagementService.get_user_loan_status(db, NO_ID)),
+        ("loan_details", lambda db: LoanManagementService.get_loan_details(db, NO_ID, NO_ID)),
+    ]
+
+
+class WarmUp:
+    def __init__(self, bind=engine, session_factory=SessionLocal, connections: int = None):
+        self.bind = bind
+        self.session_factory = session_factory
+        self.connections = settings.WARMUP_POOL_CONNECTIONS if connections is None else connections
+        self.ready = threading.Event()
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+        for name, step in (
+            ("mappers", configure_mappers),
+            ("crypto", self._crypto),
+            ("pool", self._pool),
+            ("queries", self._queries),
+            ("replicas", replica_router.check_all),
+        ):
+            step_started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {e}")
+                self.errors[name] = str(e)
+            self.timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        self.ready.set()
+        logger.info(f"Warm-up done in {(time.perf_counter() - started) * 1000:.0f} ms: {self.timings}")
+        return self.report()
+
+    def report(self) -> dict:
+        return {"ready": self.ready.is_set(), "timings_ms": dict(self.timings), "errors": dict(self.errors)}
+
+    def _crypto(self) -> None:
+        import bcrypt  # noqa: F401
+        from app.core.security import create_access_token, decode_token
+        decode_token(create_access_token({"warmup": True}))
+
+    def _pool(self) -> None:
+        """Check out `connections` connections at once so they all stay open in the pool"""
+        size = self.bind.pool.size() if hasattr(self.bind.pool, "size") else self.connections
+        with ExitStack() as stack:
+            for _ in range(min(self.connections, size)):
+                stack.enter_context(self.bind.connect()).execute(text("SELECT 1"))
+
+    def _queries(self) -> None:
+        # Once unscoped and once tenant-scoped: the tenant criteria change the compiled statement
+        for info in ({}, {"tenant_id": NO_ID}):
+            db = self.session_factory()
+            db.info.update(info)
+            try:
+                for _, query in _hot_queries():
+                    query(db)
+            finally:
+                db.rollback()
+                db.close()
+
+
+warmup = WarmUp()
@@ -5,16 +5,27 @@ from app.models import tenant as tenant_model
 from app.models import loan_product as lp_model
 from app.models import application as app_model
 from app.models import application_documents as doc_model
-from app.models import Lead as lead_model
+from app.models import lead as lead_model
+from app.models import followup as followup_model
+from app.models import audit_logs as audit_model
 from app.models import payments as payment_model
 from app.models import otp_codes as otp_model
 from app.models import password_reset_token as reset_model
-from app.core import security
-from app.schemas import user_schema, tenant_schema, loan_schema, lead_schema, application_schema
+from app.core import security, tenancy
+from app.core.cache import response_cache
+from app.core.events import record_event
+from app.core.pubsub import publish_user_event
+from app.core.config import settings
+from app.services import eligibility_service, lead_dedup
+from app.schemas import user_schema, tenant_schema, loan_schema, lead_schema, application_schema, followup_schema
+from sqlalchemy import bindparam, func, select
 import random
 import secrets
 
 # Users
+
+# Built once: every login and token lookup runs it, so only the parameters change per call
+_USER_BY_EMAIL = select(user_model.User).where(user_model.User.email == bindparam("email")).limit(1)
 def create_user(db: Session, user_in: user_schema.UserCreate):
     hashed = None
     if getattr(user_in, "password", None):
@@ -34,7 +45,7 @@ def create_user(db: Session, user_in: user_schema.UserCreate):
     return u
 
 def get_user_by_email(db: Session, email: str):
-    return db.query(user_model.User).filter(user_model.User.email == email).first()
+    return db.execute(_USER_BY_EMAIL, {"email": email}).scalars().first()
 
 def get_user_by_phone(db: Session, phone: str):
     return db.query(user_model.User).filter(user_model.User.phone == phone).first()
@@ -124,6 +135,7 @@ def create_tenant(db: Session, payload: tenant_schema.TenantCreate):
     db.add(t)
     db.commit()
     db.refresh(t)
+    response_cache.invalidate("tenants")
     return t
 
 def list_tenants(db: Session, skip=0, limit=25):
@@ -132,6 +144,35 @@ def list_tenants(db: Session, skip=0, limit=25):
 def get_tenant(db: Session, tenant_id: str):
     return db.query(tenant_model.Tenant).filter(tenant_model.Tenant.id == tenant_id).first()
 
+def _tenant_snapshot(t):
+    if not t:
+        return None
+    return {
+        "id": t.id,
+        "name": t.name,
+        "domain": t.domain,
+        "logo_url": t.logo_url,
+        "theme": t.theme or {},
+        "config": t.config or {},
+        "created_at": t.created_at.isoformat() if t.created_at else None
+    }
+
+def get_tenant_cached(db: Session, tenant_id: str):
+    """Get a tenant (incl. theme/config) as a plain dict from the in-process tenant cache"""
+    return tenancy.tenant_cache.get_or_set(str(tenant_id), lambda: _tenant_snapshot(get_tenant(db, tenant_id)))
+
+def update_tenant(db: Session, tenant_id: str, payload: tenant_schema.TenantUpdate):
+    t = get_tenant(db, tenant_id)
+    if not t:
+        return None
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(t, field, value)
+    db.commit()
+    db.refresh(t)
+    tenancy.invalidate_tenant(tenant_id)
+    response_cache.invalidate("tenants")
+    return t
+
 # Loan product
 def create_loan_product(db: Session, payload: loan_schema.LoanProductCreate):
     p = lp_model.LoanProduct(
@@ -147,8 +188,13 @@ def create_loan_product(db: Session, payload: loan_schema.LoanProductCreate):
     db.add(p)
     db.commit()
     db.refresh(p)
+    response_cache.invalidate("loan_products")
+    eligibility_service.invalidate_products()
     return p
 
+def get_loan_product(db: Session, id: str):
+    return db.query(lp_model.LoanProduct).filter(lp_model.LoanProduct.id == id).first()
+
 def list_loan_products(db: Session, tenant_id: str = None, skip=0, limit=25):
     q = db.query(lp_model.LoanProduct)
     if tenant_id:
@@ -157,6 +203,17 @@ def list_loan_products(db: Session, tenant_id: str = None, skip=0, limit=25):
 
 # Leads
 def create_lead(db: Session, payload: lead_schema.LeadCreate):
+    """Create a lead, merging or flagging it if it duplicates an existing one (LEAD_DEDUP_POLICY)"""
+    keys = lead_dedup.LeadKeys.build(payload.customer_name, payload.phone, payload.email)
+    match_id, kind = None, None
+    if settings.LEAD_DEDUP_POLICY != "off":
+        match_id, kind = lead_dedup.find_duplicate(db, payload.tenant_id, keys)
+    if lead_dedup.should_merge(kind):
+        existing = db.get(lead_model.Lead, match_id)
+        lead_dedup.merge_into(existing, payload.model_dump())
+        db.commit()
+        db.refresh(existing)
+        return existing
     L = lead_model.Lead(
         tenant_id=payload.tenant_id,
         agent_id=payload.agent_id,
@@ -166,7 +223,9 @@ def create_lead(db: Session, payload: lead_schema.LeadCreate):
         source=payload.source,
         status=payload.status,
         notes=payload.notes,
-        next_followup=payload.next_followup
+        next_followup=payload.next_followup,
+        duplicate_of=match_id if kind else None,
+        **keys.columns()
     )
     db.add(L)
     db.commit()
@@ -181,6 +240,74 @@ def list_leads(db: Session, tenant_id: str = None, agent_id: str = None, skip=0,
         q = q.filter(lead_model.Lead.agent_id == agent_id)
     return q.offset(skip).limit(limit).all()
 
+# Follow-ups
+def _sync_lead_next_followup(db: Session, lead_id):
+    """Keep leads.next_followup equal to the earliest pending follow-up of the lead"""
+    earliest = db.query(func.min(followup_model.FollowUp.due_at)).filter(
+        followup_model.FollowUp.lead_id == lead_id,
+        followup_model.FollowUp.status == "pending"
+    ).scalar()
+    db.query(lead_model.Lead).filter(lead_model.Lead.id == lead_id).update(
+        {"next_followup": earliest}, synchronize_session=False
+    )
+
+def create_followup(db: Session, payload: followup_schema.FollowUpCreate):
+    lead = db.get(lead_model.Lead, payload.lead_id)
+    if not lead:
+        return None
+    F = followup_model.FollowUp(
+        tenant_id=lead.tenant_id,
+        lead_id=lead.id,
+        agent_id=payload.agent_id or lead.agent_id,
+        due_at=payload.due_at,
+        channel=payload.channel,
+        notes=payload.notes
+    )
+    db.add(F)
+    db.flush()
+    _sync_lead_next_followup(db, lead.id)
+    db.commit()
+    db.refresh(F)
+    return F
+
+def get_followup(db: Session, followup_id: str):
+    return db.get(followup_model.FollowUp, followup_id)
+
+def update_followup(db: Session, followup_id: str, payload: followup_schema.FollowUpUpdate):
+    F = db.get(followup_model.FollowUp, followup_id)
+    if not F:
+        return None
+    changes = payload.model_dump(exclude_unset=True)
+    for name, value in changes.items():
+        setattr(F, name, value)
+    if "due_at" in changes:
+        F.reminded_at = None  # rescheduled: remind again at the new time
+    if changes.get("status") == "done":
+        F.completed_at = datetime.now(timezone.utc)
+    db.flush()
+    _sync_lead_next_followup(db, F.lead_id)
+    db.commit()
+    db.refresh(F)
+    return F
+
+def list_followups(db: Session, tenant_id: str = None, agent_id: str = None, lead_id: str = None, status: str = None,
+                   due_before: datetime = None, due_after: datetime = None, skip=0, limit=25):
+    """Follow-ups in due order; tenant/agent + status + due range is served by the (.., status, due_at) indexes"""
+    q = db.query(followup_model.FollowUp)
+    if tenant_id:
+        q = q.filter(followup_model.FollowUp.tenant_id == tenant_id)
+    if agent_id:
+        q = q.filter(followup_model.FollowUp.agent_id == agent_id)
+    if lead_id:
+        q = q.filter(followup_model.FollowUp.lead_id == lead_id)
+    if status:
+        q = q.filter(followup_model.FollowUp.status == status)
+    if due_before:
+        q = q.filter(followup_model.FollowUp.due_at < due_before)
+    if due_after:
+        q = q.filter(followup_model.FollowUp.due_at >= due_after)
+    return q.order_by(followup_model.FollowUp.due_at).offset(skip).limit(limit).all()
+
 # Applications
 def create_application(db: Session, payload: application_schema.ApplicationCreate):
     A = app_model.Application(
@@ -216,12 +343,17 @@ def update_application_status(db: Session, app_id: str, status: str, notes: str
     a = get_application(db, app_id)
     if not a:
         return None
+    previous_status = getattr(a.status, "value", a.status)
     a.status = status
     if notes is not None:
         a.notes = notes
     db.add(a)
+    record_event(db, "application.status_changed", "application", a.id, {
+        "user_id": str(a.user_id) if a.user_id else None, "from": previous_status, "to": getattr(status, "value", status)
+    }, tenant_id=a.tenant_id)
     db.commit()
     db.refresh(a)
+    publish_user_event(a.user_id, "application_status", {"application_id": str(a.id), "status": getattr(a.status, "value", a.status)})
     return a
 
 # Documents
@@ -287,7 +419,9 @@ def verify_otp(db: Session, principal: str, code: str, purpose: str):
     rec = db.query(otp_model.OTPCodes).filter(
         otp_model.OTPCodes.principal == principal,
         otp_model.OTPCodes.purpose == purpose,
-        otp_model.OTPCodes.used == False
+        otp_model.OTPCodes.used == False,
+        # Every code has expired within a day; the bound keeps the lookup on the latest partitions
+        otp_model.OTPCodes.created_at >= datetime.now(timezone.utc) - timedelta(days=1)
     ).order_by(otp_model.OTPCodes.created_at.desc()).first()
     if not rec:
         return False
@@ -307,7 +441,27 @@ def applications_summary(db: Session, tenant_id: str = None, date_from=None, dat
     if tenant_id:
         q = q.filter(app_model.Application.tenant_id == tenant_id)
     rows = q.all()
-    return [{"status": r[0], "count": r[1]} for r in rows]
+    return [{"status": getattr(r[0], "value", r[0]), "count": r[1]} for r in rows]
+
+def agent_performance(db: Session, tenant_id: str = None):
+    leads = db.query(lead_model.Lead.agent_id, func.count(lead_model.Lead.id)).group_by(lead_model.Lead.agent_id)
+    apps = db.query(app_model.Application.agent_id, func.count(app_model.Application.id)).group_by(app_model.Application.agent_id)
+    if tenant_id:
+        leads = leads.filter(lead_model.Lead.tenant_id == tenant_id)
+        apps = apps.filter(app_model.Application.tenant_id == tenant_id)
+    lead_map = {str(r[0]): r[1] for r in leads.all()}
+    app_map = {str(r[0]): r[1] for r in apps.all()}
+    agents = set(list(lead_map.keys()) + list(app_map.keys()))
+    result = []
+    for a in agents:
+        result.append({
+            "agent_id": a,
+            "total_leads": lead_map.get(a, 0),
+            "applications_submitted": app_map.get(a, 0),
+            "approved_count": 0,
+            "conversion_rate": 0.0
+        })
+    return result
 
 # Loan Management CRUD Operations
 from app.models.loan import Loan, LoanApplication, LoanDocument, LoanPayment, EMISchedule
@@ -342,3 +496,26 @@ def update_loan_application_status(db: Session, application_id: str, status: str
         db.commit()
         return application
     return None
+
+# Audit logs
+def list_audit_logs(db: Session, tenant_id: str = None, user_id: str = None, action: str = None, object_type: str = None,
+                    object_id: str = None, date_from: datetime = None, date_to: datetime = None, before: datetime = None, limit=100):
+    """Newest first; page with before=<created_at of the last row> rather than offsets"""
+    q = db.query(audit_model.AuditLog)
+    if tenant_id:
+        q = q.filter(audit_model.AuditLog.tenant_id == tenant_id)
+    if user_id:
+        q = q.filter(audit_model.AuditLog.user_id == user_id)
+    if action:
+        q = q.filter(audit_model.AuditLog.action == action)
+    if object_type:
+        q = q.filter(audit_model.AuditLog.object_type == object_type)
+    if object_id:
+        q = q.filter(audit_model.AuditLog.object_id == object_id)
+    if date_from:
+        q = q.filter(audit_model.AuditLog.created_at >= date_from)
+    if date_to:
+        q = q.filter(audit_model.AuditLog.created_at < date_to)
+    if before:
+        q = q.filter(audit_model.AuditLog.created_at < before)
+    return q.order_by(audit_model.AuditLog.created_at.desc()).limit(limit).all()
@@ -4,12 +4,20 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import logging
 from app.core.database import Base, engine
+from app.core.cache import response_cache
+from app.core.compression import CompressionMiddleware, parse_content_types
+from app.core.config import settings
+from app.core.replicas import ReadYourWritesMiddleware
 from app.routes import (
     auth, users, tenants, loan_products,
     applications, leads, documents, payments,
-    installments, followups, reports, loan_management, admin
+    installments, followups, reports, loan_management, admin, jobs, health
 )
 from app.core.utils import add_exception_handlers
+from app.core.audit import audit_writer
+from app.core.events import dispatcher as outbox_dispatcher
+from app.services.followup_scheduler import scheduler as followup_scheduler
+from app.core.warmup import warmup
 
 # Import ALL models to ensure they are registered with SQLAlchemy
 import app.models  # This imports all models through __init__.py
@@ -37,6 +45,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (PDFs/images from the document routes are not on the allow-list)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    content_types=parse_content_types(settings.COMPRESSION_CONTENT_TYPES),
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Keeps a user's reads on the primary right after their own writes (no-op without replicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # logging
 logging.basicConfig(
     level=logging.DEBUG, 
@@ -60,10 +80,30 @@ app.include_router(followups.router, prefix="/v1/followups", tags=["Followups"])
 app.include_router(reports.router, prefix="/v1/reports", tags=["Reports"])
 app.include_router(loan_management.router, prefix="/v1", tags=["Loan Management"])
 app.include_router(admin.router, prefix="/v1", tags=["Admin"])
+app.include_router(jobs.router, prefix="/v1/jobs", tags=["Jobs"])
+app.include_router(health.router, tags=["Health"])
+
+@app.on_event("startup")
+def start_background_workers():
+    audit_writer.start()
+    if settings.FOLLOWUP_SCHEDULER_ENABLED:
+        followup_scheduler.start()
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
+    if settings.WARMUP_ENABLED:
+        warmup.start()  # sets warmup.ready once pools, crypto and hot queries are warm
+    else:
+        warmup.ready.set()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    followup_scheduler.stop()
+    outbox_dispatcher.stop()
+    audit_writer.stop()  # drains buffered audit entries
 
 # global error handlers - temporarily disabled for debugging
 # add_exception_handlers(app)
 
 @app.get("/")
-def root():
-    return {"message": "CredoSafe API (v1)"}
+def root(request: Request):
+    return response_cache.respond(request, "root", settings.ROOT_CACHE_TTL_SECONDS, lambda: {"message": "CredoSafe API (v1)"})
@@ -8,10 +8,15 @@ from .tenant import Tenant
 from .user import User
 from .loan_product import LoanProduct
 from .lead import Lead
+from .followup import FollowUp
 from .application import Application
 from .application_documents import ApplicationDocument
 from .loan import Loan, LoanApplication, LoanDocument, LoanPayment, EMISchedule
 # Include other models not explicitly listed in your folder view, but needed for the DB structure
 from .payments import Payment
 from .installment import Installment
-from .audit_logs import AuditLog
\ No newline at end of file
+from .audit_logs import AuditLog
+from .otp_codes import OTPCodes
+from .password_reset_token import PasswordResetToken
+from .job import Job
+from .outbox import OutboxEvent
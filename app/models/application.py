@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, Text, Numeric, Integer, Enum, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Text, Numeric, Integer, Enum, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -16,6 +16,10 @@ class ApplicationStatus(str, enum.Enum):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_tenant_status", "tenant_id", "status"),
+        Index("ix_applications_tenant_agent", "tenant_id", "agent_id"),
+    )
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(PG_UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True)
     user_id = Column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
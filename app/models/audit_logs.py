@@ -1,11 +1,18 @@
 import uuid
-from sqlalchemy import Column, Text, TIMESTAMP, JSON
+from sqlalchemy import Column, Text, TIMESTAMP, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Append-only and written in time order: BRIN keeps time-range scans cheap at any size
+        Index("ix_audit_logs_created_at_brin", "created_at", postgresql_using="brin"),
+        Index("ix_audit_logs_tenant_created", "tenant_id", "created_at"),
+        Index("ix_audit_logs_user_created", "user_id", "created_at"),
+        Index("ix_audit_logs_object", "object_type", "object_id"),
+    )
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(PG_UUID(as_uuid=True), nullable=True)
     user_id = Column(PG_UUID(as_uuid=True), nullable=True)
@@ -0,0 +1,32 @@
+# app/models/followup.py
+
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from uuid import uuid4
+from app.core.database import Base
+from .base import TimestampMixin
+
+class FollowUp(Base, TimestampMixin):
+    __tablename__ = "followups"
+    __table_args__ = (
+        # "what is due before X" for a tenant / an agent is a range scan on these
+        Index("ix_followups_tenant_status_due", "tenant_id", "status", "due_at"),
+        Index("ix_followups_agent_status_due", "agent_id", "status", "due_at"),
+        Index("ix_followups_lead", "lead_id"),
+        # Cross-tenant window the reminder scheduler loads (app/services/followup_scheduler.py)
+        Index(
+            "ix_followups_unreminded_due", "due_at",
+            postgresql_where=text("status = 'pending' AND reminded_at IS NULL")
+        ),
+    )
+
+    id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    tenant_id = Column(PGUUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    lead_id = Column(PGUUID(as_uuid=True), ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
+    agent_id = Column(PGUUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, default="pending", nullable=False)  # pending, done, cancelled
+    channel = Column(String)  # call, visit, email, whatsapp
+    notes = Column(String)
+    reminded_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
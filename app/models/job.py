@@ -0,0 +1,34 @@
+import uuid
+from sqlalchemy import Column, Text, Integer, TIMESTAMP, JSON, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Job(Base):
+    """Unit of background work, claimed by app.cli.jobs workers with FOR UPDATE SKIP LOCKED"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim query: next runnable job of a queue by priority then age
+        Index("ix_jobs_claim", "queue", "priority", "run_at", postgresql_where=text("status = 'queued'")),
+        Index("ix_jobs_running_locked_at", "locked_at", postgresql_where=text("status = 'running'")),
+        Index("ix_jobs_tenant_created", "tenant_id", "created_at"),
+    )
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(PG_UUID(as_uuid=True), nullable=True)
+    created_by = Column(PG_UUID(as_uuid=True), nullable=True)
+    queue = Column(Text, nullable=False, default="default")
+    name = Column(Text, nullable=False)  # registered task name, see app/core/jobs.py
+    payload = Column(JSON, default={})
+    status = Column(Text, nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    priority = Column(Integer, nullable=False, default=100)  # lower runs first
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(Text, nullable=True)
+    locked_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
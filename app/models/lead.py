@@ -1,6 +1,6 @@
 # app/models/lead.py
 
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from uuid import uuid4
 from app.core.database import Base
@@ -8,6 +8,17 @@ from .base import TimestampMixin
 
 class Lead(Base, TimestampMixin):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_tenant_agent", "tenant_id", "agent_id"),
+        # Dedup blocking keys (see app/services/lead_dedup.py)
+        Index("ix_leads_tenant_phone_norm", "tenant_id", "phone_normalized"),
+        Index("ix_leads_tenant_email_local", "tenant_id", "email_local"),
+        # Requires: CREATE EXTENSION IF NOT EXISTS pg_trgm
+        Index(
+            "ix_leads_name_trgm", "name_normalized",
+            postgresql_using="gin", postgresql_ops={"name_normalized": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     tenant_id = Column(PGUUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
@@ -18,4 +29,11 @@ class Lead(Base, TimestampMixin):
     source = Column(String)
     status = Column(String, default="new")
     notes = Column(String)
-    next_followup = Column(DateTime(timezone=True))
\ No newline at end of file
+    next_followup = Column(DateTime(timezone=True))
+
+    # Normalized copies of phone/email/name used for duplicate detection
+    phone_normalized = Column(String)
+    email_normalized = Column(String)
+    email_local = Column(String)
+    name_normalized = Column(String)
+    duplicate_of = Column(PGUUID(as_uuid=True), ForeignKey("leads.id", ondelete="SET NULL"), nullable=True)
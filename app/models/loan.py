@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Integer, DECIMAL, Date, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, BigInteger, DECIMAL, Date, Text, ForeignKey, Sequence, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -23,8 +23,14 @@ class Loan(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+# Source of LoanApplication.reference_number (CRD<year><8-digit seq>); never collides, unlike random suffixes
+loan_application_ref_seq = Sequence("loan_application_ref_seq", start=1, metadata=Base.metadata)
+
 class LoanApplication(Base):
     __tablename__ = "loan_applications"
+    __table_args__ = (
+        Index("ix_loan_applications_user_status", "user_id", "status"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -43,6 +49,11 @@ class LoanApplication(Base):
 
 class LoanDocument(Base):
     __tablename__ = "loan_documents"
+    __table_args__ = (
+        # Reviewer queue: oldest waiting documents first (app/services/document_review_service.py)
+        Index("ix_loan_documents_status_uploaded", "status", "uploaded_at"),
+        Index("ix_loan_documents_application", "application_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id = Column(UUID(as_uuid=True), ForeignKey("loan_applications.id"), nullable=False)
@@ -50,9 +61,22 @@ class LoanDocument(Base):
     document_type = Column(String(100), nullable=False)  # Any document type: aadhar, aadhaar, pan, income_proof, etc.
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
-    status = Column(String(20), nullable=False, default="uploaded")  # uploaded, pending, verified, rejected
+    status = Column(String(20), nullable=False, default="uploaded")  # uploaded, pending (claimed by a reviewer), verified, rejected
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    verified_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # reviewer who verified or rejected
+    verified_at = Column(DateTime(timezone=True), nullable=True)
+    notes = Column(Text, nullable=True)  # review notes / rejection reason
+    # Filled in by the documents.process job (app/services/document_processing_service.py)
+    mime_type = Column(String(100), nullable=True)  # sniffed from the file's content
+    file_size = Column(BigInteger, nullable=True)
+    page_count = Column(Integer, nullable=True)
+    thumbnail_path = Column(String(500), nullable=True)
+    preview_path = Column(String(500), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
 
+# Partitioned by month on payment_date (app/core/partitions.py); the table's primary key is (id, payment_date)
 class LoanPayment(Base):
     __tablename__ = "loan_payments"
     
@@ -62,13 +86,20 @@ class LoanPayment(Base):
     amount_paid = Column(DECIMAL(10, 2), nullable=False)
     principal_component = Column(DECIMAL(10, 2), nullable=False)
     interest_component = Column(DECIMAL(10, 2), nullable=False)
+    penalty_component = Column(DECIMAL(10, 2), nullable=False, default=0)
+    prepayment_component = Column(DECIMAL(10, 2), nullable=False, default=0)  # principal paid ahead of schedule
+    payment_type = Column(String(20), nullable=False, default="emi")  # emi, partial, prepayment, foreclosure
     payment_method = Column(String(20))  # bank_transfer, upi, card
     payment_reference = Column(String(100))
     status = Column(String(20), nullable=False, default="paid")  # paid, pending, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+# Hash-partitioned on loan_id (app/core/partitions.py); the table's primary key is (id, loan_id)
 class EMISchedule(Base):
     __tablename__ = "emi_schedule"
+    __table_args__ = (
+        Index("ix_emi_schedule_loan_unpaid", "loan_id", "emi_number", postgresql_where=text("is_paid = false")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False)
@@ -77,6 +108,8 @@ class EMISchedule(Base):
     emi_amount = Column(DECIMAL(10, 2), nullable=False)
     principal_component = Column(DECIMAL(10, 2), nullable=False)
     interest_component = Column(DECIMAL(10, 2), nullable=False)
+    penalty_component = Column(DECIMAL(10, 2), nullable=False, default=0)  # late-payment penalty accrued so far
+    paid_amount = Column(DECIMAL(10, 2), nullable=False, default=0)  # applied penalty -> interest -> principal
     is_paid = Column(Boolean, default=False)
     payment_date = Column(Date)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
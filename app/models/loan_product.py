@@ -7,7 +7,7 @@ from app.core.database import Base
 class LoanProduct(Base):
     __tablename__ = "loan_products"
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id = Column(PG_UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True)
+    tenant_id = Column(PG_UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True, index=True)
     name = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
     interest_rate = Column(Numeric(5,2), nullable=True)
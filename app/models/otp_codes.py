@@ -4,6 +4,7 @@ from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# Partitioned by month on created_at (app/core/partitions.py); the table's primary key is (id, created_at)
 class OTPCodes(Base):
     __tablename__ = "otp_codes"
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
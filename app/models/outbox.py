@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Text, Integer, BigInteger, TIMESTAMP, JSON, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class OutboxEvent(Base):
+    """Domain event written in the same transaction as the state change it describes"""
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # The dispatcher only ever scans undelivered events, oldest first
+        Index("ix_outbox_events_pending", "id", postgresql_where=text("status = 'pending'")),
+        Index("ix_outbox_events_aggregate", "aggregate_type", "aggregate_id"),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(Text, nullable=False)  # e.g. loan_application.status_changed
+    aggregate_type = Column(Text, nullable=False)
+    aggregate_id = Column(Text, nullable=False)
+    tenant_id = Column(PG_UUID(as_uuid=True), nullable=True)
+    payload = Column(JSON, default={})
+    status = Column(Text, nullable=False, default="pending")  # pending, dispatched, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    dispatched_at = Column(TIMESTAMP(timezone=True), nullable=True)
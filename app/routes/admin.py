@@ -1,9 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+import os
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from app.core import jobs
+from app.core.audit import Auditor, get_auditor
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.events import record_event
+from app.core.pubsub import publish_user_event
+from app.core.tenancy import get_read_db
 from app.core.security import get_current_user_email
 from app.models.loan import LoanApplication, LoanDocument
 from app.models.user import User
+from app.schemas.audit_schema import AuditLogOut, AuditLogPage
+from app.schemas.document_review_schema import (
+    DocumentIds, DocumentQueueStats, DocumentRejectRequest, DocumentReviewRequest, DocumentReviewResult,
+    ReviewDocumentOut
+)
+from app.schemas.job_schema import JobOut
+from app.schemas.loan_management_schema import EligibilityResult
+from app.services import (
+    document_export_service, document_processing_service, document_review_service, eligibility_service
+)
 from app.crud import crud
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -11,7 +31,7 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 # Admin-only: List all loan applications with user name and documents
 @router.get("/loan-applications")
 def list_loan_applications(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user_email)
 ):
     if current_user.get("role") != "admin":
@@ -43,7 +63,8 @@ def list_loan_applications(
 def approve_loan_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
 ):
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -52,6 +73,243 @@ def approve_loan_application(
         raise HTTPException(status_code=404, detail="Application not found")
     if app.status == "approved":
         return {"status": "already_approved", "message": "Application already approved"}
+    previous_status = app.status
     app.status = "approved"
+    record_event(db, "loan_application.status_changed", "loan_application", app.id, {
+        "user_id": str(app.user_id), "from": previous_status, "to": app.status, "approved_by": current_user.get("user_id")
+    })
     db.commit()
+    audit("loan_application.approve", "loan_application", app.id, previous_status=previous_status)
+    publish_user_event(app.user_id, "application_status", {"application_id": application_id, "status": app.status})
     return {"status": "success", "message": "Loan application approved", "application_id": application_id}
+
+# Admin-only: Query the audit trail by time range / actor / object
+@router.get("/audit-logs", response_model=AuditLogPage)
+def list_audit_logs(
+    date_from: datetime = None,
+    date_to: datetime = None,
+    before: datetime = None,
+    user_id: str = None,
+    action: str = None,
+    object_type: str = None,
+    object_id: str = None,
+    tenant_id: str = None,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    rows = crud.list_audit_logs(
+        db, tenant_id=current_user.get("tenant_id") or tenant_id, user_id=user_id, action=action,
+        object_type=object_type, object_id=object_id, date_from=date_from, date_to=date_to,
+        before=before, limit=limit
+    )
+    return AuditLogPage(
+        items=[AuditLogOut.model_validate(r) for r in rows],
+        next_before=rows[-1].created_at if len(rows) == limit else None
+    )
+
+# Admin-only: (Re)score one application against the current eligibility rules
+@router.post("/loan-application/{application_id}/eligibility", response_model=EligibilityResult)
+def score_loan_application(
+    application_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    row = db.query(LoanApplication, User.tenant_id).join(User, User.id == LoanApplication.user_id).filter(
+        LoanApplication.id == application_id
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Application not found")
+    result = eligibility_service.score_application(db, row[0], row[1])
+    db.commit()
+    return result
+
+# Admin-only: Re-score the whole under_review queue in the background
+@router.post("/eligibility/rescore", status_code=202, response_model=JobOut)
+def rescore_pending_applications(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    job = jobs.enqueue(
+        db, "eligibility.rescore", {"tenant_id": current_user.get("tenant_id")},
+        tenant_id=current_user.get("tenant_id"), created_by=current_user["user_id"]
+    )
+    db.commit()
+    db.refresh(job)
+    return job
+
+# Admin-only: Size of the document review queue
+@router.get("/documents/queue", response_model=DocumentQueueStats)
+def document_queue_stats(
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return document_review_service.queue_stats(db, tenant_id=current_user.get("tenant_id"))
+
+# Admin-only: Take the next batch of documents to review (never handed to another reviewer meanwhile)
+@router.post("/documents/claim", response_model=List[ReviewDocumentOut])
+def claim_documents(
+    limit: int = Query(None, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return document_review_service.claim(
+        db, current_user["user_id"], limit=limit, tenant_id=current_user.get("tenant_id")
+    )
+
+# Admin-only: Documents the caller has claimed and not reviewed yet
+@router.get("/documents/claimed", response_model=List[ReviewDocumentOut])
+def list_claimed_documents(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return document_review_service.claimed_by(db, current_user["user_id"])
+
+# Admin-only: Hand claimed documents back to the queue unreviewed
+@router.post("/documents/release")
+def release_documents(
+    body: DocumentIds,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    released = document_review_service.release(db, current_user["user_id"], body.document_ids)
+    return {"status": "success", "released": released}
+
+# Admin-only: Open a document file for review
+@router.get("/documents/{document_id}/file")
+def view_review_document(
+    document_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    document = document_review_service.get_document(db, document_id, tenant_id=current_user.get("tenant_id"))
+    if not document or not os.path.exists(document.file_path):
+        raise HTTPException(status_code=404, detail="Document not found")
+    audit("loan_document.view", "loan_document", document.id, document_type=document.document_type)
+    media_type, disposition, headers = document_processing_service.serving(document.mime_type, document.file_path)
+    return FileResponse(
+        path=document.file_path,
+        media_type=media_type,
+        filename=document.file_name,
+        content_disposition_type=disposition,
+        headers=headers
+    )
+
+# Admin-only: Thumbnail or first-page preview of a document, for the review screens
+@router.get("/documents/{document_id}/preview")
+def preview_review_document(
+    document_id: str,
+    size: str = Query("thumbnail", pattern="^(thumbnail|page)$"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    document = document_review_service.get_document(db, document_id, tenant_id=current_user.get("tenant_id"))
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    path = document.thumbnail_path if size == "thumbnail" else document.preview_path
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Preview not available")
+    return FileResponse(
+        path=path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": f"private, max-age={settings.DOCUMENT_PREVIEW_MAX_AGE_SECONDS}, immutable"}
+    )
+
+def _review_documents(db: Session, current_user: dict, audit: Auditor, document_ids, decision: str, notes):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    result = document_review_service.review(
+        db, current_user["user_id"], document_ids, decision, notes=notes, tenant_id=current_user.get("tenant_id")
+    )
+    for document_id in result["reviewed"]:
+        audit(f"loan_document.{decision}", "loan_document", document_id, notes=notes)
+    for change in result["applications"]:
+        audit("loan_application.documents_reviewed", "loan_application", change["application_id"],
+              previous_status=change["previous_status"], status=change["status"])
+    return result
+
+# Admin-only: Verify documents in bulk
+@router.post("/documents/verify", response_model=DocumentReviewResult)
+def verify_documents(
+    body: DocumentReviewRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
+):
+    return _review_documents(db, current_user, audit, body.document_ids, "verify", body.notes)
+
+# Admin-only: Reject documents in bulk (the notes are the reason the customer sees)
+@router.post("/documents/reject", response_model=DocumentReviewResult)
+def reject_documents(
+    body: DocumentRejectRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
+):
+    return _review_documents(db, current_user, audit, body.document_ids, "reject", body.notes)
+
+def _export_documents(db: Session, current_user: dict, audit: Auditor, application_ids: List[str],
+                      status: Optional[str], filename: str):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if len(application_ids) > settings.DOCUMENT_EXPORT_MAX_APPLICATIONS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.DOCUMENT_EXPORT_MAX_APPLICATIONS} applications per export"
+        )
+    try:
+        members, counts = document_export_service.export_members(
+            db, application_ids, tenant_id=current_user.get("tenant_id"), status=status
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid application id")
+    if not members:
+        raise HTTPException(status_code=404, detail="No documents found")
+    for application_id, documents in counts.items():
+        audit("loan_document.export", "loan_application", application_id, documents=documents)
+    return StreamingResponse(
+        document_export_service.stream(members),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# Admin-only: All documents of one application as a ZIP, streamed
+@router.get("/loan-application/{application_id}/documents/export")
+def export_application_documents(
+    application_id: str,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
+):
+    return _export_documents(db, current_user, audit, [application_id], status, f"{application_id}-documents.zip")
+
+# Admin-only: Documents of several applications as one ZIP (a folder per application), streamed
+@router.get("/documents/export")
+def export_documents(
+    application_id: List[str] = Query(...),
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
+):
+    filename = f"documents-{datetime.utcnow():%Y%m%d-%H%M%S}.zip"
+    return _export_documents(db, current_user, audit, list(dict.fromkeys(application_id)), status, filename)
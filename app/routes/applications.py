@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.tenancy import TenantContext, get_tenant_context, get_tenant_db, get_tenant_read_db
 from app.schemas.application_schema import ApplicationCreate
 from app.crud import crud
 
 router = APIRouter()
 
 @router.get("/", response_model=dict)
-def list_applications(skip: int = 0, limit: int = 25, status: str = None, user_id: str = None, agent_id: str = None, db: Session = Depends(get_db)):
-    items = crud.list_applications(db, status=status, user_id=user_id, agent_id=agent_id, skip=skip, limit=limit)
+def list_applications(skip: int = 0, limit: int = 25, status: str = None, user_id: str = None, agent_id: str = None, tenant_id: str = None, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_tenant_read_db)):
+    items = crud.list_applications(db, tenant_id=tenant.resolve(tenant_id), status=status, user_id=user_id, agent_id=agent_id, skip=skip, limit=limit)
     return {"total": len(items), "items": items}
 
 @router.post("/", status_code=201)
@@ -17,7 +18,7 @@ def create_application(payload: ApplicationCreate, db: Session = Depends(get_db)
     return a
 
 @router.get("/{id}")
-def get_application(id: str, db: Session = Depends(get_db)):
+def get_application(id: str, db: Session = Depends(get_tenant_db)):
     a = crud.get_application(db, id)
     if not a:
         raise HTTPException(status_code=404)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app.core import jobs
+from app.core.audit import Auditor, get_auditor
+from app.core.config import settings
 from app.core.database import get_db
 from app.services.auth_service import AuthService, send_otp_service
 from app.schemas.auth_schema import (
@@ -25,7 +28,7 @@ def send_otp(payload: SendOTPSchema, db: Session = Depends(get_db)):
 
 
 @router.post("/verify-otp", response_model=TokenSchema)
-def verify_otp(payload: LoginSchema, db: Session = Depends(get_db)):
+def verify_otp(payload: LoginSchema, db: Session = Depends(get_db), audit: Auditor = Depends(get_auditor)):
     """Verify OTP and return JWT"""
     principal = payload.email or payload.phone
     token = AuthService(db).verify_otp_and_get_token(
@@ -34,7 +37,9 @@ def verify_otp(payload: LoginSchema, db: Session = Depends(get_db)):
         purpose="login"
     )
     if not token:
+        audit("auth.login_failed", principal=principal, method="otp")
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+    audit("auth.login", principal=principal, method="otp")
     return token
 
 
@@ -65,17 +70,21 @@ def set_password(
 @router.post("/login", response_model=LoginResponseSchema)
 def login(
     payload: EmailPasswordLoginSchema, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    audit: Auditor = Depends(get_auditor)
 ):
     """Login with email and password"""
     # Authenticate user
     user = crud.authenticate_user(db, payload.email, payload.password)
     if not user:
+        audit("auth.login_failed", email=payload.email)
         raise HTTPException(
             status_code=401, 
             detail="Invalid email or password"
         )
     
+    audit("auth.login", "user", user.id, user_id=user.id, tenant_id=user.tenant_id, method="password")
+
     # Create access token
     token = create_access_token({
         "user_id": str(user.id),
@@ -122,6 +131,14 @@ def forgot_password(
     # Create password reset token
     reset_token = crud.create_password_reset_token(db, str(user.id))
     
+    if settings.MAIL_DELIVERY == "queue":
+        # Delivered (with retries) by a worker on the 'mail' queue
+        jobs.enqueue(db, "mail.password_reset", {
+            "recipient_email": user.email, "reset_token": reset_token.token, "base_url": "http://localhost:5000"
+        }, tenant_id=user.tenant_id, created_by=user.id)
+        db.commit()
+        return {"message": "If the email exists in our system, you will receive a password reset link"}
+
     # Send password reset email
     email_sent = send_password_reset_email(
         recipient_email=user.email,
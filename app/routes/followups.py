@@ -1,17 +1,47 @@
-from fastapi import APIRouter, Depends
-from app.core.database import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.schemas.application_schema import ApplicationOut
+from app.core.tenancy import TenantContext, get_tenant_context, get_tenant_db
+from app.schemas.followup_schema import FollowUpCreate, FollowUpUpdate, FollowUpOut
+from app.services.followup_scheduler import scheduler
 from app.crud import crud
 
 router = APIRouter()
 
 @router.get("/", response_model=dict)
-def list_followups(skip: int = 0, limit: int = 25, status: str = None, db: Session = Depends(get_db)):
-    items = crud.list_followups(db, status=status, skip=skip, limit=limit)
-    return {"total": len(items), "items": items}
+def list_followups(
+    skip: int = 0,
+    limit: int = 25,
+    status: str = "pending",
+    due_before: datetime = None,
+    due_after: datetime = None,
+    agent_id: str = None,
+    lead_id: str = None,
+    tenant_id: str = None,
+    tenant: TenantContext = Depends(get_tenant_context),
+    db: Session = Depends(get_tenant_db)
+):
+    items = crud.list_followups(
+        db, tenant_id=tenant.resolve(tenant_id), agent_id=agent_id, lead_id=lead_id, status=status,
+        due_before=due_before, due_after=due_after, skip=skip, limit=limit
+    )
+    return {"total": len(items), "items": [FollowUpOut.model_validate(f) for f in items]}
 
-@router.post("/", status_code=201)
-def create_followup(payload: dict, db: Session = Depends(get_db)):
+@router.post("/", status_code=201, response_model=FollowUpOut)
+def create_followup(payload: FollowUpCreate, db: Session = Depends(get_tenant_db)):
     rec = crud.create_followup(db, payload)
+    if not rec:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    scheduler.schedule(rec.id, rec.due_at)
+    return rec
+
+@router.patch("/{followup_id}", response_model=FollowUpOut)
+def update_followup(followup_id: str, payload: FollowUpUpdate, db: Session = Depends(get_tenant_db)):
+    rec = crud.update_followup(db, followup_id, payload)
+    if not rec:
+        raise HTTPException(status_code=404, detail="Follow-up not found")
+    if rec.status == "pending" and rec.reminded_at is None:
+        scheduler.schedule(rec.id, rec.due_at)
+    else:
+        scheduler.cancel(rec.id)
     return rec
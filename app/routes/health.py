@@ -0,0 +1,23 @@
+import time
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core import health
+
+router = APIRouter()
+
+_started = time.time()
+
+@router.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving. Dependencies are /readyz's concern, so a
+    database outage takes workers out of rotation instead of getting them restarted."""
+    return {"status": "ok", "uptime_seconds": int(time.time() - _started)}
+
+@router.get("/readyz")
+def readyz():
+    """Readiness: 200 when every critical check passes, 503 otherwise. Results are cached
+    per worker for HEALTH_CACHE_SECONDS."""
+    ready, checks = health.readiness()
+    degraded = any(not c["ok"] for c in checks.values())
+    status = "not_ready" if not ready else "degraded" if degraded else "ready"
+    return JSONResponse(status_code=200 if ready else 503, content={"status": status, "checks": checks})
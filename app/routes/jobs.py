@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core import jobs
+from app.core.security import get_current_user_email
+from app.core.tenancy import get_tenant_db
+from app.models.job import Job
+from app.schemas.job_schema import JobCreate, JobOut
+
+router = APIRouter()
+
+def _visible(job: Job, current_user: dict) -> bool:
+    return current_user.get("role") == "admin" or str(job.created_by) == str(current_user["user_id"])
+
+@router.post("/", status_code=202, response_model=JobOut)
+def enqueue_job(payload: JobCreate, db: Session = Depends(get_tenant_db), current_user: dict = Depends(get_current_user_email)):
+    """Queue any registered task (admin only)"""
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    try:
+        job = jobs.enqueue(
+            db, payload.name, payload.payload, queue=payload.queue, priority=payload.priority, run_at=payload.run_at,
+            tenant_id=current_user.get("tenant_id"), created_by=current_user["user_id"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    db.refresh(job)
+    return job
+
+@router.get("/", response_model=dict)
+def list_jobs(status: str = None, name: str = None, skip: int = 0, limit: int = 25,
+              db: Session = Depends(get_tenant_db), current_user: dict = Depends(get_current_user_email)):
+    q = db.query(Job)
+    if current_user.get("role") != "admin":
+        q = q.filter(Job.created_by == current_user["user_id"])
+    if status:
+        q = q.filter(Job.status == status)
+    if name:
+        q = q.filter(Job.name == name)
+    items = q.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
+    return {"total": len(items), "items": [JobOut.model_validate(j) for j in items]}
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: str, db: Session = Depends(get_tenant_db), current_user: dict = Depends(get_current_user_email)):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or not _visible(job, current_user):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{job_id}/cancel", response_model=JobOut)
+def cancel_job(job_id: str, db: Session = Depends(get_tenant_db), current_user: dict = Depends(get_current_user_email)):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or not _visible(job, current_user):
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "queued":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} and can no longer be cancelled")
+    return jobs.cancel_job(db, job.id)
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+import os
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.core import jobs
+from app.core.config import settings
 from app.core.database import get_db
-from app.schemas.lead_schema import LeadCreate
+from app.core.tenancy import TenantContext, get_tenant_context, get_tenant_db, get_tenant_read_db
+from app.schemas.lead_schema import LeadCreate, LeadImportReport
+from app.schemas.job_schema import JobOut
+from app.services import lead_service
+from app.utils.files import save_upload_file
 from app.crud import crud
 
 router = APIRouter()
 
 @router.get("/", response_model=dict)
-def list_leads(skip: int = 0, limit: int = 25, agent_id: str = None, db: Session = Depends(get_db)):
-    items = crud.list_leads(db, agent_id=agent_id, skip=skip, limit=limit)
+def list_leads(skip: int = 0, limit: int = 25, agent_id: str = None, tenant_id: str = None, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_tenant_read_db)):
+    items = crud.list_leads(db, tenant_id=tenant.resolve(tenant_id), agent_id=agent_id, skip=skip, limit=limit)
     return {"total": len(items), "items": items}
 
 @router.post("/", status_code=201)
@@ -16,8 +24,46 @@ def create_lead(payload: LeadCreate, db: Session = Depends(get_db)):
     l = crud.create_lead(db, payload)
     return l
 
+@router.post("/import", response_model=LeadImportReport)
+def import_leads(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (.ndjson/.jsonl)"),
+    format: str = Form(None, description="csv or ndjson; inferred from the file name if omitted"),
+    tenant_id: str = Form(None),
+    agent_id: str = Form(None),
+    batch_size: int = Form(None),
+    background: bool = Form(False, description="queue the import as a job and return it (202) instead of waiting"),
+    tenant: TenantContext = Depends(get_tenant_context),
+    db: Session = Depends(get_db)
+):
+    """Bulk import leads from a campaign spreadsheet export"""
+    fmt = format or lead_service.detect_format(file.filename)
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if background:
+        try:
+            path, _ = save_upload_file(file, os.path.join(settings.UPLOAD_DIR, "imports"))
+        finally:
+            file.file.close()
+        job = jobs.enqueue(db, "leads.import", {
+            "path": os.path.abspath(path), "format": fmt, "tenant_id": tenant.resolve(tenant_id),
+            "agent_id": agent_id, "batch_size": batch_size
+        }, tenant_id=tenant.tenant_id, created_by=tenant.user_id)
+        db.commit()
+        db.refresh(job)
+        return JSONResponse(status_code=202, content=JobOut.model_validate(job).model_dump(mode="json"))
+    try:
+        records = lead_service.iter_records(file.file, fmt)
+        return lead_service.import_leads(
+            db, records,
+            tenant_id=tenant.resolve(tenant_id),
+            agent_id=agent_id,
+            batch_size=batch_size
+        )
+    finally:
+        file.file.close()
+
 @router.get("/{id}")
-def get_lead(id: str, db: Session = Depends(get_db)):
+def get_lead(id: str, db: Session = Depends(get_tenant_db)):
     l = db.query(crud.lead_model.Lead).filter(crud.lead_model.Lead.id == id).first()
     if not l:
         raise HTTPException(status_code=404)
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+import asyncio
+import json
 import logging
 import os
-from app.core.database import get_db
+import shutil
+from app.core.audit import Auditor, get_auditor
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.idempotency import fingerprint, idempotency_store
+from app.core.events import record_event
+from app.core.pubsub import broker, publish_user_event, user_topic
 from app.core.security import get_current_user_email
+from app.services import dashboard_service, document_processing_service, eligibility_service
 from app.services.loan_management_service import LoanManagementService
 from app.schemas.loan_management_schema import (
     UserLoanStatusResponse,
@@ -13,10 +23,14 @@ from app.schemas.loan_management_schema import (
     CancelApplicationResponse,
     LoanDetailsResponse,
     LoanPaymentCreate,
-    PaymentResponse
+    PaymentResponse,
+    EligibilityCheck,
+    EligibilityResponse,
+    ForeclosureQuoteResponse,
+    DashboardResponse
 )
 from app.crud import crud
-from typing import Dict
+from typing import Dict, Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -39,13 +53,63 @@ def get_user_loan_status(
     
     return UserLoanStatusResponse(data=loan_status_data)
 
+@router.get("/user/dashboard", response_model=DashboardResponse)
+def get_user_dashboard(
+    payments: int = Query(10, ge=0, le=settings.DASHBOARD_MAX_ITEMS),
+    emis: int = Query(3, ge=0, le=settings.DASHBOARD_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    """Home screen in one call: loan status, loan details, the last `payments` payments and next `emis` EMIs"""
+    data = dashboard_service.get_dashboard(db, current_user["user_id"], payments, emis)
+    if data is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return DashboardResponse(data=data)
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _load_loan_status(user_id: str) -> dict:
+    db = SessionLocal()
+    try:
+        return LoanManagementService.get_user_loan_status(db, user_id).model_dump(mode="json")
+    finally:
+        db.close()
+
+@router.get("/user/loan-status/stream")
+async def stream_user_loan_status(
+    request: Request,
+    current_user: dict = Depends(get_current_user_email)
+):
+    """Server-Sent Events: a full loan_status snapshot, then application/document/payment deltas as they happen"""
+    user_id = str(current_user["user_id"])
+
+    async def events():
+        # Subscribe before taking the snapshot so no change falls between the two
+        async with broker.subscribe(user_topic(user_id)) as queue:
+            yield f"retry: 5000\n{_sse('loan_status', await run_in_threadpool(_load_loan_status, user_id))}"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(message["event"], message["data"])
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/loan/apply", response_model=LoanApplicationResponse)
 def apply_for_loan(
     application_data: LoanApplicationCreate,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=128)
 ):
-    """Submit new loan application"""
+    """Submit new loan application; retries carrying the same Idempotency-Key get the original response back"""
     
     logger.info(f"=== LOAN APPLICATION ROUTE DEBUG ===")
     logger.info(f"Current user from JWT: {current_user}")
@@ -62,21 +126,46 @@ def apply_for_loan(
         logger.error(f"User lookup failed: {e}")
         raise HTTPException(status_code=500, detail=f"User lookup failed: {str(e)}")
     
+    request_fingerprint = fingerprint(application_data)
+    if idempotency_key:
+        replay = idempotency_store.begin("loan_apply", str(user.id), idempotency_key, request_fingerprint)
+        if replay is not None:
+            logger.info(f"Replaying stored response for Idempotency-Key {idempotency_key}")
+            return replay
+    
     try:
         logger.info(f"Calling LoanManagementService.create_loan_application with user_id={str(user.id)}")
         result = LoanManagementService.create_loan_application(
-            db, str(user.id), application_data
+            db, str(user.id), application_data, tenant_id=user.tenant_id
         )
         logger.info(f"Service returned: {result}")
         
-        return LoanApplicationResponse(data=result)
+        response = LoanApplicationResponse(data=result)
+        if idempotency_key:
+            idempotency_store.complete("loan_apply", str(user.id), idempotency_key, request_fingerprint, 200, response)
+        return response
     
     except Exception as e:
+        if idempotency_key:
+            idempotency_store.release("loan_apply", str(user.id), idempotency_key)
         logger.error(f"Loan application creation failed: {e}")
         import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/loan/eligibility", response_model=EligibilityResponse)
+def check_loan_eligibility(
+    payload: EligibilityCheck,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    """Pre-check eligibility (FOIR, best matching product, max eligible amount) without applying"""
+    result = eligibility_service.check(
+        db, current_user.get("tenant_id"), payload.monthly_income, payload.existing_emis,
+        payload.employment_type, payload.requested_amount, payload.loan_type
+    )
+    return EligibilityResponse(data=result)
+
 @router.put("/loan/application/{application_id}/cancel", response_model=CancelApplicationResponse)
 def cancel_loan_application(
     application_id: str,
@@ -128,7 +217,8 @@ def get_loan_details(
 def approve_loan_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
 ):
     """Approve a loan application (admin only)"""
     if current_user.get("role") != "admin":
@@ -140,14 +230,21 @@ def approve_loan_application(
         raise HTTPException(status_code=404, detail="Application not found")
     if application.status == "approved":
         return {"status": "already_approved", "message": "Application already approved"}
+    previous_status = application.status
     application.status = "approved"
+    record_event(db, "loan_application.status_changed", "loan_application", application.id, {
+        "user_id": str(application.user_id), "from": previous_status, "to": application.status, "approved_by": current_user.get("user_id")
+    })
     db.commit()
+    audit("loan_application.approve", "loan_application", application.id, previous_status=previous_status)
+    publish_user_event(application.user_id, "application_status", {"application_id": application_id, "status": application.status})
     return {"status": "success", "message": "Loan application approved", "application_id": application_id}
 @router.post("/loan/payment", response_model=PaymentResponse)
 def process_loan_payment(
     payment_data: LoanPaymentCreate,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
 ):
     """Process loan payment"""
     
@@ -160,6 +257,9 @@ def process_loan_payment(
         result = LoanManagementService.process_loan_payment(
             db, str(user.id), payment_data
         )
+        audit("loan.payment", "loan", payment_data.loan_id, payment_id=result["payment_id"],
+              amount_paid=result["amount_paid"], payment_method=payment_data.payment_method,
+              payment_type=result["allocation"]["payment_type"])
         
         return PaymentResponse(
             message="Payment processed successfully",
@@ -171,6 +271,24 @@ def process_loan_payment(
     except Exception as e:
         raise HTTPException(status_code=500, detail="Payment processing failed")
 
+@router.get("/loan/{loan_id}/foreclosure-quote", response_model=ForeclosureQuoteResponse)
+def get_foreclosure_quote(
+    loan_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    """Amount that closes the loan today; pay it with foreclose=true"""
+    
+    user = crud.get_user_by_email(db, current_user["email"])
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    try:
+        quote = LoanManagementService.get_foreclosure_quote(db, str(user.id), loan_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return ForeclosureQuoteResponse(data=quote)
+
 @router.post("/loan/application/{application_id}/documents")
 def upload_application_document(
     application_id: str,
@@ -204,8 +322,7 @@ def upload_application_document(
     file_path = os.path.join(upload_dir, file.filename)
     try:
         with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
+            shutil.copyfileobj(file.file, buffer, 1024 * 1024)
         logger.info(f"File saved to disk: {file_path}")
     except Exception as e:
         logger.error(f"Failed to save file to disk: {e}")
@@ -240,7 +357,8 @@ def upload_application_document(
 def view_loan_document(
     document_id: str,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
 ):
     """View/download a loan application document"""
     
@@ -284,22 +402,50 @@ def view_loan_document(
         raise HTTPException(status_code=404, detail=f"File not found on server: {document['file_path']}")
     
     logger.info(f"File exists! Returning FileResponse for: {document['file_name']}")
+    audit("loan_document.view", "loan_document", document_id, document_type=document["document_type"])
     
-    # Return the file for viewing
+    # Inline only for sniffed PDFs and images; anything else downloads
+    media_type, disposition, headers = document_processing_service.serving(document["mime_type"], document['file_path'])
     return FileResponse(
         path=document['file_path'],
-        media_type="application/pdf",  # Assuming PDF, adjust if needed
+        media_type=media_type,
         filename=document['file_name'],
-        headers={
-            "Content-Disposition": f'inline; filename="{document["file_name"]}"'
-        }
+        content_disposition_type=disposition,
+        headers=headers
+    )
+
+@router.get("/loan/document/{document_id}/preview")
+def preview_loan_document(
+    document_id: str,
+    size: str = Query("thumbnail", pattern="^(thumbnail|page)$"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_email)
+):
+    """Thumbnail or first-page preview (JPEG) of a document, once processed"""
+    
+    user = crud.get_user_by_email(db, current_user["email"])
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    document = LoanManagementService.get_document_by_id(db, document_id, str(user.id))
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found or access denied")
+    
+    path = document["thumbnail_path"] if size == "thumbnail" else document["preview_path"]
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Preview not available")
+    # One document's preview never changes, so clients and proxies may keep it
+    return FileResponse(
+        path=path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": f"private, max-age={settings.DOCUMENT_PREVIEW_MAX_AGE_SECONDS}, immutable"}
     )
 
 @router.get("/loan/document/{document_id}/download")
 def download_loan_document(
     document_id: str,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user_email)
+    current_user: dict = Depends(get_current_user_email),
+    audit: Auditor = Depends(get_auditor)
 ):
     """Download a loan application document"""
     
@@ -343,13 +489,12 @@ def download_loan_document(
         raise HTTPException(status_code=404, detail=f"File not found on server: {document['file_path']}")
     
     logger.info(f"File exists! Returning FileResponse for download: {document['file_name']}")
+    audit("loan_document.download", "loan_document", document_id, document_type=document["document_type"])
     
     # Return the file for download
     return FileResponse(
         path=document['file_path'],
         media_type="application/octet-stream",
         filename=document['file_name'],
-        headers={
-            "Content-Disposition": f'attachment; filename="{document["file_name"]}"'
-        }
+        headers={"X-Content-Type-Options": "nosniff"}
     )
\ No newline at end of file
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from app.core import finance
+from app.core.cache import response_cache
+from app.core.config import settings
 from app.core.database import get_db
-from app.schemas.loan_schema import LoanProductCreate
+from app.core.tenancy import TenantContext, get_tenant_context, get_read_db
+from app.schemas.loan_schema import (
+    LoanProductCreate, LoanQuoteRequest, LoanQuoteOut, LoanQuoteGridRequest, LoanQuoteGridOut
+)
 from app.crud import crud
 
 router = APIRouter()
 
 @router.get("/", response_model=dict)
-def list_products(skip: int = 0, limit: int = 25, tenant_id: str = None, db: Session = Depends(get_db)):
-    items = crud.list_loan_products(db, tenant_id=tenant_id, skip=skip, limit=limit)
-    return {"total": len(items), "items": items}
+def list_products(request: Request, skip: int = 0, limit: int = 25, tenant_id: str = None, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_db)):
+    # Cached responses are built on the primary: a lagging replica could re-cache the catalog from before a write
+    def build():
+        items = crud.list_loan_products(db, tenant_id=tenant_id, skip=skip, limit=limit)
+        return {"total": len(items), "items": items}
+    return response_cache.respond(request, "loan_products", settings.LOAN_PRODUCT_CACHE_TTL_SECONDS, build, tenant_id=tenant.tenant_id)
 
 @router.post("/", status_code=201)
 def create_product(payload: LoanProductCreate, db: Session = Depends(get_db)):
@@ -17,8 +26,76 @@ def create_product(payload: LoanProductCreate, db: Session = Depends(get_db)):
     return p
 
 @router.get("/{id}")
-def get_product(id: str, db: Session = Depends(get_db)):
-    p = db.query(crud.lp_model.LoanProduct).filter(crud.lp_model.LoanProduct.id == id).first()
-    if not p:
-        raise HTTPException(status_code=404)
+def get_product(id: str, request: Request, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_db)):
+    def build():
+        p = crud.get_loan_product(db, id)
+        if not p:
+            raise HTTPException(status_code=404)
+        return p
+    return response_cache.respond(request, "loan_products", settings.LOAN_PRODUCT_CACHE_TTL_SECONDS, build, tenant_id=tenant.tenant_id)
+
+def _quotable_product(db: Session, id: str):
+    p = crud.get_loan_product(db, id)
+    if not p or not p.active:
+        raise HTTPException(status_code=404, detail="Loan product not found")
+    if p.interest_rate is None:
+        raise HTTPException(status_code=422, detail="Loan product has no interest rate")
     return p
+
+def _check_amount(p, amount: float):
+    if p.min_amount is not None and amount < float(p.min_amount):
+        raise HTTPException(status_code=422, detail=f"Amount is below the product minimum of {p.min_amount}")
+    if p.max_amount is not None and amount > float(p.max_amount):
+        raise HTTPException(status_code=422, detail=f"Amount is above the product maximum of {p.max_amount}")
+
+def _check_tenure(p, months: int):
+    if p.tenure_months and months not in p.tenure_months:
+        raise HTTPException(status_code=422, detail=f"Tenure must be one of {sorted(p.tenure_months)} months")
+
+@router.post("/{id}/quote", response_model=LoanQuoteOut)
+def quote_product(id: str, payload: LoanQuoteRequest, db: Session = Depends(get_read_db)):
+    """EMI, total interest and the first `preview_months` instalments for an amount and tenure"""
+    p = _quotable_product(db, id)
+    _check_amount(p, payload.amount)
+    months = payload.tenure_months
+    if months is None:
+        if not p.tenure_months:
+            raise HTTPException(status_code=422, detail="tenure_months is required for this product")
+        months = max(p.tenure_months)
+    _check_tenure(p, months)
+    a = finance.amortize(payload.amount, p.interest_rate, months)
+    return LoanQuoteOut(
+        product_id=str(p.id),
+        amount=a.principal,
+        interest_rate=a.annual_rate_pct,
+        tenure_months=a.months,
+        emi=a.emi,
+        total_interest=a.total_interest,
+        total_payable=a.total_payable,
+        schedule=[vars(row) for row in a.schedule[:payload.preview_months]]
+    )
+
+@router.post("/{id}/quote/grid", response_model=LoanQuoteGridOut)
+def quote_product_grid(id: str, payload: LoanQuoteGridRequest, db: Session = Depends(get_read_db)):
+    """EMIs for every amount x tenure combination (tenures default to the product's)"""
+    p = _quotable_product(db, id)
+    tenures = payload.tenures or sorted(p.tenure_months or [])
+    if not tenures:
+        raise HTTPException(status_code=422, detail="tenures are required for this product")
+    if len(payload.amounts) * len(tenures) > settings.QUOTE_GRID_MAX_CELLS:
+        raise HTTPException(status_code=422, detail=f"At most {settings.QUOTE_GRID_MAX_CELLS} amount x tenure combinations per request")
+    for amount in payload.amounts:
+        if amount <= 0:
+            raise HTTPException(status_code=422, detail="Amounts must be positive")
+        _check_amount(p, amount)
+    for months in tenures:
+        if months <= 0:
+            raise HTTPException(status_code=422, detail="Tenures must be positive")
+        _check_tenure(p, months)
+    return LoanQuoteGridOut(
+        product_id=str(p.id),
+        interest_rate=float(p.interest_rate),
+        amounts=payload.amounts,
+        tenures=tenures,
+        emi=finance.emi_grid(payload.amounts, p.interest_rate, tenures)
+    )
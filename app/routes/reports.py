@@ -1,31 +1,30 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core import jobs
+from app.core.tenancy import TenantContext, get_tenant_context, get_tenant_db, get_tenant_read_db
 from app.crud import crud
-from sqlalchemy import func
+from app.schemas.job_schema import JobOut
 
 router = APIRouter()
 
+def _enqueue_report(db: Session, tenant: TenantContext, name: str, tenant_id: str = None):
+    job = jobs.enqueue(db, name, {"tenant_id": tenant_id}, tenant_id=tenant.tenant_id, created_by=tenant.user_id)
+    db.commit()
+    db.refresh(job)
+    return JSONResponse(status_code=202, content=JobOut.model_validate(job).model_dump(mode="json"))
+
 @router.get("/applications-summary")
-def applications_summary(tenant_id: str = None, db: Session = Depends(get_db)):
-    rows = crud.applications_summary(db, tenant_id=tenant_id)
+def applications_summary(tenant_id: str = None, background: bool = False, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_tenant_db), read_db: Session = Depends(get_tenant_read_db)):
+    """background=true queues the report and returns the job; poll GET /v1/jobs/{id} for the result"""
+    if background:
+        return _enqueue_report(db, tenant, "reports.applications_summary", tenant.resolve(tenant_id))
+    rows = crud.applications_summary(read_db, tenant_id=tenant.resolve(tenant_id))
     return {"totals": rows}
 
 @router.get("/agent-performance")
-def agent_performance(tenant_id: str = None, db: Session = Depends(get_db)):
+def agent_performance(tenant_id: str = None, background: bool = False, tenant: TenantContext = Depends(get_tenant_context), db: Session = Depends(get_tenant_db), read_db: Session = Depends(get_tenant_read_db)):
     # Basic aggregated report
-    leads = db.query(crud.lead_model.Lead.agent_id, func.count(crud.lead_model.Lead.id)).group_by(crud.lead_model.Lead.agent_id)
-    apps = db.query(crud.app_model.Application.agent_id, func.count(crud.app_model.Application.id)).group_by(crud.app_model.Application.agent_id)
-    lead_map = {str(r[0]): r[1] for r in leads.all()}
-    app_map = {str(r[0]): r[1] for r in apps.all()}
-    agents = set(list(lead_map.keys()) + list(app_map.keys()))
-    result = []
-    for a in agents:
-        result.append({
-            "agent_id": a,
-            "total_leads": lead_map.get(a, 0),
-            "applications_submitted": app_map.get(a, 0),
-            "approved_count": 0,
-            "conversion_rate": 0.0
-        })
-    return result
+    if background:
+        return _enqueue_report(db, tenant, "reports.agent_performance", tenant.resolve(tenant_id))
+    return crud.agent_performance(read_db, tenant_id=tenant.resolve(tenant_id))
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from app.core.cache import response_cache
+from app.core.config import settings
 from app.core.database import get_db
-from app.schemas.tenant_schema import TenantCreate, TenantOut
+from app.core.tenancy import get_read_db
+from app.schemas.tenant_schema import TenantCreate, TenantUpdate, TenantOut
 from app.crud import crud
 
 router = APIRouter()
 
 @router.get("/", response_model=dict)
-def list_tenants(skip: int = 0, limit: int = 25, db: Session = Depends(get_db)):
+def list_tenants(skip: int = 0, limit: int = 25, db: Session = Depends(get_read_db)):
     items = crud.list_tenants(db, skip=skip, limit=limit)
     return {"total": len(items), "items": items}
 
@@ -17,8 +20,17 @@ def create_tenant(payload: TenantCreate, db: Session = Depends(get_db)):
     return t
 
 @router.get("/{tenant_id}", response_model=TenantOut)
-def get_tenant(tenant_id: str, db: Session = Depends(get_db)):
-    t = crud.get_tenant(db, tenant_id)
+def get_tenant(tenant_id: str, request: Request, db: Session = Depends(get_db)):
+    def build():
+        t = crud.get_tenant_cached(db, tenant_id)
+        if not t:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        return TenantOut.model_validate(t)
+    return response_cache.respond(request, "tenants", settings.TENANT_RESPONSE_CACHE_TTL_SECONDS, build, tenant_id=tenant_id)
+
+@router.patch("/{tenant_id}", response_model=TenantOut)
+def update_tenant(tenant_id: str, payload: TenantUpdate, db: Session = Depends(get_db)):
+    t = crud.update_tenant(db, tenant_id, payload)
     if not t:
         raise HTTPException(status_code=404, detail="Tenant not found")
-    return t
+    return crud.get_tenant_cached(db, tenant_id)
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.tenancy import get_read_db
 from app.schemas.user_schema import UserCreate, UserOut
 from app.services.user_service import UserService
 from pydantic import BaseModel, EmailStr
-import bcrypt
-from app.core.security import get_current_user_email
+from app.core.security import get_current_user_email, hash_password
 
 router = APIRouter()
 
@@ -15,7 +15,7 @@ class AdminRegisterRequest(BaseModel):
     password: str
 
 @router.get("/", response_model=dict)
-def list_users(skip: int = 0, limit: int = 25, role: str = None, db: Session = Depends(get_db)):
+def list_users(skip: int = 0, limit: int = 25, role: str = None, db: Session = Depends(get_read_db)):
     s = UserService(db)
     items = s.list(skip=skip, limit=limit, role=role)
     return {"total": len(items), "items": items}
@@ -47,7 +47,7 @@ def register_admin(
         raise HTTPException(status_code=400, detail="User with this email already exists")
 
     # Hash password
-    password_hash = bcrypt.hashpw(req.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    password_hash = hash_password(req.password)
 
     # Create user
     from app.models.user import User
@@ -0,0 +1,23 @@
+# app/schemas/audit_schema.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+class AuditLogOut(BaseModel):
+    id: UUID
+    tenant_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    action: Optional[str] = None
+    object_type: Optional[str] = None
+    object_id: Optional[UUID] = None
+    meta: Optional[dict] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogOut]
+    # Pass as ?before= to get the next (older) page
+    next_before: Optional[datetime] = None
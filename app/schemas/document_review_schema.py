@@ -0,0 +1,48 @@
+# app/schemas/document_review_schema.py
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+class ReviewDocumentOut(BaseModel):
+    id: UUID
+    application_id: UUID
+    user_id: UUID
+    document_type: str
+    file_name: str
+    status: str
+    uploaded_at: Optional[datetime] = None
+    claimed_at: Optional[datetime] = None
+    mime_type: Optional[str] = None
+    file_size: Optional[int] = None
+    page_count: Optional[int] = None
+    processed_at: Optional[datetime] = None  # previews available from /admin/documents/{id}/preview once set
+
+    model_config = ConfigDict(from_attributes=True)
+
+class DocumentIds(BaseModel):
+    document_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+class DocumentReviewRequest(DocumentIds):
+    notes: Optional[str] = None
+
+class DocumentRejectRequest(DocumentIds):
+    notes: str = Field(..., min_length=1)  # shown to the customer as the rejection reason
+
+class ApplicationAdvance(BaseModel):
+    application_id: str
+    previous_status: str
+    status: str
+    current_step: int
+
+class DocumentReviewResult(BaseModel):
+    status: str
+    reviewed: List[str]
+    skipped: List[str]  # not waiting for review, or claimed by another reviewer
+    applications: List[ApplicationAdvance] = []
+
+class DocumentQueueStats(BaseModel):
+    waiting: int
+    in_review: int
+    oldest_waiting_since: Optional[datetime] = None
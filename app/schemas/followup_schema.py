@@ -0,0 +1,34 @@
+# app/schemas/followup_schema.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Literal
+from datetime import datetime
+from uuid import UUID
+
+class FollowUpCreate(BaseModel):
+    lead_id: UUID
+    due_at: datetime
+    agent_id: Optional[UUID] = None  # defaults to the lead's agent
+    channel: Optional[str] = None
+    notes: Optional[str] = None
+
+class FollowUpUpdate(BaseModel):
+    status: Optional[Literal["pending", "done", "cancelled"]] = None
+    due_at: Optional[datetime] = None
+    channel: Optional[str] = None
+    notes: Optional[str] = None
+
+class FollowUpOut(BaseModel):
+    id: UUID
+    tenant_id: UUID
+    lead_id: UUID
+    agent_id: UUID
+    due_at: datetime
+    status: str
+    channel: Optional[str] = None
+    notes: Optional[str] = None
+    reminded_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
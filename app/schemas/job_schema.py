@@ -0,0 +1,31 @@
+# app/schemas/job_schema.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Any
+from datetime import datetime
+from uuid import UUID
+
+class JobCreate(BaseModel):
+    name: str
+    payload: dict = {}
+    queue: Optional[str] = None
+    priority: int = 100
+    run_at: Optional[datetime] = None
+
+class JobOut(BaseModel):
+    id: UUID
+    tenant_id: Optional[UUID] = None
+    queue: str
+    name: str
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,26 +1,27 @@
 # app/schemas/lead_schema.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
+from datetime import datetime
 from uuid import UUID
 
 # --- Define Base/Common Lead Fields ---
 class LeadBase(BaseModel):
-    # Replace these placeholder fields with your actual column names and types
+    # Mirrors the columns of the 'leads' table (app/models/lead.py)
     tenant_id: UUID
-    status: str = "New" 
-    client_name: str
-    phone_number: str
+    agent_id: UUID
+    customer_name: str
+    phone: Optional[str] = None
     email: Optional[str] = None
-    loan_amount_requested: float
-    
-    # You will likely need more fields here matching your 'leads' table.
+    source: Optional[str] = None
+    status: str = "new"
+    notes: Optional[str] = None
+    next_followup: Optional[datetime] = None
 
 
 # --- Creation Schema ---
-# This is the class needed to fix the AttributeError
 class LeadCreate(LeadBase):
-    # Inherits all fields from LeadBase. 
+    # Inherits all fields from LeadBase.
     # Add any fields specific to creation here, if necessary.
     pass
 
@@ -29,16 +30,33 @@ class LeadCreate(LeadBase):
 class LeadUpdate(LeadBase):
     # Make most fields optional for updates
     tenant_id: Optional[UUID] = None
+    agent_id: Optional[UUID] = None
+    customer_name: Optional[str] = None
     status: Optional[str] = None
-    client_name: Optional[str] = None
-    phone_number: Optional[str] = None
-    loan_amount_requested: Optional[float] = None
 
 
 # --- Read/Response Schema (includes database-generated fields) ---
 class Lead(LeadBase):
-    id: int # Assuming 'id' is an auto-incrementing integer in your leads table
-    created_at: Optional[str] = None 
-    
+    id: UUID
+    duplicate_of: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
     # Pydantic V2 config (resolves the user warning you are seeing)
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+# --- Bulk import ---
+class LeadImportError(BaseModel):
+    row: int  # 1-based data row number in the uploaded file
+    errors: List[str]
+
+
+class LeadImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    merged: int = 0  # folded into an existing lead (LEAD_DEDUP_POLICY=merge)
+    flagged: int = 0  # inserted with duplicate_of set
+    failed: int = 0
+    errors: List[LeadImportError] = []
+    errors_truncated: bool = False
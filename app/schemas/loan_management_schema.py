@@ -77,6 +77,35 @@ class LoanApplicationCreate(BaseModel):
             raise ValueError('Amount must be greater than 0')
         return v
 
+# Eligibility Schemas
+class EligibilityCheck(BaseModel):
+    loan_type: Literal["Personal Loan", "Business Loan", "Home Loan", "Car Loan"]
+    requested_amount: Decimal = Field(gt=0)
+    employment_type: Literal["salaried", "self_employed", "business"]
+    monthly_income: Decimal = Field(gt=0)
+    existing_emis: Decimal = Field(ge=0, default=Decimal("0"))
+
+class EligibleProduct(BaseModel):
+    id: str
+    name: str
+    interest_rate: float
+    tenure_months: int
+    emi: float
+
+class EligibilityResult(BaseModel):
+    decision: Literal["pre_approved", "refer", "ineligible"]
+    score: int
+    foir: Optional[float] = None
+    foir_limit: float
+    max_eligible_amount: float
+    product: Optional[EligibleProduct] = None
+    reasons: List[str] = []
+    scored_at: datetime
+
+class EligibilityResponse(BaseModel):
+    status: str = "success"
+    data: EligibilityResult
+
 class LoanApplicationResponse(BaseModel):
     status: str = "success"
     message: str = "Loan application submitted successfully"
@@ -124,12 +153,27 @@ class LoanDetailsResponse(BaseModel):
     status: str = "success"
     data: DetailedLoanInfo
 
+# Dashboard Schemas
+class DashboardLoan(DetailedLoanInfo):
+    status: Literal["active", "overdue"]
+
+class DashboardData(BaseModel):
+    user_status: Literal["has_loan", "pending_application", "new_user"]
+    loan: Optional[DashboardLoan] = None  # with the last payments and next EMIs
+    pending_applications: List[PendingApplication] = []
+
+class DashboardResponse(BaseModel):
+    status: str = "success"
+    data: DashboardData
+
 # Payment Schemas
 class LoanPaymentCreate(BaseModel):
     loan_id: str
     payment_amount: Decimal = Field(gt=0, description="Payment amount must be greater than 0")
     payment_method: Literal["bank_transfer", "upi", "card"]
     payment_reference: str
+    prepayment_mode: Optional[Literal["reduce_tenure", "reduce_emi"]] = None  # how any excess over dues is applied
+    foreclose: bool = False  # payment_amount must equal the current foreclosure quote
     
     @field_validator('payment_amount')
     @classmethod
@@ -143,6 +187,20 @@ class PaymentResponse(BaseModel):
     message: str
     data: dict  # Contains payment details
 
+class ForeclosureQuote(BaseModel):
+    loan_id: str
+    as_of: date
+    principal_outstanding: float
+    interest_due: float
+    accrued_interest: float
+    penalty_due: float
+    foreclosure_charge: float
+    total: float
+
+class ForeclosureQuoteResponse(BaseModel):
+    status: str = "success"
+    data: ForeclosureQuote
+
 # Document Upload Schema
 class DocumentUpload(BaseModel):
     document_type: str  # Allow any document type
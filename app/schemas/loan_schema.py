@@ -1,6 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List
 from datetime import datetime
+from app.core.config import settings
+
+# Bounds the amortisation work a quote may ask for when the product has no tenure list
+QuoteTenure = Annotated[int, Field(gt=0, le=settings.QUOTE_MAX_TENURE_MONTHS)]
 
 class LoanProductBase(BaseModel):
     name: str
@@ -20,3 +24,36 @@ class LoanProductOut(LoanProductBase):
     created_at: Optional[datetime]
     class Config:
         from_attributes = True
+
+class LoanQuoteRequest(BaseModel):
+    amount: float = Field(gt=0)
+    tenure_months: Optional[QuoteTenure] = None
+    preview_months: int = Field(default=12, ge=0, le=480)
+
+class InstalmentOut(BaseModel):
+    number: int
+    emi: float
+    principal: float
+    interest: float
+    balance: float
+
+class LoanQuoteOut(BaseModel):
+    product_id: str
+    amount: float
+    interest_rate: float
+    tenure_months: int
+    emi: float
+    total_interest: float
+    total_payable: float
+    schedule: List[InstalmentOut]
+
+class LoanQuoteGridRequest(BaseModel):
+    amounts: List[float] = Field(min_length=1)
+    tenures: Optional[List[QuoteTenure]] = None
+
+class LoanQuoteGridOut(BaseModel):
+    product_id: str
+    interest_rate: float
+    amounts: List[float]
+    tenures: List[int]
+    emi: List[List[float]]  # emi[i][j]: tenures[i] months, amounts[j]
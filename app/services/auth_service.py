@@ -5,6 +5,8 @@ from datetime import datetime, timedelta, timezone # <-- ADDED timezone
 import random
 from app.models.otp_codes import OTPCodes
 from app.core.utils import send_email_otp
+from app.core import jobs
+from app.core.config import settings
 
 class AuthService:
     def __init__(self, db: Session):
@@ -55,9 +57,12 @@ def send_otp_service(db: Session, principal: str, purpose: str = "login", tenant
         used=False,
     )
     db.add(otp_entry)
-    db.commit()
-
-    send_email_otp(recipient_email=principal, otp_code=otp_code)
+    if settings.MAIL_DELIVERY == "queue":
+        jobs.enqueue(db, "mail.otp", {"recipient_email": principal, "otp_code": otp_code}, tenant_id=tenant_id)
+        db.commit()
+    else:
+        db.commit()
+        send_email_otp(recipient_email=principal, otp_code=otp_code)
 
     return {
         "message": f"OTP sent successfully to {principal}",
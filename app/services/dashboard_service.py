@@ -0,0 +1,149 @@
+"""Home-screen dashboard: loan status, loan details, recent payments and upcoming EMIs.
+
+Everything comes from one statement - CTEs for the user's open loan, its last
+payments and next EMIs, and (without a loan) the pending applications with their
+documents - each aggregated to JSON in Postgres, so the screen costs a single
+database round-trip instead of the loan-status call plus get_loan_details' three
+queries. The statement always fetches DASHBOARD_MAX_ITEMS payments and EMIs; the
+route trims them to what was asked for, so one cached entry per user serves every
+variant.
+
+The result is cached per user for DASHBOARD_CACHE_SECONDS and dropped whenever
+publish_user_event() pushes a change for that user (payments, application and
+document status). With CACHE_BACKEND=memory that only reaches the worker that
+handled the change; the others catch up within the TTL.
+"""
+
+import json
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Text, bindparam, cast, exists, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.core.cache import create_backend
+from app.core.config import settings
+from app.core.pubsub import on_user_event
+from app.models.loan import EMISchedule, Loan, LoanApplication, LoanDocument, LoanPayment
+from app.models.user import User
+from app.schemas.loan_management_schema import DashboardData
+from app.services.loan_management_service import OPEN_LOAN_STATUSES, PENDING_APPLICATION_STATUSES
+
+_cache = create_backend(settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES)
+
+
+def _json_rows(cte, *order_by):
+    """The CTE's rows as one JSON array (empty array when there are none)"""
+    row = literal_column(cte.name)
+    return cast(
+        select(func.coalesce(func.json_agg(aggregate_order_by(row, *order_by)), text("'[]'::json")))
+        .select_from(cte).scalar_subquery(),
+        Text
+    )
+
+
+def _build_statement():
+    users, loans, payments, schedule = User.__table__, Loan.__table__, LoanPayment.__table__, EMISchedule.__table__
+    applications, documents = LoanApplication.__table__, LoanDocument.__table__
+    user_id = bindparam("user_id", type_=loans.c.user_id.type)
+    limit = settings.DASHBOARD_MAX_ITEMS
+
+    loan = select(
+        loans.c.id.label("loan_id"), loans.c.account_number, loans.c.loan_type, loans.c.principal_amount,
+        loans.c.disbursed_amount, loans.c.outstanding_balance, loans.c.monthly_emi, loans.c.next_due_date,
+        loans.c.interest_rate, loans.c.tenure_months, loans.c.tenure_remaining, loans.c.status
+    ).where(loans.c.user_id == user_id, loans.c.status.in_(OPEN_LOAN_STATUSES)).limit(1).cte("loan")
+    loan_id = select(loan.c.loan_id).scalar_subquery()
+
+    recent_payments = select(
+        payments.c.payment_date, payments.c.amount_paid, payments.c.principal_component,
+        payments.c.interest_component, payments.c.status, payments.c.created_at
+    ).where(payments.c.loan_id == loan_id).order_by(
+        payments.c.payment_date.desc(), payments.c.created_at.desc()
+    ).limit(limit).cte("recent_payments")
+
+    upcoming = select(
+        schedule.c.due_date, schedule.c.emi_amount, schedule.c.principal_component, schedule.c.interest_component
+    ).where(
+        schedule.c.loan_id == loan_id, schedule.c.is_paid.is_(False), schedule.c.due_date >= func.current_date()
+    ).order_by(schedule.c.due_date).limit(limit).cte("upcoming_emis")
+
+    # Applications only matter to a user without an open loan, as in get_user_loan_status
+    pending = select(
+        applications.c.id.label("application_id"), applications.c.loan_type, applications.c.requested_amount,
+        applications.c.created_at, applications.c.current_step, applications.c.status
+    ).where(
+        applications.c.user_id == user_id, applications.c.status.in_(PENDING_APPLICATION_STATUSES),
+        ~exists(select(loan.c.loan_id))
+    ).cte("pending_applications")
+
+    pending_documents = select(
+        documents.c.id.label("document_id"), documents.c.application_id, documents.c.document_type,
+        documents.c.file_name, documents.c.file_path, documents.c.status, documents.c.uploaded_at
+    ).where(documents.c.application_id.in_(select(pending.c.application_id))).cte("pending_documents")
+
+    return select(
+        exists().where(users.c.id == user_id).label("user_found"),
+        cast(select(func.row_to_json(literal_column(loan.name))).select_from(loan).scalar_subquery(), Text).label("loan"),
+        _json_rows(recent_payments, recent_payments.c.payment_date.desc(), recent_payments.c.created_at.desc()).label("payments"),
+        _json_rows(upcoming, upcoming.c.due_date).label("emis"),
+        _json_rows(pending, pending.c.created_at.desc()).label("applications"),
+        _json_rows(pending_documents, pending_documents.c.uploaded_at).label("documents"),
+    )
+
+
+_DASHBOARD = _build_statement()
+
+
+def _key(user_id) -> str:
+    return f"dashboard:{user_id}"
+
+
+@on_user_event
+def invalidate(user_id) -> None:
+    _cache.delete(_key(user_id))
+
+
+def load(db: Session, user_id) -> Optional[dict]:
+    """The dashboard row as {column: JSON text}, from the cache or the database; None for an unknown user"""
+    cached = _cache.get(_key(user_id))
+    if cached is not None:
+        return json.loads(cached)
+    row = db.execute(_DASHBOARD, {"user_id": user_id}).one()
+    if not row.user_found:
+        return None
+    result = {k: v for k, v in row._asdict().items() if k != "user_found"}
+    _cache.set(_key(user_id), json.dumps(result).encode("utf-8"), settings.DASHBOARD_CACHE_SECONDS)
+    return result
+
+
+def _parse(value: Optional[str]):
+    # Decimal keeps amounts exact instead of going through float
+    return json.loads(value, parse_float=Decimal) if value is not None else None
+
+
+def build(row: dict, payments: int, emis: int) -> DashboardData:
+    loan = _parse(row["loan"])
+    if loan:
+        loan["payment_history"] = _parse(row["payments"])[:payments]
+        loan["upcoming_emis"] = _parse(row["emis"])[:emis]
+        return DashboardData(user_status="has_loan", loan=loan)
+
+    applications = _parse(row["applications"])
+    if not applications:
+        return DashboardData(user_status="new_user")
+    documents_by_app = {}
+    for doc in _parse(row["documents"]):
+        documents_by_app.setdefault(doc["application_id"], []).append(doc)
+    for application in applications:
+        docs = documents_by_app.get(application["application_id"], [])
+        application["application_date"] = application.pop("created_at")[:10]
+        application["documents_required"] = [{"document_type": d["document_type"], "status": d["status"]} for d in docs]
+        application["documents"] = docs
+    return DashboardData(user_status="pending_application", pending_applications=applications)
+
+
+def get_dashboard(db: Session, user_id, payments: int, emis: int) -> Optional[DashboardData]:
+    row = load(db, user_id)
+    return build(row, payments, emis) if row is not None else None
@@ -0,0 +1,222 @@
+"""Upload-time processing of loan documents.
+
+Each upload enqueues a documents.process job (queue "documents") in the same
+transaction that records the document, so the upload request only writes the
+file and the row; the job workers (`python -m app.cli.jobs worker --queues
+documents --concurrency N`, one process per job) then:
+
+- sniff the real MIME type from the file's magic bytes, never trusting the
+  client's filename or Content-Type (unrecognised files stay
+  application/octet-stream);
+- record the file size and, for PDFs, the page count;
+- render a small thumbnail and a larger first-page preview as JPEGs under
+  DOCUMENT_PREVIEW_DIR, so the reviewer and customer screens load a few kB per
+  document instead of the full file.
+
+Previews need Pillow (pip install Pillow), and PDF previews also pypdfium2
+(pip install pypdfium2), which then gives exact page counts as well. Without
+them the type, size and (best-effort) page count are still recorded.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.loan import LoanDocument
+
+logger = logging.getLogger(__name__)
+
+# (offset, signature, MIME type); checked in order against the first bytes of the file
+_SIGNATURES = (
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"II*\x00", "image/tiff"),
+    (0, b"MM\x00*", "image/tiff"),
+    (0, b"BM", "image/bmp"),
+    (4, b"ftypheic", "image/heic"),
+    (4, b"ftypheix", "image/heic"),
+    (4, b"ftypmif1", "image/heif"),
+    (0, b"PK\x03\x04", "application/zip"),
+)
+_SNIFF_BYTES = 16
+
+IMAGE_TYPES = ("image/png", "image/jpeg", "image/gif", "image/tiff", "image/bmp", "image/webp")
+
+# Sniffed types a browser may render inline on the API origin. Anything else
+# (including a client-chosen .html or .svg) is only ever served as a download.
+INLINE_TYPES = frozenset(("application/pdf", "image/png", "image/jpeg", "image/gif", "image/webp"))
+
+_PDF_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_PDF_COUNT = re.compile(rb"/Count\s+(\d+)")
+
+
+# The optional imaging libraries are imported on first use: only the job workers
+# render, and importing them would add ~50 ms to every API worker's start-up
+
+def _pillow():
+    try:
+        from PIL import Image, ImageOps  # optional: pip install Pillow
+    except ImportError:
+        return None
+    return Image, ImageOps
+
+
+def _pdfium():
+    try:
+        import pypdfium2  # optional: pip install pypdfium2
+    except ImportError:
+        return None
+    return pypdfium2
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """MIME type from the file's leading bytes, None when unrecognised"""
+    for offset, signature, mime_type in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def mime_type_for(path: str) -> str:
+    """Sniffed type; application/octet-stream when the content is not recognised"""
+    with open(path, "rb") as f:
+        return sniff_mime_type(f.read(_SNIFF_BYTES)) or "application/octet-stream"
+
+
+def count_pdf_pages(path: str) -> Optional[int]:
+    pypdfium2 = _pdfium()
+    if pypdfium2 is not None:
+        try:
+            pdf = pypdfium2.PdfDocument(path)
+        except Exception as e:
+            logger.info(f"PDFium could not open {path} ({e}); counting pages from the raw file")
+        else:
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    # Without a PDF library (or for files it rejects): page objects, else the page
+    # tree's /Count. Neither is visible when the objects sit in compressed object streams.
+    with open(path, "rb") as f:
+        data = f.read()
+    pages = len(_PDF_PAGE.findall(data))
+    if pages:
+        return pages
+    # The root of the page tree carries the largest /Count
+    counts = [int(n) for n in _PDF_COUNT.findall(data)]
+    return max(counts) if counts else None
+
+
+def preview_paths(document_id) -> Tuple[str, str]:
+    """(thumbnail, page preview) file paths of a document"""
+    directory = os.path.abspath(os.path.join(settings.DOCUMENT_PREVIEW_DIR, str(document_id)))
+    return os.path.join(directory, "thumbnail.jpg"), os.path.join(directory, "preview.jpg")
+
+
+def _first_page(path: str, mime_type: str):
+    """The first page as a PIL image, or None when it cannot be rendered here"""
+    pillow = _pillow()
+    if pillow is None:
+        return None
+    Image, ImageOps = pillow
+    if mime_type == "application/pdf":
+        pypdfium2 = _pdfium()
+        if pypdfium2 is None:
+            return None
+        pdf = pypdfium2.PdfDocument(path)
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            # Render straight at preview size rather than at full resolution
+            scale = settings.DOCUMENT_PREVIEW_PX / max(width, height, 1)
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+    if mime_type in IMAGE_TYPES:
+        image = Image.open(path)
+        # JPEG decoders can downscale while decoding, which is much cheaper than a full decode
+        image.draft("RGB", (settings.DOCUMENT_PREVIEW_PX, settings.DOCUMENT_PREVIEW_PX))
+        return ImageOps.exif_transpose(image)
+    return None
+
+
+def render_previews(path: str, mime_type: str, document_id) -> Tuple[Optional[str], Optional[str]]:
+    image = _first_page(path, mime_type)
+    if image is None:
+        return None, None
+    thumbnail_path, preview_path = preview_paths(document_id)
+    os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    quality = settings.DOCUMENT_PREVIEW_QUALITY
+    for target, size in ((preview_path, settings.DOCUMENT_PREVIEW_PX), (thumbnail_path, settings.DOCUMENT_THUMBNAIL_PX)):
+        image.thumbnail((size, size))
+        # Write then rename, so a concurrent reader never serves a half-written file
+        image.save(target + ".tmp", "JPEG", quality=quality, optimize=True, progressive=True)
+        os.replace(target + ".tmp", target)
+    return thumbnail_path, preview_path
+
+
+def inspect_file(path: str, file_name: str, document_id) -> dict:
+    """Everything the pipeline learns about one file; no database access"""
+    mime_type = mime_type_for(path)
+    info = {"mime_type": mime_type, "file_size": os.path.getsize(path), "page_count": None,
+            "thumbnail_path": None, "preview_path": None}
+    if mime_type == "application/pdf":
+        info["page_count"] = count_pdf_pages(path)
+    elif mime_type in IMAGE_TYPES:
+        info["page_count"] = 1
+    try:
+        info["thumbnail_path"], info["preview_path"] = render_previews(path, mime_type, document_id)
+    except Exception as e:
+        # A file the renderer chokes on still gets its type and size recorded
+        logger.warning(f"Preview of document {document_id} ({mime_type}) failed: {e}")
+    return info
+
+
+def process_document(db: Session, document_id) -> dict:
+    document = db.execute(select(LoanDocument).where(LoanDocument.id == document_id)).scalars().first()
+    if document is None:
+        return {"skipped": "document not found"}
+    if not os.path.exists(document.file_path):
+        return {"skipped": "file missing"}
+    info = inspect_file(document.file_path, document.file_name, document.id)
+    for key, value in info.items():
+        setattr(document, key, value)
+    document.processed_at = datetime.now(timezone.utc)
+    db.commit()
+    return {"document_id": str(document.id), **{k: v for k, v in info.items() if not k.endswith("_path")},
+            "preview": info["preview_path"] is not None}
+
+
+def unprocessed_document_ids(db: Session, limit: int) -> list:
+    return db.execute(
+        select(LoanDocument.id).where(LoanDocument.processed_at.is_(None))
+        .order_by(LoanDocument.uploaded_at).limit(limit)
+    ).scalars().all()
+
+
+def serving(mime_type: Optional[str], path: str) -> Tuple[str, str, dict]:
+    """(media type, Content-Disposition type, extra headers) to serve a stored document with.
+
+    Only a sniffed type on the INLINE_TYPES allow-list is served inline; everything
+    else is an octet-stream attachment. A document whose processing job has not run
+    yet is sniffed here, so a PDF opened straight after upload still shows inline.
+    """
+    if mime_type is None:
+        mime_type = mime_type_for(path)
+    headers = {"X-Content-Type-Options": "nosniff"}
+    if mime_type in INLINE_TYPES:
+        return mime_type, "inline", headers
+    return "application/octet-stream", "attachment", headers
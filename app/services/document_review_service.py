@@ -0,0 +1,248 @@
+"""Document verification: the reviewer work queue and application advancement.
+
+Uploaded documents wait in the queue oldest first (served by the
+ix_loan_documents_status_uploaded index). claim() hands a reviewer the next batch
+with SELECT ... FOR UPDATE SKIP LOCKED and marks it pending under their name, so
+reviewers claiming at the same time get disjoint batches without waiting on each
+other. Claims left unreviewed for DOCUMENT_CLAIM_TIMEOUT_SECONDS go back to the
+queue, as stale job locks do.
+
+review() verifies or rejects a set of documents in one UPDATE ... RETURNING. A
+document claimed by another reviewer is skipped, not overwritten. Every
+application the reviewed documents belong to is then re-evaluated on the latest
+upload of each document type:
+
+- a rejected document sends it back to documents_pending (step "Documents");
+- once every REQUIRED_DOCUMENT_TYPES type is verified and nothing else is still
+  waiting, it moves on to under_review at step "Approval".
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import record_event
+from app.core.pubsub import publish_user_event
+from app.models.loan import LoanApplication, LoanDocument
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DECISIONS = {"verify": "verified", "reject": "rejected"}
+WAITING_STATUSES = ("uploaded", "pending")
+REVIEWABLE_APPLICATION_STATUSES = ("under_review", "documents_pending")
+
+# Indexes into PendingApplication.progress_steps: Applied, Documents, Verification, Approval
+STEP_DOCUMENTS = 1
+STEP_APPROVAL = 3
+
+# Both spellings are in use by the apps
+_DOCUMENT_TYPE_ALIASES = {"aadhar": "aadhaar"}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def normalise_document_type(document_type: str) -> str:
+    key = (document_type or "").strip().lower()
+    return _DOCUMENT_TYPE_ALIASES.get(key, key)
+
+
+def required_document_types() -> FrozenSet[str]:
+    return frozenset(
+        normalise_document_type(t) for t in settings.REQUIRED_DOCUMENT_TYPES.split(",") if t.strip()
+    )
+
+
+def _tenant_users(tenant_id):
+    return select(User.id).where(User.tenant_id == uuid.UUID(str(tenant_id)))
+
+
+def get_document(db: Session, document_id, tenant_id=None) -> Optional[LoanDocument]:
+    """One document, or None if it does not exist or belongs to another tenant"""
+    try:
+        document_id = uuid.UUID(str(document_id))
+    except ValueError:
+        return None
+    query = select(LoanDocument).where(LoanDocument.id == document_id)
+    if tenant_id:
+        query = query.where(LoanDocument.user_id.in_(_tenant_users(tenant_id)))
+    return db.execute(query).scalars().first()
+
+
+def release_stale_claims(db: Session) -> int:
+    """Return documents whose reviewer never finished them (claim older than DOCUMENT_CLAIM_TIMEOUT_SECONDS)"""
+    cutoff = _now() - timedelta(seconds=settings.DOCUMENT_CLAIM_TIMEOUT_SECONDS)
+    result = db.execute(
+        update(LoanDocument)
+        .where(LoanDocument.status == "pending", LoanDocument.claimed_at < cutoff)
+        .values(status="uploaded", claimed_by=None, claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+def claim(db: Session, reviewer_id, limit: int = None, tenant_id=None) -> List[LoanDocument]:
+    """Lock the oldest waiting documents and mark them pending for this reviewer"""
+    release_stale_claims(db)
+    query = (
+        select(LoanDocument)
+        .where(LoanDocument.status == "uploaded")
+        .order_by(LoanDocument.uploaded_at)
+        .limit(limit or settings.DOCUMENT_CLAIM_BATCH)
+        .with_for_update(skip_locked=True)
+    )
+    if tenant_id:
+        query = query.where(LoanDocument.user_id.in_(_tenant_users(tenant_id)))
+    documents = db.execute(query).scalars().all()
+    now = _now()
+    for document in documents:
+        document.status = "pending"
+        document.claimed_by = uuid.UUID(str(reviewer_id))
+        document.claimed_at = now
+    db.commit()
+    return documents
+
+
+def claimed_by(db: Session, reviewer_id) -> List[LoanDocument]:
+    """The reviewer's unfinished claims, oldest first"""
+    return db.execute(
+        select(LoanDocument)
+        .where(LoanDocument.status == "pending", LoanDocument.claimed_by == uuid.UUID(str(reviewer_id)))
+        .order_by(LoanDocument.uploaded_at)
+    ).scalars().all()
+
+
+def release(db: Session, reviewer_id, document_ids: Optional[Iterable] = None) -> int:
+    """Hand the reviewer's claims (all of them, or just document_ids) back to the queue"""
+    query = update(LoanDocument).where(
+        LoanDocument.status == "pending", LoanDocument.claimed_by == uuid.UUID(str(reviewer_id))
+    )
+    if document_ids is not None:
+        query = query.where(LoanDocument.id.in_([uuid.UUID(str(d)) for d in document_ids]))
+    result = db.execute(
+        query.values(status="uploaded", claimed_by=None, claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def queue_stats(db: Session, tenant_id=None) -> dict:
+    query = select(LoanDocument.status, func.count(), func.min(LoanDocument.uploaded_at)).where(
+        LoanDocument.status.in_(WAITING_STATUSES)
+    ).group_by(LoanDocument.status)
+    if tenant_id:
+        query = query.where(LoanDocument.user_id.in_(_tenant_users(tenant_id)))
+    rows = {status: (count, oldest) for status, count, oldest in db.execute(query)}
+    waiting, oldest = rows.get("uploaded", (0, None))
+    return {"waiting": waiting, "in_review": rows.get("pending", (0, None))[0], "oldest_waiting_since": oldest}
+
+
+def review(db: Session, reviewer_id, document_ids: Iterable, decision: str, notes: str = None,
+           tenant_id=None) -> dict:
+    """Verify or reject documents in bulk and advance the applications they belong to"""
+    status = DECISIONS[decision]
+    reviewer = uuid.UUID(str(reviewer_id))
+    requested = list(dict.fromkeys(uuid.UUID(str(d)) for d in document_ids))
+    cutoff = _now() - timedelta(seconds=settings.DOCUMENT_CLAIM_TIMEOUT_SECONDS)
+
+    query = update(LoanDocument).where(
+        LoanDocument.id.in_(requested),
+        LoanDocument.status.in_(WAITING_STATUSES),
+        (LoanDocument.claimed_by.is_(None)) | (LoanDocument.claimed_by == reviewer) | (LoanDocument.claimed_at < cutoff)
+    )
+    if tenant_id:
+        query = query.where(LoanDocument.user_id.in_(_tenant_users(tenant_id)))
+    reviewed = db.execute(
+        query.values(status=status, verified_by=reviewer, verified_at=_now(), notes=notes,
+                     claimed_by=None, claimed_at=None)
+        .returning(LoanDocument.id, LoanDocument.application_id, LoanDocument.user_id, LoanDocument.document_type)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    for document_id, application_id, user_id, document_type in reviewed:
+        record_event(db, f"loan_document.{status}", "loan_application", application_id, {
+            "user_id": str(user_id), "document_id": str(document_id), "document_type": document_type,
+            "reviewed_by": str(reviewer), "notes": notes
+        })
+    applications = advance_applications(db, {row.application_id for row in reviewed}, reviewer)
+    db.commit()
+
+    for document_id, application_id, user_id, document_type in reviewed:
+        publish_user_event(user_id, "document_status", {
+            "application_id": str(application_id), "document_id": str(document_id),
+            "document_type": document_type, "status": status, "notes": notes
+        })
+    for change in applications:
+        publish_user_event(change["user_id"], "application_status", {
+            "application_id": change["application_id"], "status": change["status"],
+            "current_step": change["current_step"]
+        })
+
+    done = {row.id for row in reviewed}
+    return {
+        "status": status,
+        "reviewed": [str(d) for d in requested if d in done],
+        "skipped": [str(d) for d in requested if d not in done],
+        "applications": applications,
+    }
+
+
+def advance_applications(db: Session, application_ids: Iterable, reviewer_id=None) -> List[dict]:
+    """Move applications forward or back according to their documents; the caller commits"""
+    ids = list(application_ids)
+    if not ids:
+        return []
+    applications = db.execute(
+        select(LoanApplication)
+        .where(LoanApplication.id.in_(ids), LoanApplication.status.in_(REVIEWABLE_APPLICATION_STATUSES))
+        .with_for_update()
+    ).scalars().all()
+
+    # Latest upload of each type wins: a re-uploaded document replaces the rejected one
+    latest: Dict[uuid.UUID, Dict[str, str]] = {}
+    for application_id, document_type, status in db.execute(
+        select(LoanDocument.application_id, LoanDocument.document_type, LoanDocument.status)
+        .where(LoanDocument.application_id.in_(ids))
+        .order_by(LoanDocument.uploaded_at)
+    ):
+        latest.setdefault(application_id, {})[normalise_document_type(document_type)] = status
+
+    required = required_document_types()
+    changes = []
+    for application in applications:
+        documents = latest.get(application.id, {})
+        verified = {t for t, s in documents.items() if s == "verified"}
+        if "rejected" in documents.values():
+            status, step = "documents_pending", STEP_DOCUMENTS
+        elif required <= verified and len(verified) == len(documents):
+            status, step = "under_review", max(application.current_step or 0, STEP_APPROVAL)
+        else:
+            continue
+        if (status, step) == (application.status, application.current_step):
+            continue
+
+        previous_status = application.status
+        application.status, application.current_step = status, step
+        if step == STEP_APPROVAL:
+            record_event(db, "loan_application.documents_verified", "loan_application", application.id, {
+                "user_id": str(application.user_id), "document_types": sorted(verified)
+            })
+        if status != previous_status:
+            record_event(db, "loan_application.status_changed", "loan_application", application.id, {
+                "user_id": str(application.user_id), "from": previous_status, "to": status,
+                "reviewed_by": str(reviewer_id) if reviewer_id else None
+            })
+        logger.info(f"Application {application.id} moved to {status} (step {step}) by document review")
+        changes.append({
+            "application_id": str(application.id), "user_id": application.user_id,
+            "previous_status": previous_status, "status": status, "current_step": step
+        })
+    return changes
@@ -0,0 +1,321 @@
+"""Rules-based loan eligibility and pre-approval scoring.
+
+Per-tenant rules live in Tenant.config["eligibility"] (any key of DEFAULT_RULES may
+be overridden). They are compiled into a CompiledRules object once per distinct
+config - edits to a tenant's config produce a new compilation automatically - and
+the tenant's active loan products are cached alongside, so scoring an application
+is pure arithmetic with no queries. rescore_pending() uses the same path to
+re-score the whole under_review queue in keyset-paginated batches.
+
+With auto_advance_pre_approved a pre-approved application skips ahead to the
+"Verification" step (it stays under_review, so document review still decides
+when it reaches "Approval") and a loan_application.pre_approved event is recorded.
+"""
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.core import finance
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import record_event
+from app.models.loan import LoanApplication
+from app.models.loan_product import LoanProduct
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES = {
+    "max_foir": 0.5,  # (existing EMIs + new EMI) / monthly income
+    "foir_by_employment": {"salaried": 0.55, "self_employed": 0.45, "business": 0.45},
+    "min_monthly_income": 15000,
+    "allowed_employment_types": ["salaried", "self_employed", "business"],
+    "max_income_multiple": 60,  # requested amount <= monthly income * multiple
+    "pre_approve_score": 75,
+    "auto_reject_ineligible": False,
+    "auto_advance_pre_approved": False,  # move pre-approved applications on to the Verification step
+}
+
+DEFAULT_TENURES = (12, 24, 36, 48, 60)
+
+# Index into PendingApplication.progress_steps: Applied, Documents, Verification, Approval
+STEP_VERIFICATION = 2
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    max_foir: float
+    foir_by_employment: Dict[str, float]
+    min_monthly_income: float
+    allowed_employment_types: frozenset
+    max_income_multiple: float
+    pre_approve_score: float
+    auto_reject_ineligible: bool
+    auto_advance_pre_approved: bool
+
+    def foir_limit(self, employment_type: Optional[str]) -> float:
+        return self.foir_by_employment.get(employment_type, self.max_foir)
+
+
+@dataclass(frozen=True)
+class ProductOption:
+    id: str
+    name: str
+    name_lower: str
+    interest_rate: float
+    min_amount: float
+    max_amount: float
+    tenures: Tuple[int, ...]
+
+    def covers(self, amount: float) -> bool:
+        return self.min_amount <= amount <= self.max_amount
+
+    def matches(self, loan_type: Optional[str]) -> bool:
+        # "Home Loan" matches products named e.g. "Home Loan Plus" or "home"
+        return bool(loan_type) and loan_type.lower().split()[0] in self.name_lower
+
+
+@lru_cache(maxsize=256)
+def _compile(rules_json: str) -> CompiledRules:
+    rules = json.loads(rules_json)
+    return CompiledRules(
+        max_foir=float(rules["max_foir"]),
+        foir_by_employment={k: float(v) for k, v in (rules.get("foir_by_employment") or {}).items()},
+        min_monthly_income=float(rules["min_monthly_income"]),
+        allowed_employment_types=frozenset(rules["allowed_employment_types"]),
+        max_income_multiple=float(rules["max_income_multiple"]),
+        pre_approve_score=float(rules["pre_approve_score"]),
+        auto_reject_ineligible=bool(rules["auto_reject_ineligible"]),
+        auto_advance_pre_approved=bool(rules["auto_advance_pre_approved"]),
+    )
+
+
+def compile_rules(tenant_config: Optional[dict]) -> CompiledRules:
+    overrides = (tenant_config or {}).get("eligibility") or {}
+    return _compile(json.dumps({**DEFAULT_RULES, **overrides}, sort_keys=True))
+
+
+def rules_for_tenant(db: Session, tenant_id) -> CompiledRules:
+    if not tenant_id:
+        return compile_rules(None)
+    from app.crud import crud  # crud imports this module (invalidate_products)
+    tenant = crud.get_tenant_cached(db, tenant_id)
+    return compile_rules(tenant["config"] if tenant else None)
+
+
+_product_cache = TTLCache(ttl=settings.LOAN_PRODUCT_CACHE_TTL_SECONDS, maxsize=settings.TENANT_CACHE_MAX_SIZE)
+
+
+def products_for_tenant(db: Session, tenant_id) -> Tuple[ProductOption, ...]:
+    """Active products of the tenant plus global (tenant-less) ones"""
+    def load():
+        q = select(LoanProduct).where(LoanProduct.active.is_(True))
+        if tenant_id:
+            q = q.where((LoanProduct.tenant_id == tenant_id) | LoanProduct.tenant_id.is_(None))
+        else:
+            q = q.where(LoanProduct.tenant_id.is_(None))
+        return tuple(
+            ProductOption(
+                id=str(p.id),
+                name=p.name,
+                name_lower=p.name.lower(),
+                interest_rate=float(p.interest_rate or 0),
+                min_amount=float(p.min_amount or 0),
+                max_amount=float(p.max_amount) if p.max_amount is not None else float("inf"),
+                tenures=tuple(sorted(p.tenure_months or DEFAULT_TENURES)),
+            )
+            for p in db.execute(q).scalars()
+        )
+    return _product_cache.get_or_set(str(tenant_id or "-"), load)
+
+
+def invalidate_products() -> None:
+    _product_cache.clear()
+
+
+def evaluate(rules: CompiledRules, products: Tuple[ProductOption, ...], monthly_income, existing_emis,
+             employment_type: Optional[str], requested_amount, loan_type: Optional[str]) -> dict:
+    """Score one application; returns a JSON-ready result (decision: pre_approved, refer or ineligible)"""
+    income = float(monthly_income or 0)
+    existing = float(existing_emis or 0)
+    amount = float(requested_amount or 0)
+    limit = rules.foir_limit(employment_type)
+    reasons: List[str] = []
+
+    if employment_type not in rules.allowed_employment_types:
+        reasons.append(f"employment type '{employment_type}' is not eligible")
+    if income < rules.min_monthly_income:
+        reasons.append(f"monthly income below minimum of {rules.min_monthly_income:.0f}")
+    if amount > income * rules.max_income_multiple:
+        reasons.append(f"requested amount exceeds {rules.max_income_multiple:.0f}x monthly income")
+
+    candidates = [p for p in products if p.covers(amount)]
+    candidates = [p for p in candidates if p.matches(loan_type)] or candidates
+    if not candidates:
+        reasons.append("no active loan product covers the requested amount")
+
+    best = None  # (passes, product, months, instalment, foir)
+    for product in candidates:
+        for months in product.tenures:
+            instalment = finance.emi(amount, product.interest_rate, months)
+            foir = (existing + instalment) / income if income > 0 else float("inf")
+            option = (foir <= limit, product, months, instalment, foir)
+            if best is None or _better(option, best):
+                best = option
+
+    result = {
+        "decision": "ineligible",
+        "score": 0,
+        "foir": None,
+        "foir_limit": limit,
+        "max_eligible_amount": 0.0,
+        "product": None,
+        "reasons": reasons,
+        "scored_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if best is None:
+        return result
+
+    passes, product, months, instalment, foir = best
+    capacity = limit * income - existing
+    max_eligible = min(finance.principal_for_emi(capacity, product.interest_rate, product.tenures[-1]), product.max_amount)
+    result.update({
+        "foir": round(foir, 4),
+        "max_eligible_amount": round(max(max_eligible, 0.0), 2),
+        "product": {
+            "id": product.id, "name": product.name, "interest_rate": product.interest_rate,
+            "tenure_months": months, "emi": round(instalment, 2),
+        },
+    })
+    if not passes:
+        reasons.append(f"FOIR {foir:.0%} exceeds limit of {limit:.0%}")
+    if reasons:
+        return result
+
+    headroom = 1 - foir / limit
+    coverage = min(1.0, max(0.0, max_eligible / amount - 1)) if amount else 0.0
+    score = round(50 + 30 * headroom + 20 * coverage)
+    result["score"] = score
+    result["decision"] = "pre_approved" if score >= rules.pre_approve_score else "refer"
+    return result
+
+
+def _better(a: tuple, b: tuple) -> bool:
+    """Passing options first, then lower rate, then shorter tenure; failing ones by lowest FOIR"""
+    if a[0] != b[0]:
+        return a[0]
+    if a[0]:
+        return (a[1].interest_rate, a[2]) < (b[1].interest_rate, b[2])
+    return a[4] < b[4]
+
+
+def check(db: Session, tenant_id, monthly_income, existing_emis, employment_type, requested_amount, loan_type) -> dict:
+    return evaluate(
+        rules_for_tenant(db, tenant_id), products_for_tenant(db, tenant_id),
+        monthly_income, existing_emis, employment_type, requested_amount, loan_type
+    )
+
+
+def advance_step(rules: CompiledRules, result: dict, status: str, current_step: Optional[int]) -> Optional[int]:
+    """Step a pre-approved application moves to under auto_advance_pre_approved, None to leave it where it is"""
+    if (rules.auto_advance_pre_approved and result["decision"] == "pre_approved" and status == "under_review"
+            and (current_step or 0) < STEP_VERIFICATION):
+        return STEP_VERIFICATION
+    return None
+
+
+def _pre_approved_event(db: Session, application_id, user_id, result: dict, from_step, tenant_id) -> None:
+    record_event(db, "loan_application.pre_approved", "loan_application", application_id, {
+        "user_id": str(user_id), "score": result["score"], "product": result["product"],
+        "from_step": from_step, "to_step": STEP_VERIFICATION
+    }, tenant_id=tenant_id)
+
+
+def score_application(db: Session, application: LoanApplication, tenant_id=None) -> dict:
+    """Store the eligibility result in application_data (caller commits)"""
+    rules = rules_for_tenant(db, tenant_id)
+    result = evaluate(
+        rules, products_for_tenant(db, tenant_id), application.monthly_income, application.existing_emis,
+        application.employment_type, application.requested_amount, application.loan_type
+    )
+    application.application_data = {**(application.application_data or {}), "eligibility": result}
+    if rules.auto_reject_ineligible and result["decision"] == "ineligible":
+        application.status = "rejected"
+    step = advance_step(rules, result, application.status, application.current_step)
+    if step is not None:
+        if application.id is None:
+            application.id = uuid.uuid4()  # new applications are scored before their first flush
+        _pre_approved_event(db, application.id, application.user_id, result, application.current_step, tenant_id)
+        application.current_step = step
+    return result
+
+
+def rescore_pending(db: Session, tenant_id=None, batch_size: int = 1000) -> dict:
+    """Re-score every under_review application (optionally of one tenant) with current rules/products"""
+    apps = LoanApplication.__table__
+    stmt = update(apps).where(apps.c.id == bindparam("b_id")).values(
+        application_data=bindparam("b_data"), status=bindparam("b_status"), current_step=bindparam("b_step")
+    )
+    counts = {"scored": 0, "pre_approved": 0, "refer": 0, "ineligible": 0, "rejected": 0, "advanced": 0}
+    per_tenant: Dict[object, Tuple[CompiledRules, Tuple[ProductOption, ...]]] = {}
+    last_id = None
+    while True:
+        q = (
+            select(
+                LoanApplication.id, LoanApplication.status, LoanApplication.loan_type,
+                LoanApplication.requested_amount, LoanApplication.monthly_income, LoanApplication.existing_emis,
+                LoanApplication.employment_type, LoanApplication.application_data, LoanApplication.user_id,
+                LoanApplication.current_step, User.tenant_id
+            )
+            .join(User, User.id == LoanApplication.user_id)
+            .where(LoanApplication.status == "under_review")
+            .order_by(LoanApplication.id)
+            .limit(batch_size)
+        )
+        if tenant_id:
+            q = q.where(User.tenant_id == tenant_id)
+        if last_id is not None:
+            q = q.where(LoanApplication.id > last_id)
+        rows = db.execute(q).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            if row.tenant_id not in per_tenant:
+                per_tenant[row.tenant_id] = (rules_for_tenant(db, row.tenant_id), products_for_tenant(db, row.tenant_id))
+            rules, products = per_tenant[row.tenant_id]
+            result = evaluate(
+                rules, products, row.monthly_income, row.existing_emis,
+                row.employment_type, row.requested_amount, row.loan_type
+            )
+            status = row.status
+            if rules.auto_reject_ineligible and result["decision"] == "ineligible":
+                status = "rejected"
+                counts["rejected"] += 1
+                record_event(db, "loan_application.status_changed", "loan_application", row.id, {
+                    "user_id": str(row.user_id), "from": row.status, "to": status, "reason": "ineligible"
+                }, tenant_id=row.tenant_id)
+            step = advance_step(rules, result, status, row.current_step)
+            if step is not None:
+                counts["advanced"] += 1
+                _pre_approved_event(db, row.id, row.user_id, result, row.current_step, row.tenant_id)
+            counts[result["decision"]] += 1
+            params.append({
+                "b_id": row.id, "b_data": {**(row.application_data or {}), "eligibility": result}, "b_status": status,
+                "b_step": row.current_step if step is None else step
+            })
+        db.execute(stmt, params)
+        db.commit()
+        counts["scored"] += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"Eligibility rescore: {counts['scored']} applications scored")
+    return counts
@@ -0,0 +1,185 @@
+"""In-process reminder scheduler for lead follow-ups.
+
+Pending follow-ups due within FOLLOWUP_SCHEDULER_HORIZON_SECONDS are kept in a
+min-heap ordered by fire time; one thread sleeps until the earliest entry is due
+instead of polling the table. The window is reloaded from the partial
+ix_followups_unreminded_due index every half horizon, so follow-ups created by
+other processes (or too far out to be scheduled directly) are picked up too.
+
+Reminders are claimed with a conditional UPDATE on reminded_at before handlers
+run, so several API workers can each run a scheduler without double reminders.
+"""
+
+import heapq
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.followup import FollowUp
+
+logger = logging.getLogger(__name__)
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _key(followup_id) -> uuid.UUID:
+    return followup_id if isinstance(followup_id, uuid.UUID) else uuid.UUID(str(followup_id))
+
+
+class FollowUpScheduler:
+    def __init__(self, session_factory=SessionLocal, horizon_seconds: int = None, lead_seconds: int = None):
+        self._session_factory = session_factory
+        self._horizon = horizon_seconds or settings.FOLLOWUP_SCHEDULER_HORIZON_SECONDS
+        self._lead = settings.FOLLOWUP_REMINDER_LEAD_SECONDS if lead_seconds is None else lead_seconds
+        self._heap: List[Tuple[float, uuid.UUID]] = []
+        # Current fire time per follow-up; heap entries that disagree are stale and skipped
+        self._fire_at: Dict[uuid.UUID, float] = {}
+        self._loaded_until = 0.0
+        self._next_refill = 0.0
+        self._cond = threading.Condition()
+        self._handlers: List[Callable] = []
+        self._thread = None
+        self._stopping = False
+
+    def on_reminder(self, handler: Callable) -> Callable:
+        """Register handler(row) for due follow-ups; row has id, tenant_id, lead_id, agent_id, due_at, channel, notes"""
+        self._handlers.append(handler)
+        return handler
+
+    def schedule(self, followup_id, due_at: datetime) -> None:
+        """(Re)schedule a follow-up; ones beyond the loaded window are left to the next refill"""
+        key = _key(followup_id)
+        fire_at = _epoch(due_at) - self._lead
+        with self._cond:
+            if fire_at > self._loaded_until:
+                self._fire_at.pop(key, None)
+                return
+            if self._fire_at.get(key) == fire_at:
+                return
+            self._fire_at[key] = fire_at
+            heapq.heappush(self._heap, (fire_at, key))
+            if self._heap[0][1] == key:
+                self._cond.notify()
+
+    def cancel(self, followup_id) -> None:
+        with self._cond:
+            self._fire_at.pop(_key(followup_id), None)
+
+    def __len__(self):
+        return len(self._fire_at)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="followup-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Follow-up scheduler started (horizon {self._horizon}s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refill(self, now: float) -> None:
+        until = now + self._horizon
+        db = self._session_factory()
+        try:
+            rows = db.execute(
+                select(FollowUp.id, FollowUp.due_at).where(
+                    FollowUp.status == "pending",
+                    FollowUp.reminded_at.is_(None),
+                    FollowUp.due_at < datetime.fromtimestamp(until + self._lead, timezone.utc)
+                )
+            ).all()
+        finally:
+            db.close()
+        with self._cond:
+            self._loaded_until = until
+        for row in rows:
+            self.schedule(row.id, row.due_at)
+        logger.debug(f"Follow-up scheduler loaded {len(rows)} follow-ups due in the next {self._horizon}s")
+
+    def _pop_due(self, now: float) -> List[uuid.UUID]:
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, key = heapq.heappop(self._heap)
+                if self._fire_at.get(key) == fire_at:
+                    del self._fire_at[key]
+                    due.append(key)
+        return due
+
+    def _fire(self, keys: List[uuid.UUID]) -> None:
+        db = self._session_factory()
+        try:
+            # Claim first: another worker may already have reminded, or the follow-up was closed
+            rows = db.execute(
+                update(FollowUp)
+                .where(FollowUp.id.in_(keys), FollowUp.status == "pending", FollowUp.reminded_at.is_(None))
+                .values(reminded_at=datetime.now(timezone.utc))
+                .returning(FollowUp.id, FollowUp.tenant_id, FollowUp.lead_id, FollowUp.agent_id,
+                           FollowUp.due_at, FollowUp.channel, FollowUp.notes)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to claim due follow-ups")
+            return
+        finally:
+            db.close()
+        for row in rows:
+            for handler in self._handlers:
+                try:
+                    handler(row)
+                except Exception:
+                    logger.exception(f"Follow-up reminder handler failed for {row.id}")
+
+    def _run(self) -> None:
+        while True:
+            now = time.time()
+            if now >= self._next_refill:
+                try:
+                    self._refill(now)
+                except Exception:
+                    logger.exception("Follow-up scheduler refill failed")
+                # Reload at half the horizon so consecutive windows overlap
+                self._next_refill = now + self._horizon / 2
+            due = self._pop_due(now)
+            if due:
+                self._fire(due)
+                continue
+            with self._cond:
+                if self._stopping:
+                    return
+                wake_at = self._next_refill
+                if self._heap:
+                    wake_at = min(wake_at, self._heap[0][0])
+                timeout = wake_at - time.time()
+                if timeout > 0:
+                    self._cond.wait(timeout)
+            if self._stopping:
+                return
+
+
+scheduler = FollowUpScheduler()
+
+
+@scheduler.on_reminder
+def _log_reminder(row) -> None:
+    logger.info(f"Follow-up {row.id} for lead {row.lead_id} due at {row.due_at} (agent {row.agent_id}, {row.channel or 'any channel'})")
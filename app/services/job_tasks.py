@@ -0,0 +1,74 @@
+"""Tasks runnable by the background job workers (app/core/jobs.py)"""
+
+import logging
+import os
+
+from app.core import jobs, partitions
+from app.core.database import engine
+from app.core.jobs import task
+from app.core.replicas import read_session
+from app.core.utils import send_email_otp, send_password_reset_email
+from app.crud import crud
+from app.services import document_processing_service, eligibility_service, lead_service
+
+logger = logging.getLogger(__name__)
+
+
+@task("mail.otp", queue="mail", max_attempts=5)
+def send_otp_email(ctx, recipient_email: str, otp_code: str):
+    send_email_otp(recipient_email=recipient_email, otp_code=otp_code, raise_errors=True)
+
+
+@task("mail.password_reset", queue="mail", max_attempts=5)
+def send_reset_email(ctx, recipient_email: str, reset_token: str, base_url: str = "http://localhost:5000"):
+    send_password_reset_email(
+        recipient_email=recipient_email, reset_token=reset_token, base_url=base_url, raise_errors=True
+    )
+
+
+@task("leads.import", max_attempts=1)
+def import_leads(ctx, path: str, format: str = "csv", tenant_id: str = None, agent_id: str = None, batch_size: int = None):
+    """Bulk import of an uploaded lead file; the file is removed once imported"""
+    with open(path, "rb") as stream:
+        report = lead_service.import_leads(
+            ctx.db, lead_service.iter_records(stream, format),
+            tenant_id=tenant_id, agent_id=agent_id, batch_size=batch_size
+        )
+    os.remove(path)
+    return report.model_dump(mode="json")
+
+
+@task("reports.applications_summary", queue="reports")
+def applications_summary(ctx, tenant_id: str = None):
+    with read_session() as db:
+        return {"totals": crud.applications_summary(db, tenant_id=tenant_id)}
+
+
+@task("reports.agent_performance", queue="reports")
+def agent_performance(ctx, tenant_id: str = None):
+    with read_session() as db:
+        return {"agents": crud.agent_performance(db, tenant_id=tenant_id)}
+
+
+@task("eligibility.rescore", queue="reports", max_attempts=1)
+def rescore_eligibility(ctx, tenant_id: str = None, batch_size: int = 1000):
+    return eligibility_service.rescore_pending(ctx.db, tenant_id=tenant_id, batch_size=batch_size)
+
+
+@task("partitions.maintain", max_attempts=1)
+def maintain_partitions(ctx, archive_dir: str = None):
+    return partitions.maintain(engine, archive_dir=archive_dir)
+
+
+@task("documents.process", queue="documents")
+def process_document(ctx, document_id: str):
+    return document_processing_service.process_document(ctx.db, document_id)
+
+
+@task("documents.backfill", queue="documents", max_attempts=1)
+def backfill_documents(ctx, limit: int = 10000):
+    """Queue processing for documents uploaded before the pipeline existed"""
+    document_ids = document_processing_service.unprocessed_document_ids(ctx.db, limit)
+    for document_id in document_ids:
+        jobs.enqueue(ctx.db, "documents.process", {"document_id": str(document_id)})
+    return {"queued": len(document_ids)}
@@ -0,0 +1,241 @@
+"""Lead de-duplication.
+
+Leads are reduced to blocking keys - normalized phone, normalized email, email
+local-part and name trigrams - so candidate duplicates come from indexed key
+lookups (DB) or an inverted index (in-memory, per import batch) instead of
+pairwise comparison. Candidates are then scored and, depending on
+LEAD_DEDUP_POLICY, merged into the existing lead or inserted with duplicate_of set.
+"""
+
+import logging
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.lead import Lead
+
+logger = logging.getLogger(__name__)
+
+_NON_DIGIT = re.compile(r"\D+")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+_HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "shri", "smt", "sri", "kumari"}
+_GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Digits only, without trunk/country prefix, so '+91 98450-12345' == '09845012345'"""
+    if not phone:
+        return None
+    digits = _NON_DIGIT.sub("", phone)
+    country_code = settings.LEAD_DEDUP_COUNTRY_CODE
+    if len(digits) > 10 and digits.startswith(country_code):
+        digits = digits[len(country_code):]
+    digits = digits.lstrip("0")
+    return digits if len(digits) >= 6 else None
+
+
+def normalize_email(email: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (normalized address, local part); gmail dots and +tags are dropped"""
+    if not email or "@" not in email:
+        return None, None
+    local, _, domain = email.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in _GMAIL_DOMAINS:
+        local = local.replace(".", "")
+        domain = "gmail.com"
+    if not local:
+        return None, None
+    return f"{local}@{domain}", local
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    words = [w for w in _SPACES.split(_NON_WORD.sub(" ", text)) if w and w not in _HONORIFICS]
+    return " ".join(words) or None
+
+
+def trigrams(text: Optional[str]) -> frozenset:
+    """Word-padded character trigrams, same shape as pg_trgm"""
+    if not text:
+        return frozenset()
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def name_similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class LeadKeys:
+    phone: Optional[str]
+    email: Optional[str]
+    email_local: Optional[str]
+    name: Optional[str]
+    name_trigrams: frozenset = field(default_factory=frozenset)
+
+    @classmethod
+    def build(cls, customer_name: Optional[str], phone: Optional[str], email: Optional[str]) -> "LeadKeys":
+        email_norm, email_local = normalize_email(email)
+        name = normalize_name(customer_name)
+        return cls(normalize_phone(phone), email_norm, email_local, name, trigrams(name))
+
+    def columns(self) -> dict:
+        """Values for the normalized columns stored on the leads row"""
+        return {
+            "phone_normalized": self.phone,
+            "email_normalized": self.email,
+            "email_local": self.email_local,
+            "name_normalized": self.name,
+        }
+
+
+def match_score(a: LeadKeys, b: LeadKeys) -> float:
+    """0..1 confidence that a and b are the same customer"""
+    if a.email and a.email == b.email:
+        return 1.0
+    name_sim = name_similarity(a.name_trigrams, b.name_trigrams)
+    if a.phone and a.phone == b.phone:
+        # Shared family phones are common: the name decides merge vs flag
+        return 0.6 + 0.4 * name_sim
+    if a.email_local and a.email_local == b.email_local:
+        return 0.4 + 0.4 * name_sim
+    return 0.6 * name_sim
+
+
+class BlockingIndex:
+    """Inverted index from blocking key to lead ids, used within an import batch"""
+
+    def __init__(self):
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._keys: Dict[object, LeadKeys] = {}
+
+    def add(self, lead_id, keys: LeadKeys) -> None:
+        self._keys[lead_id] = keys
+        for key in self._exact_keys(keys):
+            self._postings[key].add(lead_id)
+        for gram in keys.name_trigrams:
+            self._postings["t:" + gram].add(lead_id)
+
+    @staticmethod
+    def _exact_keys(keys: LeadKeys) -> List[str]:
+        out = []
+        if keys.phone:
+            out.append("p:" + keys.phone)
+        if keys.email_local:
+            out.append("e:" + keys.email_local)
+        return out
+
+    def candidates(self, keys: LeadKeys) -> Iterable[Tuple[object, LeadKeys]]:
+        ids = set()
+        for key in self._exact_keys(keys):
+            ids |= self._postings.get(key, set())
+        if keys.name_trigrams:
+            # Only names sharing most of their trigrams are worth scoring
+            needed = max(1, int(len(keys.name_trigrams) * settings.LEAD_DEDUP_NAME_MIN_OVERLAP))
+            shared = Counter()
+            for gram in keys.name_trigrams:
+                shared.update(self._postings.get("t:" + gram, ()))
+            ids |= {lead_id for lead_id, n in shared.items() if n >= needed}
+        return [(lead_id, self._keys[lead_id]) for lead_id in ids]
+
+    def best_match(self, keys: LeadKeys) -> Tuple[Optional[object], float]:
+        best_id, best_score = None, 0.0
+        for lead_id, other in self.candidates(keys):
+            score = match_score(keys, other)
+            if score > best_score:
+                best_id, best_score = lead_id, score
+        return best_id, best_score
+
+
+def load_db_candidates(db: Session, tenant_id, keys: List[LeadKeys], include_names: bool = False) -> BlockingIndex:
+    """Fetch existing (non-duplicate) leads of a tenant sharing a blocking key, in indexed queries.
+
+    Exact phone / email-local matches are fetched first and name-trigram matches
+    only fill what is left of LEAD_DEDUP_MAX_CANDIDATES, so loose name hits can
+    never push a certain match out of the candidate set.
+    """
+    index = BlockingIndex()
+    limit = settings.LEAD_DEDUP_MAX_CANDIDATES
+    phones = {k.phone for k in keys if k.phone}
+    locals_ = {k.email_local for k in keys if k.email_local}
+    exact = []
+    if phones:
+        exact.append(Lead.phone_normalized.in_(phones))
+    if locals_:
+        exact.append(Lead.email_local.in_(locals_))
+    fuzzy = []
+    if include_names and db.get_bind().dialect.name == "postgresql":
+        # pg_trgm similarity operator, served by the GIN trigram index
+        fuzzy = [Lead.name_normalized.op("%")(k.name) for k in keys if k.name]
+
+    columns = (Lead.id, Lead.phone_normalized, Lead.email_normalized, Lead.email_local, Lead.name_normalized)
+    base = select(*columns).where(Lead.tenant_id == tenant_id, Lead.duplicate_of.is_(None))
+    rows = []
+    if exact:
+        rows = db.execute(base.where(or_(*exact)).order_by(Lead.created_at).limit(limit)).all()
+    if fuzzy and len(rows) < limit:
+        query = base.where(or_(*fuzzy))
+        if rows:
+            # Skip what the exact query returned by id: NOT (phone IN ... OR email_local IN ...)
+            # is NULL for leads missing a phone or an email, and would drop them from name matching
+            query = query.where(Lead.id.not_in([row.id for row in rows]))
+        rows += db.execute(query.order_by(Lead.created_at).limit(limit - len(rows))).all()
+    if len(rows) >= limit:
+        logger.warning(
+            f"Lead dedup candidates for tenant {tenant_id} hit LEAD_DEDUP_MAX_CANDIDATES ({limit}) "
+            f"for {len(keys)} leads; some matches may be missed"
+        )
+
+    for row in rows:
+        index.add(row.id, LeadKeys(row.phone_normalized, row.email_normalized, row.email_local,
+                                   row.name_normalized, trigrams(row.name_normalized)))
+    return index
+
+
+def classify(score: float) -> Optional[str]:
+    """'duplicate' (merge-worthy), 'possible' (flag for review) or None"""
+    if score >= settings.LEAD_DEDUP_MERGE_THRESHOLD:
+        return "duplicate"
+    if score >= settings.LEAD_DEDUP_FLAG_THRESHOLD:
+        return "possible"
+    return None
+
+
+def find_duplicate(db: Session, tenant_id, keys: LeadKeys) -> Tuple[Optional[object], Optional[str]]:
+    """Best existing match for a single new lead: (lead id, classification)"""
+    index = load_db_candidates(db, tenant_id, [keys], include_names=True)
+    match_id, score = index.best_match(keys)
+    return match_id, classify(score)
+
+
+def should_merge(kind: Optional[str]) -> bool:
+    return settings.LEAD_DEDUP_POLICY == "merge" and kind == "duplicate"
+
+
+# Fields a merge may fill in on the surviving lead when it has no value yet
+MERGE_FIELDS = ("phone", "email", "source", "notes", "next_followup")
+
+
+def merge_into(existing: Lead, values: dict) -> Lead:
+    for name in MERGE_FIELDS:
+        if getattr(existing, name) is None and values.get(name) is not None:
+            setattr(existing, name, values[name])
+    keys = LeadKeys.build(existing.customer_name, existing.phone, existing.email)
+    for column, value in keys.columns().items():
+        setattr(existing, column, value)
+    return existing
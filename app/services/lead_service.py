@@ -0,0 +1,254 @@
+import csv
+import io
+import json
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, case, func, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.lead import Lead
+from app.services import lead_dedup
+from app.schemas.lead_schema import LeadCreate, LeadImportError, LeadImportReport
+
+logger = logging.getLogger(__name__)
+
+# Column order used for COPY; must match _row_values()
+COPY_COLUMNS = (
+    "id", "tenant_id", "agent_id", "customer_name", "phone", "email",
+    "source", "status", "notes", "next_followup", "created_at", "updated_at",
+    "phone_normalized", "email_normalized", "email_local", "name_normalized", "duplicate_of"
+)
+
+
+PARSE_ERROR_KEY = "__parse_error__"
+
+# Blocking-key columns a merge may fill in, with the contact field each is derived from
+MERGE_KEY_COLUMNS = {"phone_normalized": "phone", "email_normalized": "email", "email_local": "email"}
+
+
+def detect_format(filename: Optional[str]) -> str:
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_records(stream: BinaryIO, fmt: str = "csv") -> Iterator[dict]:
+    """Stream raw records out of a CSV (with header) or NDJSON byte stream"""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {PARSE_ERROR_KEY: f"invalid JSON: {e}"}
+    elif fmt == "csv":
+        for record in csv.DictReader(text):
+            # Spreadsheet exports leave empty cells as "" - treat them as missing
+            yield {k.strip(): v for k, v in record.items() if k and v not in ("", None)}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def _batches(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _row_values(lead: LeadCreate, keys: lead_dedup.LeadKeys, now: datetime) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": lead.tenant_id,
+        "agent_id": lead.agent_id,
+        "customer_name": lead.customer_name,
+        "phone": lead.phone,
+        "email": lead.email,
+        "source": lead.source,
+        "status": lead.status,
+        "notes": lead.notes,
+        "next_followup": lead.next_followup,
+        "created_at": now,
+        "updated_at": now,
+        "duplicate_of": None,
+        **keys.columns(),
+    }
+
+
+def _copy_rows(db: Session, rows: List[dict]) -> None:
+    """Load rows with PostgreSQL COPY on the session's own connection/transaction"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            "\\N" if row[col] is None else (row[col].isoformat() if isinstance(row[col], datetime) else row[col])
+            for col in COPY_COLUMNS
+        ])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY leads ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _dedup_batch(db: Session, valid: list, report: LeadImportReport) -> Tuple[list, List[dict]]:
+    """Drop rows to merge and flag possible duplicates, against the DB and earlier rows of the batch.
+
+    Returns the rows still to insert and the merge updates to apply after inserting.
+    """
+    by_tenant = defaultdict(list)
+    for item in valid:
+        by_tenant[item[1]["tenant_id"]].append(item)
+
+    kept, merges = [], []
+    for tenant_id, items in by_tenant.items():
+        db_index = lead_dedup.load_db_candidates(db, tenant_id, [keys for _, _, keys in items])
+        batch_index = lead_dedup.BlockingIndex()
+        for row_number, row, keys in items:
+            match_id, score = db_index.best_match(keys)
+            batch_match_id, batch_score = batch_index.best_match(keys)
+            if batch_score > score:
+                match_id, score = batch_match_id, batch_score
+            kind = lead_dedup.classify(score)
+            if lead_dedup.should_merge(kind):
+                merges.append({
+                    "b_id": match_id,
+                    **{f"b_{name}": row[name] for name in lead_dedup.MERGE_FIELDS},
+                    **{f"b_{column}": keys.columns()[column] for column in MERGE_KEY_COLUMNS},
+                })
+                report.merged += 1
+                continue
+            if kind:
+                row["duplicate_of"] = match_id
+                report.flagged += 1
+            batch_index.add(row["id"], keys)
+            kept.append((row_number, row, keys))
+    return kept, merges
+
+
+def _apply_merges(db: Session, merges: List[dict], now: datetime) -> None:
+    """Fill empty fields of the surviving leads in one executemany UPDATE.
+
+    The blocking-key columns follow the contact field they are derived from, as in
+    lead_dedup.merge_into, so merged-in details are found by later dedup lookups.
+    customer_name is never merged, so name_normalized stays as it is.
+    """
+    leads = Lead.__table__
+    stmt = update(leads).where(leads.c.id == bindparam("b_id")).values(
+        updated_at=now,
+        **{name: func.coalesce(leads.c[name], bindparam(f"b_{name}")) for name in lead_dedup.MERGE_FIELDS},
+        # SET expressions see the row as it was, so this tests the pre-merge contact field
+        **{column: case((leads.c[source].is_(None), bindparam(f"b_{column}")), else_=leads.c[column])
+           for column, source in MERGE_KEY_COLUMNS.items()}
+    )
+    db.execute(stmt, merges)
+
+
+def _load_chunk(db: Session, rows: List[dict]) -> None:
+    if db.get_bind().dialect.driver == "psycopg2":
+        _copy_rows(db, rows)
+    else:
+        db.execute(insert(Lead), rows)
+
+
+def _load_rows_individually(db: Session, rows: list, report: LeadImportReport) -> None:
+    """Fallback for a chunk the database rejected: isolate the bad rows with savepoints"""
+    for row_number, row, _ in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Lead), [row])
+            report.inserted += 1
+        except SQLAlchemyError as e:
+            _add_error(report, row_number, [str(getattr(e, "orig", e)).strip()])
+    db.commit()
+
+
+def _add_error(report: LeadImportReport, row_number: int, errors: List[str]) -> None:
+    report.failed += 1
+    if len(report.errors) < settings.LEAD_IMPORT_MAX_ERRORS:
+        report.errors.append(LeadImportError(row=row_number, errors=errors))
+    else:
+        report.errors_truncated = True
+
+
+def import_leads(
+    db: Session,
+    records: Iterator[dict],
+    tenant_id: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    batch_size: Optional[int] = None
+) -> LeadImportReport:
+    """Validate and bulk-load leads in chunked transactions, returning a per-row error report.
+
+    tenant_id / agent_id fill in rows that do not carry their own; a tenant_id
+    argument always wins so callers cannot import into another tenant.
+    """
+    batch_size = batch_size or settings.LEAD_IMPORT_BATCH_SIZE
+    report = LeadImportReport()
+    row_number = 0
+
+    for batch in _batches(records, batch_size):
+        valid = []
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for record in batch:
+            row_number += 1
+            report.total += 1
+            if not isinstance(record, dict) or PARSE_ERROR_KEY in record:
+                _add_error(report, row_number, [record.get(PARSE_ERROR_KEY) if isinstance(record, dict) else "row is not an object"])
+                continue
+            if tenant_id:
+                record["tenant_id"] = tenant_id
+            if agent_id:
+                record.setdefault("agent_id", agent_id)
+            try:
+                lead = LeadCreate.model_validate(record)
+            except ValidationError as e:
+                _add_error(report, row_number, [
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ])
+                continue
+            keys = lead_dedup.LeadKeys.build(lead.customer_name, lead.phone, lead.email)
+            valid.append((row_number, _row_values(lead, keys, now), keys))
+
+        merges = []
+        if settings.LEAD_DEDUP_POLICY != "off":
+            valid, merges = _dedup_batch(db, valid, report)
+        if not valid and not merges:
+            continue
+        try:
+            if valid:
+                _load_chunk(db, [row for _, row, _ in valid])
+            if merges:
+                _apply_merges(db, merges, now)
+            db.commit()
+            report.inserted += len(valid)
+        except (SQLAlchemyError, db.get_bind().dialect.loaded_dbapi.Error) as e:
+            db.rollback()
+            logger.warning(f"Lead import chunk ending at row {row_number} rejected, retrying row by row: {e}")
+            _load_rows_individually(db, valid, report)
+            if merges:
+                _apply_merges(db, merges, now)
+                db.commit()
+
+    logger.info(
+        f"Lead import finished: {report.inserted}/{report.total} inserted, {report.merged} merged, "
+        f"{report.flagged} flagged as possible duplicates, {report.failed} failed"
+    )
+    return report
@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, bindparam, desc, select
 from typing import Optional, List
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 import uuid
 import logging
 from decimal import Decimal
 
-from app.models.loan import Loan, LoanApplication, LoanDocument, LoanPayment, EMISchedule
-from app.models.user import User
+from app.models.loan import Loan, LoanApplication, LoanDocument, LoanPayment, EMISchedule, loan_application_ref_seq
+from app.core import jobs
+from app.core.config import settings
+from app.core.events import record_event
+from app.core.pubsub import publish_user_event
+from app.services import eligibility_service, repayment_service
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -25,6 +29,25 @@ from app.schemas.loan_management_schema import (
     UpcomingEMI
 )
 
+OPEN_LOAN_STATUSES = ("active", "overdue")
+PENDING_APPLICATION_STATUSES = ("under_review", "documents_pending", "approved")
+
+# Hot-path statements are built once at import; calls only bind parameters, so each
+# request skips rebuilding the ORM Query and the compiled SQL comes from the engine cache.
+_OPEN_LOAN_FOR_USER = select(Loan).where(
+    Loan.user_id == bindparam("user_id"), Loan.status.in_(OPEN_LOAN_STATUSES)
+).limit(1)
+_OPEN_LOAN = select(Loan).where(
+    Loan.id == bindparam("loan_id"), Loan.user_id == bindparam("user_id"), Loan.status.in_(OPEN_LOAN_STATUSES)
+).limit(1)
+_OPEN_LOAN_FOR_UPDATE = _OPEN_LOAN.with_for_update()
+_PENDING_APPLICATIONS = select(LoanApplication).where(
+    LoanApplication.user_id == bindparam("user_id"), LoanApplication.status.in_(PENDING_APPLICATION_STATUSES)
+).order_by(desc(LoanApplication.created_at))
+_APPLICATION_DOCUMENTS = select(LoanDocument).where(
+    LoanDocument.application_id.in_(bindparam("application_ids", expanding=True))
+)
+
 class LoanManagementService:
     
     @staticmethod
@@ -38,12 +61,7 @@ class LoanManagementService:
             raise ValueError("Invalid user ID format")
         
         # Check for active loans
-        active_loan = db.query(Loan).filter(
-            and_(
-                Loan.user_id == user_uuid,
-                Loan.status.in_(["active", "overdue"])
-            )
-        ).first()
+        active_loan = db.execute(_OPEN_LOAN_FOR_USER, {"user_id": user_uuid}).scalars().first()
         
         if active_loan:
             loan_details = LoanDetails(
@@ -64,22 +82,20 @@ class LoanManagementService:
                 loan_details=loan_details
             )
         
-        # Check for pending applications (GET ALL, not just first one)
-        pending_apps = db.query(LoanApplication).filter(
-            and_(
-                LoanApplication.user_id == user_uuid,
-                LoanApplication.status.in_(["under_review", "documents_pending", "approved"])
-            )
-        ).order_by(desc(LoanApplication.created_at)).all()  # Get all applications, newest first
+        # Check for pending applications (GET ALL, not just first one), newest first
+        pending_apps = db.execute(_PENDING_APPLICATIONS, {"user_id": user_uuid}).scalars().all()
         
         if pending_apps:
             pending_applications_list = []
             
+            # Documents of all the applications in one query
+            documents_by_app = {}
+            for doc in db.execute(_APPLICATION_DOCUMENTS, {"application_ids": [a.id for a in pending_apps]}).scalars():
+                documents_by_app.setdefault(doc.application_id, []).append(doc)
+            
             for pending_app in pending_apps:
                 # Get document status for each application
-                documents = db.query(LoanDocument).filter(
-                    LoanDocument.application_id == pending_app.id
-                ).all()
+                documents = documents_by_app.get(pending_app.id, [])
                 
                 doc_status_list = [
                     DocumentStatus(
@@ -170,8 +186,14 @@ class LoanManagementService:
         }
     
     @staticmethod
-    def create_loan_application(db: Session, user_id: str, application_data: LoanApplicationCreate) -> dict:
-        """Create a new loan application"""
+    def next_reference_number(db: Session) -> str:
+        """CRD<year><zero-padded sequence value>, unique by construction"""
+        seq = db.execute(loan_application_ref_seq.next_value()).scalar()
+        return f"CRD{datetime.now().year}{seq:08d}"
+    
+    @staticmethod
+    def create_loan_application(db: Session, user_id: str, application_data: LoanApplicationCreate, tenant_id=None) -> dict:
+        """Create a new loan application, scored for eligibility against the tenant's rules and products"""
         
         logger.info(f"=== CREATE LOAN APPLICATION DEBUG ===")
         logger.info(f"Received user_id: {user_id} (type: {type(user_id)})")
@@ -185,19 +207,25 @@ class LoanManagementService:
             logger.error(f"UUID conversion failed: {e}")
             raise ValueError("Invalid user ID format")
         
-        # Verify user exists
-        try:
-            user = db.query(User).filter(User.id == user_uuid).first()
-            if not user:
-                logger.error(f"User not found with ID: {user_uuid}")
-                raise ValueError("User not found")
-            logger.info(f"User found: {user.email}")
-        except Exception as e:
-            logger.error(f"User lookup failed: {e}")
-            raise
+        # The caller (route) has already resolved the user from the token; no second lookup here
+
+        # A double-tapped submit without an Idempotency-Key: hand back the application just created
+        duplicate = db.query(LoanApplication).filter(
+            LoanApplication.user_id == user_uuid,
+            LoanApplication.loan_type == application_data.loan_type,
+            LoanApplication.requested_amount == application_data.requested_amount,
+            LoanApplication.status == "under_review",
+            LoanApplication.created_at >= datetime.now(timezone.utc) - timedelta(seconds=settings.LOAN_APPLICATION_DUPLICATE_WINDOW_SECONDS)
+        ).order_by(desc(LoanApplication.created_at)).first()
+        if duplicate:
+            logger.info(f"Duplicate submission detected, returning application {duplicate.id}")
+            return {
+                "application_id": str(duplicate.id),
+                "reference_number": duplicate.reference_number,
+                "duplicate": True
+            }
         
-        # Generate reference number
-        reference_number = f"CRD{datetime.now().year}{str(uuid.uuid4())[:8].upper()}"
+        reference_number = LoanManagementService.next_reference_number(db)
         logger.info(f"Generated reference number: {reference_number}")
         
         # Create application object
@@ -228,6 +256,14 @@ class LoanManagementService:
             logger.error(traceback.format_exc())
             raise
         
+        eligibility = None
+        try:
+            eligibility = eligibility_service.score_application(db, new_application, tenant_id)
+            logger.info(f"Eligibility: {eligibility['decision']} (score {eligibility['score']})")
+        except Exception as e:
+            # Scoring is advisory; never block a submission on it
+            logger.error(f"Eligibility scoring failed: {e}")
+        
         # Add to database
         try:
             logger.info("Adding to database session...")
@@ -246,8 +282,15 @@ class LoanManagementService:
         
         result = {
             "application_id": str(new_application.id),
-            "reference_number": new_application.reference_number
+            "reference_number": new_application.reference_number,
+            "status": new_application.status
         }
+        publish_user_event(user_uuid, "application_status", {
+            "application_id": result["application_id"],
+            "status": new_application.status
+        })
+        if eligibility:
+            result["eligibility"] = {"decision": eligibility["decision"], "score": eligibility["score"]}
         logger.info(f"Returning result: {result}")
         return result
     
@@ -266,8 +309,16 @@ class LoanManagementService:
         if not application:
             return False
         
+        previous_status = application.status
         application.status = "cancelled"
+        record_event(db, "loan_application.status_changed", "loan_application", application.id, {
+            "user_id": str(application.user_id), "from": previous_status, "to": application.status
+        })
         db.commit()
+        publish_user_event(application.user_id, "application_status", {
+            "application_id": str(application.id),
+            "status": application.status
+        })
         return True
     
     @staticmethod
@@ -334,76 +385,60 @@ class LoanManagementService:
         )
     
     @staticmethod
-    def process_loan_payment(db: Session, user_id: str, payment_data: LoanPaymentCreate) -> dict:
-        """Process a loan payment"""
-        
-        # Verify loan belongs to user
-        loan = db.query(Loan).filter(
-            and_(
-                Loan.id == payment_data.loan_id,
-                Loan.user_id == user_id,
-                Loan.status == "active"
-            )
-        ).first()
-        
+    def get_active_loan(db: Session, user_id: str, loan_id: str, for_update: bool = False) -> Loan:
+        """Loan of the user that still accepts payments"""
+        stmt = _OPEN_LOAN_FOR_UPDATE if for_update else _OPEN_LOAN
+        loan = db.execute(stmt, {"loan_id": loan_id, "user_id": user_id}).scalars().first()
         if not loan:
             raise ValueError("Loan not found or not active")
+        return loan
+    
+    @staticmethod
+    def process_loan_payment(db: Session, user_id: str, payment_data: LoanPaymentCreate) -> dict:
+        """Process a loan payment: allocate to penalty, interest and principal; prepay or foreclose with any excess"""
         
-        # Get next EMI to calculate principal/interest split
-        next_emi = db.query(EMISchedule).filter(
-            and_(
-                EMISchedule.loan_id == payment_data.loan_id,
-                EMISchedule.is_paid == False
-            )
-        ).order_by(EMISchedule.due_date).first()
-        
-        if not next_emi:
-            raise ValueError("No pending EMI found")
-        
-        # Create payment record
-        payment = LoanPayment(
-            loan_id=payment_data.loan_id,
-            payment_date=date.today(),
-            amount_paid=payment_data.payment_amount,
-            principal_component=next_emi.principal_component,
-            interest_component=next_emi.interest_component,
+        # Row lock serializes concurrent payments on the same loan
+        loan = LoanManagementService.get_active_loan(db, user_id, payment_data.loan_id, for_update=True)
+        previous_status = loan.status
+        
+        payment, allocation = repayment_service.apply_payment(
+            db, loan, payment_data.payment_amount,
             payment_method=payment_data.payment_method,
             payment_reference=payment_data.payment_reference,
-            status="paid"
+            prepayment_mode=payment_data.prepayment_mode,
+            foreclose=payment_data.foreclose
         )
         
-        db.add(payment)
-        
-        # Update EMI as paid
-        next_emi.is_paid = True
-        next_emi.payment_date = date.today()
-        
-        # Update loan balance
-        loan.outstanding_balance -= next_emi.principal_component
-        loan.tenure_remaining -= 1
-        
-        # Update next due date
-        next_upcoming_emi = db.query(EMISchedule).filter(
-            and_(
-                EMISchedule.loan_id == payment_data.loan_id,
-                EMISchedule.is_paid == False
-            )
-        ).order_by(EMISchedule.due_date).first()
-        
-        if next_upcoming_emi:
-            loan.next_due_date = next_upcoming_emi.due_date
-        else:
-            # All EMIs paid, mark loan as completed
-            loan.status = "completed"
-        
+        record_event(db, "loan.payment_received", "loan", loan.id, {
+            "user_id": str(loan.user_id),
+            "payment_id": str(payment.id),
+            "amount_paid": float(payment.amount_paid),
+            "allocation": allocation,
+            "outstanding_balance": float(loan.outstanding_balance)
+        })
+        if loan.status != previous_status:
+            record_event(db, "loan.status_changed", "loan", loan.id, {
+                "user_id": str(loan.user_id), "from": previous_status, "to": loan.status
+            })
         db.commit()
         
-        return {
+        result = {
             "payment_id": str(payment.id),
             "amount_paid": float(payment.amount_paid),
+            "allocation": allocation,
             "remaining_balance": float(loan.outstanding_balance),
-            "next_due_date": loan.next_due_date.isoformat() if loan.status == "active" else None
+            "monthly_emi": float(loan.monthly_emi),
+            "tenure_remaining": loan.tenure_remaining,
+            "next_due_date": loan.next_due_date.isoformat() if loan.status in ("active", "overdue") else None
         }
+        publish_user_event(loan.user_id, "payment", {"loan_id": str(loan.id), "loan_status": loan.status, **result})
+        return result
+    
+    @staticmethod
+    def get_foreclosure_quote(db: Session, user_id: str, loan_id: str) -> dict:
+        """Amount needed to close the loan today"""
+        loan = LoanManagementService.get_active_loan(db, user_id, loan_id)
+        return repayment_service.foreclosure_quote(db, loan)
 
     @staticmethod
     def save_application_document(db: Session, application_id: str, document_type: str, file_name: str, user_id: str, file_path: str) -> dict:
@@ -450,12 +485,18 @@ class LoanManagementService:
             )
             
             db.add(document)
+            db.flush()
+            record_event(db, "loan_document.uploaded", "loan_application", application_uuid, {
+                "user_id": str(user_uuid), "document_id": str(document.id), "document_type": document_type
+            })
+            # Type sniffing, page count and previews happen in the job workers, not in the upload
+            jobs.enqueue(db, "documents.process", {"document_id": str(document.id)})
             db.commit()
             db.refresh(document)
             
             logger.info(f"Document saved successfully: {document.id}")
             
-            return {
+            result = {
                 "document_id": str(document.id),
                 "document_type": document_type,
                 "file_name": file_name,
@@ -463,6 +504,8 @@ class LoanManagementService:
                 "status": "uploaded",
                 "uploaded_at": document.uploaded_at.isoformat()
             }
+            publish_user_event(user_uuid, "document_status", {"application_id": str(application_uuid), **result})
+            return result
             
         except Exception as e:
             logger.error(f"Error saving document: {e}")
@@ -502,7 +545,10 @@ class LoanManagementService:
                 "file_name": document.file_name,
                 "file_path": document.file_path,
                 "status": document.status,
-                "uploaded_at": document.uploaded_at.isoformat()
+                "uploaded_at": document.uploaded_at.isoformat(),
+                "mime_type": document.mime_type,
+                "thumbnail_path": document.thumbnail_path,
+                "preview_path": document.preview_path
             }
             
         except Exception as e:
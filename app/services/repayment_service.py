@@ -0,0 +1,290 @@
+"""Loan repayment allocation, prepayment rescheduling and foreclosure quotes.
+
+A payment is applied to what is due - instalments with due_date <= today, or the
+next instalment when nothing is due yet - as penalty, then interest, then
+principal, oldest instalment first within each bucket. Whatever is left over
+prepays principal and the rest of the schedule is recomputed, keeping the EMI
+(reduce_tenure) or the tenure (reduce_emi). Unpaid schedule rows are read once as
+plain rows and written back with one executemany UPDATE and at most one DELETE.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core import finance
+from app.core.config import settings
+from app.models.loan import EMISchedule, Loan, LoanPayment
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+PREPAYMENT_MODES = ("reduce_tenure", "reduce_emi")
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class ScheduleRow:
+    """Mutable copy of an unpaid emi_schedule row; paid_amount covers penalty, then interest, then principal"""
+    id: object
+    emi_number: int
+    due_date: date
+    principal: Decimal
+    interest: Decimal
+    penalty: Decimal
+    paid: Decimal
+    dirty: bool = False
+
+    @property
+    def emi_amount(self) -> Decimal:
+        return self.principal + self.interest
+
+    @property
+    def total(self) -> Decimal:
+        return self.penalty + self.principal + self.interest
+
+    @property
+    def penalty_due(self) -> Decimal:
+        return self.penalty - min(self.paid, self.penalty)
+
+    @property
+    def interest_due(self) -> Decimal:
+        return self.interest - min(max(self.paid - self.penalty, ZERO), self.interest)
+
+    @property
+    def principal_due(self) -> Decimal:
+        return self.principal - max(self.paid - self.penalty - self.interest, ZERO)
+
+    @property
+    def is_paid(self) -> bool:
+        return self.paid >= self.total
+
+    def pay(self, amount: Decimal) -> None:
+        self.paid += amount
+        self.dirty = True
+
+
+_schedule = EMISchedule.__table__
+
+# Built once; each payment or quote only binds the loan id
+_UNPAID_SCHEDULE = (
+    select(_schedule.c.id, _schedule.c.emi_number, _schedule.c.due_date, _schedule.c.principal_component,
+           _schedule.c.interest_component, _schedule.c.penalty_component, _schedule.c.paid_amount)
+    .where(_schedule.c.loan_id == bindparam("loan_id"), _schedule.c.is_paid.is_(False))
+    .order_by(_schedule.c.emi_number)
+)
+_LAST_DUE_DATE = select(func.max(_schedule.c.due_date)).where(
+    _schedule.c.loan_id == bindparam("loan_id"), _schedule.c.due_date <= bindparam("as_of")
+)
+
+
+def load_schedule(db: Session, loan_id) -> List[ScheduleRow]:
+    rows = db.execute(_UNPAID_SCHEDULE, {"loan_id": loan_id}).all()
+    return [
+        ScheduleRow(r.id, r.emi_number, r.due_date, _money(r.principal_component), _money(r.interest_component),
+                    _money(r.penalty_component), _money(r.paid_amount))
+        for r in rows
+    ]
+
+
+def accrue_penalties(rows: List[ScheduleRow], as_of: date) -> None:
+    """Penal interest at LATE_PAYMENT_PENALTY_RATE_PCT p.a. on each overdue instalment, per day late"""
+    rate = Decimal(str(settings.LATE_PAYMENT_PENALTY_RATE_PCT))
+    for row in rows:
+        days = (as_of - row.due_date).days
+        if days <= 0:
+            break  # rows are in due-date order
+        penalty = _money(row.emi_amount * rate * days / Decimal(36500))
+        if penalty > row.penalty:
+            row.penalty = penalty
+            row.dirty = True
+
+
+def _due(rows: List[ScheduleRow], as_of: date) -> List[ScheduleRow]:
+    return [r for r in rows if r.due_date <= as_of] or rows[:1]
+
+
+def _allocate(rows: List[ScheduleRow], amount: Decimal) -> Tuple[Dict[str, Decimal], Decimal]:
+    applied = {"penalty": ZERO, "interest": ZERO, "principal": ZERO}
+    for bucket in ("penalty", "interest", "principal"):
+        for row in rows:
+            if amount <= 0:
+                return applied, ZERO
+            part = min(amount, getattr(row, f"{bucket}_due"))
+            if part > 0:
+                row.pay(part)
+                applied[bucket] += part
+                amount -= part
+    return applied, amount
+
+
+def _reschedule(future: List[ScheduleRow], balance: Decimal, rate, emi: Decimal,
+                mode: str) -> Tuple[List[ScheduleRow], Optional[Decimal]]:
+    """Fit `balance` onto the untouched future instalments; returns the rows to drop and the new EMI"""
+    if not future:
+        return [], None
+    if balance <= 0:
+        return future, None
+    if mode == "reduce_emi":
+        plan = finance.amortize(balance, rate, len(future)).schedule
+    else:
+        plan = finance.schedule_for_emi(balance, rate, emi)
+        if len(plan) > len(future):  # rounding pushed past the original tenure
+            plan = finance.amortize(balance, rate, len(future)).schedule
+    for row, new in zip(future, plan):
+        row.principal = _money(new.principal)
+        row.interest = _money(new.interest)
+        row.dirty = True
+    return future[len(plan):], _money(plan[0].emi)
+
+
+def _write_schedule(db: Session, loan_id, rows: List[ScheduleRow], dropped: List[ScheduleRow], paid_on: date) -> None:
+    # loan_id is the hash partition key: with it both statements touch a single emi_schedule partition
+    t = EMISchedule.__table__
+    params = [
+        {
+            "b_id": r.id, "b_principal": r.principal, "b_interest": r.interest, "b_emi": r.emi_amount,
+            "b_penalty": r.penalty, "b_paid_amount": r.paid, "b_is_paid": r.is_paid,
+            "b_payment_date": paid_on if r.is_paid else None,
+        }
+        for r in rows if r.dirty and r not in dropped
+    ]
+    if params:
+        db.execute(
+            update(t).where(t.c.loan_id == loan_id, t.c.id == bindparam("b_id")).values(
+                principal_component=bindparam("b_principal"), interest_component=bindparam("b_interest"),
+                emi_amount=bindparam("b_emi"), penalty_component=bindparam("b_penalty"),
+                paid_amount=bindparam("b_paid_amount"), is_paid=bindparam("b_is_paid"),
+                payment_date=bindparam("b_payment_date")
+            ),
+            params
+        )
+    if dropped:
+        db.execute(delete(t).where(t.c.loan_id == loan_id, t.c.id.in_([r.id for r in dropped])))
+
+
+def _quote(db: Session, loan: Loan, rows: List[ScheduleRow], as_of: date) -> Dict[str, Decimal]:
+    due = [r for r in rows if r.due_date <= as_of]
+    outstanding = _money(loan.outstanding_balance)
+    not_yet_due = outstanding - sum((r.principal_due for r in due), ZERO)
+    period_start = db.execute(_LAST_DUE_DATE, {"loan_id": loan.id, "as_of": as_of}).scalar() or (loan.created_at.date() if loan.created_at else as_of)
+    days = max((as_of - period_start).days, 0)
+    broken_interest = _money(not_yet_due * _money(loan.interest_rate) * days / Decimal(36500))
+    # Interest already paid early on the running instalment counts against the accrual
+    broken_interest = max(broken_interest - sum((r.interest - r.interest_due for r in rows if r.due_date > as_of), ZERO), ZERO)
+    quote = {
+        "principal_outstanding": outstanding,
+        "interest_due": sum((r.interest_due for r in due), ZERO),
+        "accrued_interest": broken_interest,
+        "penalty_due": sum((r.penalty_due for r in rows), ZERO),
+        "foreclosure_charge": _money(outstanding * Decimal(str(settings.FORECLOSURE_CHARGE_PCT)) / 100),
+    }
+    quote["total"] = sum(quote.values(), ZERO)
+    return quote
+
+
+def foreclosure_quote(db: Session, loan: Loan, as_of: date = None) -> dict:
+    """Amount that closes the loan today: principal, due and accrued interest, penalties and charges"""
+    as_of = as_of or date.today()
+    rows = load_schedule(db, loan.id)
+    accrue_penalties(rows, as_of)
+    quote = _quote(db, loan, rows, as_of)
+    return {"loan_id": str(loan.id), "as_of": as_of.isoformat(), **{k: float(v) for k, v in quote.items()}}
+
+
+def apply_payment(db: Session, loan: Loan, amount, payment_method: str = None, payment_reference: str = None,
+                  prepayment_mode: str = None, foreclose: bool = False, as_of: date = None) -> Tuple[LoanPayment, dict]:
+    """Allocate a payment, rewrite the schedule in bulk and update the loan (caller locks the loan and commits)"""
+    as_of = as_of or date.today()
+    amount = _money(amount)
+    mode = prepayment_mode or settings.PREPAYMENT_DEFAULT_MODE
+    if mode not in PREPAYMENT_MODES:
+        raise ValueError(f"prepayment_mode must be one of {', '.join(PREPAYMENT_MODES)}")
+
+    rows = load_schedule(db, loan.id)
+    if not rows:
+        raise ValueError("No pending EMI found")
+    accrue_penalties(rows, as_of)
+    outstanding = _money(loan.outstanding_balance)
+    new_emi = None
+
+    if foreclose:
+        quote = _quote(db, loan, rows, as_of)
+        if amount != quote["total"]:
+            raise ValueError(f"Foreclosure amount must be {quote['total']}")
+        due = [r for r in rows if r.due_date <= as_of]
+        for row in due:
+            row.pay(row.total - row.paid)
+        dropped = [r for r in rows if r not in due]
+        prepaid = sum((r.principal_due for r in dropped), ZERO)
+        applied = {
+            "penalty": quote["penalty_due"] + quote["foreclosure_charge"],
+            "interest": quote["interest_due"] + quote["accrued_interest"],
+            "principal": outstanding - prepaid,
+        }
+        payment_type = "foreclosure"
+        principal_left = ZERO
+    else:
+        applied, remainder = _allocate(_due(rows, as_of), amount)
+        principal_left = outstanding - applied["principal"]
+        if remainder > 0 and remainder >= principal_left:
+            raise ValueError("Payment would repay the whole loan; request a foreclosure quote and foreclose instead")
+        prepaid = remainder
+        dropped = []
+        if prepaid > 0:
+            principal_left -= prepaid
+            dropped, new_emi = _reschedule(
+                [r for r in rows if not r.is_paid], principal_left, loan.interest_rate, _money(loan.monthly_emi), mode
+            )
+            payment_type = "prepayment"
+        elif any(r.paid > 0 and not r.is_paid for r in rows):
+            payment_type = "partial"
+        else:
+            payment_type = "emi"
+
+    _write_schedule(db, loan.id, rows, dropped, as_of)
+    remaining = [r for r in rows if not r.is_paid and r not in dropped]
+
+    payment = LoanPayment(
+        loan_id=loan.id,
+        payment_date=as_of,
+        amount_paid=amount,
+        principal_component=applied["principal"] + prepaid,
+        interest_component=applied["interest"],
+        penalty_component=applied["penalty"],
+        prepayment_component=prepaid,
+        payment_type=payment_type,
+        payment_method=payment_method,
+        payment_reference=payment_reference,
+        status="paid"
+    )
+    db.add(payment)
+
+    loan.outstanding_balance = principal_left
+    loan.tenure_remaining = len(remaining)
+    if new_emi is not None:
+        loan.monthly_emi = new_emi
+    if remaining:
+        loan.next_due_date = remaining[0].due_date
+    else:
+        loan.status = "closed" if foreclose else "completed"
+    db.flush()
+
+    allocation = {
+        "payment_type": payment_type,
+        "penalty": float(applied["penalty"]),
+        "interest": float(applied["interest"]),
+        "principal": float(applied["principal"]),
+        "prepayment": float(prepaid),
+    }
+    logger.info(f"Payment {payment.id} on loan {loan.id}: {allocation}")
+    return payment, allocation
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+CPU cost vs bytes saved for response compression on representative API payloads.
+
+Usage:
+    python -m benchmarks.compression [--rows 200] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def admin_applications_payload(rows: int, rng: random.Random) -> dict:
+    items = []
+    for _ in range(rows):
+        items.append({
+            "application_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "user_name": rng.choice(["Asha Rao", "Vikram Singh", "Meera Iyer", "Rahul Gupta"]),
+            "loan_type": rng.choice(["Personal Loan", "Business Loan", "Home Loan", "Car Loan"]),
+            "requested_amount": float(rng.randrange(50_000, 5_000_000, 1000)),
+            "status": rng.choice(["under_review", "documents_pending", "approved"]),
+            "documents": [
+                {
+                    "document_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "document_type": doc_type,
+                    "file_name": f"{doc_type}_{rng.randrange(10**6)}.pdf",
+                    "status": "uploaded"
+                } for doc_type in ("aadhar", "pan", "income_proof")
+            ]
+        })
+    return {"total": len(items), "items": items}
+
+
+def loan_status_payload(applications: int, rng: random.Random) -> dict:
+    apps = []
+    for _ in range(applications):
+        app_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        docs = [
+            {
+                "document_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "document_type": doc_type,
+                "file_name": f"{doc_type}.pdf",
+                "file_path": f"/srv/credosafe/uploads/{app_id}/{doc_type}.pdf",
+                "status": "uploaded",
+                "uploaded_at": datetime(2025, 1, 1).isoformat()
+            } for doc_type in ("aadhar", "pan", "income_proof", "bank_statement")
+        ]
+        apps.append({
+            "application_id": app_id,
+            "loan_type": "Personal Loan",
+            "requested_amount": "250000.00",
+            "application_date": date(2025, 1, 1).isoformat(),
+            "current_step": 2,
+            "progress_steps": ["Applied", "Documents", "Verification", "Approval"],
+            "status": "documents_pending",
+            "documents_required": [{"document_type": d["document_type"], "status": d["status"]} for d in docs],
+            "documents": docs
+        })
+    return {"status": "success", "data": {"user_status": "pending_application", "pending_application": apps[0], "pending_applications": apps}}
+
+
+def loan_list_payload(rows: int, rng: random.Random) -> dict:
+    start = date(2025, 1, 5)
+    return {
+        "total": rows,
+        "items": [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "tenant_id": "6f1c2a52-6f0b-4b7e-8d57-3f3a8b1f0c11",
+                "name": f"Product {i}",
+                "interest_rate": round(rng.uniform(9, 24), 2),
+                "min_amount": 10000.0,
+                "max_amount": 2500000.0,
+                "tenure_months": [6, 12, 24, 36],
+                "active": True,
+                "created_at": (start + timedelta(days=i)).isoformat()
+            } for i in range(rows)
+        ]
+    }
+
+
+def codecs():
+    yield "gzip-1", lambda b: gzip.compress(b, compresslevel=1, mtime=0)
+    yield "gzip-6", lambda b: gzip.compress(b, compresslevel=6, mtime=0)
+    yield "gzip-9", lambda b: gzip.compress(b, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield "br-4", lambda b: brotli.compress(b, quality=4)
+        yield "br-11", lambda b: brotli.compress(b, quality=11)
+
+
+def bench(body: bytes, fn, repeat: int):
+    best = float("inf")
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(body)
+        best = min(best, time.perf_counter() - t0)
+    return best, len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = {
+        "admin_loan_applications": admin_applications_payload(args.rows, rng),
+        "user_loan_status": loan_status_payload(max(1, args.rows // 50), rng),
+        "loan_products_list": loan_list_payload(args.rows, rng),
+    }
+    if brotli is None:
+        print("(brotli not installed - showing gzip only)")
+
+    print(f"{'payload':<26}{'codec':<8}{'raw':>10}{'compressed':>12}{'saved':>8}{'cpu ms':>9}{'MB/s':>8}")
+    for name, payload in payloads.items():
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        for codec, fn in codecs():
+            seconds, size = bench(body, fn, args.repeat)
+            saved = 100.0 * (1 - size / len(body))
+            throughput = len(body) / seconds / 1e6 if seconds else 0.0
+            print(f"{name:<26}{codec:<8}{len(body):>10}{size:>12}{saved:>7.1f}%{seconds * 1000:>9.3f}{throughput:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
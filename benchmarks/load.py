@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Scripted load against a running API using the logins in the manifest written by
+app/cli/generate_dataset.py.
+
+Each virtual user repeats: login -> loan-status -> loan details -> payment ->
+document view, over its own keep-alive connection, until --duration elapses.
+Throughput and latency percentiles of the successful (2xx) responses are reported
+per endpoint, with failed requests counted separately by status so an error path
+never passes for a fast endpoint; --json writes the same numbers for comparing runs.
+
+The payment step pays a small partial amount (--payment-amount, default 1.00) on
+the user's own loan, so a run can go on for as long as needed without closing a
+loan or hitting the payment errors. It still writes: regenerate the dataset to
+compare runs from the same starting point, or leave "payment" out of --steps.
+
+Usage:
+    python -m app.cli.generate_dataset --create-schema  # once, against a local Postgres
+    uvicorn app.main:app --workers 4                    # in another shell
+    python -m benchmarks.load [--base-url http://127.0.0.1:8000] [--users 20] [--duration 60]
+                              [--steps login,status,details,payment,document] [--payment-amount 1]
+                              [--json results.json]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+STEPS = ("login", "status", "details", "payment", "document")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)  # successful (2xx) requests only
+        self.failures: Dict[str, int] = defaultdict(int)  # non-2xx responses and connection errors (status 0)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        with self._lock:
+            self.statuses[name][status] += 1
+            if 200 <= status < 300:
+                self.latencies[name].append(seconds)
+            else:
+                self.failures[name] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        result = {}
+        for name in sorted(self.statuses, key=lambda n: STEPS.index(n) if n in STEPS else len(STEPS)):
+            values = sorted(self.latencies[name])
+            result[name] = {
+                "requests": len(values) + self.failures[name],
+                "ok": len(values),
+                "failed": self.failures[name],
+                "rps": round(len(values) / elapsed, 1),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+                "statuses": dict(self.statuses[name]),
+            }
+        return result
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, base_url: str, account: dict, password: str, steps, deadline: float, recorder: Recorder,
+                 think_seconds: float, rng: random.Random, payment_amount: float = 1.0):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.account = account
+        self.password = password
+        self.steps = steps
+        self.deadline = deadline
+        self.recorder = recorder
+        self.think_seconds = think_seconds
+        self.rng = rng
+        # Never a full EMI: repeated EMIs would close the loan and every later payment would fail
+        self.payment_amount = round(min(payment_amount, account["monthly_emi"] / 2), 2)
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.token: Optional[str] = None
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self.conn = cls(self.host, self.port, timeout=30)
+
+    def request(self, name: str, method: str, path: str, body: dict = None) -> tuple:
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self._connect()
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            data, status = b"", 0
+        self.recorder.record(name, time.perf_counter() - started, status)
+        return status, data
+
+    def run(self):
+        account = self.account
+        while time.monotonic() < self.deadline:
+            if "login" in self.steps or self.token is None:
+                self.token = None
+                status, data = self.request("login", "POST", "/v1/auth/login",
+                                            {"email": account["email"], "password": self.password})
+                if status != 200:
+                    time.sleep(1)
+                    continue
+                self.token = json.loads(data)["access_token"]
+            if "status" in self.steps:
+                self.request("status", "GET", "/v1/user/loan-status")
+            if "details" in self.steps:
+                self.request("details", "GET", f"/v1/loan/details/{account['loan_id']}")
+            if "payment" in self.steps:
+                self.request("payment", "POST", "/v1/loan/payment", {
+                    "loan_id": account["loan_id"], "payment_amount": self.payment_amount,
+                    "payment_method": "upi", "payment_reference": f"LOAD{self.rng.randrange(10**12):012d}"
+                })
+            if "document" in self.steps and account["document_ids"]:
+                self.request("document", "GET", f"/v1/loan/document/{self.rng.choice(account['document_ids'])}/view")
+            if self.think_seconds:
+                time.sleep(self.rng.uniform(0, 2 * self.think_seconds))
+        if self.conn is not None:
+            self.conn.close()
+
+
+def print_report(summary: Dict[str, dict], elapsed: float) -> None:
+    print("\nSuccessful (2xx) requests; latencies exclude failures")
+    print(f"{'endpoint':10} {'ok':>9} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, s in summary.items():
+        print(f"{name:10} {s['ok']:>9} {s['rps']:>8} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8} {s['max_ms']:>8}")
+    failed = {name: s for name, s in summary.items() if s["failed"]}
+    if failed:
+        print("\nFailed requests (status 0: connection error)")
+        for name, s in failed.items():
+            statuses = ", ".join(f"{status}: {n}" for status, n in sorted(s["statuses"].items())
+                                 if not 200 <= status < 300)
+            print(f"{name:10} {s['failed']:>9}  {statuses}")
+    ok = sum(s["ok"] for s in summary.values())
+    total = sum(s["requests"] for s in summary.values())
+    print(f"\n{ok} of {total} requests succeeded in {elapsed:.1f}s ({ok / elapsed:.1f} rps)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--manifest", default="benchmarks/manifest.json")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--steps", default=",".join(STEPS), help="subset of " + ",".join(STEPS))
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between iterations, seconds")
+    parser.add_argument("--payment-amount", type=float, default=1.0,
+                        help="amount of each payment (at most half the loan's EMI)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", default=None, help="also write the results here")
+    args = parser.parse_args()
+
+    steps = [s.strip() for s in args.steps.split(",") if s.strip()]
+    unknown = set(steps) - set(STEPS)
+    if unknown:
+        parser.error(f"unknown steps: {', '.join(sorted(unknown))}")
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    accounts = manifest["users"]
+    if len(accounts) < args.users:
+        parser.error(f"manifest has {len(accounts)} users, fewer than --users {args.users}")
+
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+    users = [
+        VirtualUser(args.base_url, account, manifest["password"], steps, deadline, recorder, args.think,
+                    random.Random(rng.getrandbits(64)), args.payment_amount)
+        for account in rng.sample(accounts, args.users)
+    ]
+    started = time.perf_counter()
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    elapsed = time.perf_counter() - started
+
+    summary = recorder.summary(elapsed)
+    print_report(summary, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"base_url": args.base_url, "users": args.users, "duration": elapsed, "steps": steps,
+                       "endpoints": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Per-call overhead of the hot loan queries: the ORM Query form they used to be
+rebuilt in on every call vs the prebuilt select() statements now in
+loan_management_service, repayment_service and crud.
+
+By default it runs against an in-memory SQLite database, where executing the
+query costs next to nothing, so the numbers are essentially Python-side
+overhead (statement construction, cache-key generation, parameter processing,
+result handling). --url runs the same cases against a Postgres database (the
+tables must exist; rows are added and rolled back).
+
+Usage:
+    python -m benchmarks.query_overhead [--iterations 5000] [--url postgresql://...]
+"""
+
+import argparse
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import and_, create_engine, desc
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud
+from app.models.loan import EMISchedule, Loan, LoanApplication, LoanDocument
+from app.models.user import User
+from app.services import repayment_service
+from app.services.loan_management_service import LoanManagementService
+
+import app.models  # noqa: F401  (register all mappers)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+# The forms the hot paths had before
+
+def user_by_email_query(db, email):
+    return db.query(User).filter(User.email == email).first()
+
+
+def open_loan_query(db, user_id, loan_id):
+    return db.query(Loan).filter(
+        and_(Loan.id == loan_id, Loan.user_id == user_id, Loan.status.in_(["active", "overdue"]))
+    ).with_for_update().first()
+
+
+def next_emi_query(db, loan_id):
+    # process_loan_payment ran this twice per payment
+    for _ in range(2):
+        db.query(EMISchedule).filter(
+            and_(EMISchedule.loan_id == loan_id, EMISchedule.is_paid == False)  # noqa: E712
+        ).order_by(EMISchedule.due_date).first()
+
+
+def loan_status_query(db, user_id):
+    loan = db.query(Loan).filter(
+        and_(Loan.user_id == user_id, Loan.status.in_(["active", "overdue"]))
+    ).first()
+    if loan:
+        return loan
+    apps = db.query(LoanApplication).filter(
+        and_(LoanApplication.user_id == user_id,
+             LoanApplication.status.in_(["under_review", "documents_pending", "approved"]))
+    ).order_by(desc(LoanApplication.created_at)).all()
+    return [db.query(LoanDocument).filter(LoanDocument.application_id == a.id).all() for a in apps]
+
+
+def seed(db) -> dict:
+    borrower, applicant = uuid.uuid4(), uuid.uuid4()
+    db.add_all([
+        User(id=borrower, name="Bench Borrower", email="borrower@example.com", role="customer"),
+        User(id=applicant, name="Bench Applicant", email="applicant@example.com", role="customer"),
+    ])
+    db.flush()
+    loan_id = uuid.uuid4()
+    db.add(Loan(
+        id=loan_id, user_id=borrower, account_number=f"QB{loan_id.hex[:12]}", loan_type="Personal Loan",
+        principal_amount=100000, disbursed_amount=100000, outstanding_balance=80000, monthly_emi=4707,
+        interest_rate=12, tenure_months=24, tenure_remaining=19, next_due_date=date.today(), status="active"
+    ))
+    db.flush()
+    for n in range(1, 25):
+        db.add(EMISchedule(
+            loan_id=loan_id, emi_number=n, due_date=date.today() + timedelta(days=30 * (n - 6)), emi_amount=4707,
+            principal_component=3707, interest_component=1000, is_paid=n <= 5
+        ))
+    for i in range(3):
+        application_id = uuid.uuid4()
+        db.add(LoanApplication(
+            id=application_id, user_id=applicant, reference_number=f"QB{application_id.hex[:12]}",
+            loan_type="Personal Loan", requested_amount=50000, status="under_review"
+        ))
+        db.flush()
+        for doc_type in ("pan", "income_proof"):
+            db.add(LoanDocument(application_id=application_id, user_id=applicant, document_type=doc_type,
+                                file_name=f"{doc_type}.pdf", file_path="/dev/null"))
+    db.flush()
+    return {"borrower": borrower, "applicant": applicant, "loan_id": loan_id}
+
+
+def measure(fn, iterations: int) -> float:
+    for _ in range(min(100, iterations)):  # fill the compiled cache first
+        fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url, future=True, query_cache_size=settings.DB_QUERY_CACHE_SIZE)
+    if engine.dialect.name == "sqlite":
+        tables = [t.__table__ for t in (User, Loan, LoanApplication, LoanDocument, EMISchedule)]
+        app.models.Base.metadata.create_all(engine, tables=tables)
+
+    with Session(engine) as db:
+        ids = seed(db)
+        borrower, applicant, loan_id = ids["borrower"], ids["applicant"], ids["loan_id"]
+        cases = [
+            ("user by email",
+             lambda: user_by_email_query(db, "borrower@example.com"),
+             lambda: crud.get_user_by_email(db, "borrower@example.com")),
+            ("active loan (for update)",
+             lambda: open_loan_query(db, borrower, loan_id),
+             lambda: LoanManagementService.get_active_loan(db, borrower, loan_id, for_update=True)),
+            ("payment schedule read",
+             lambda: next_emi_query(db, loan_id),
+             lambda: repayment_service.load_schedule(db, loan_id)),
+            ("loan status, 3 pending apps",
+             lambda: loan_status_query(db, applicant),
+             lambda: LoanManagementService.get_user_loan_status(db, str(applicant))),
+        ]
+        print(f"{'case':30} {'before us':>10} {'after us':>10} {'change':>8}")
+        for name, before, after in cases:
+            b, a = measure(before, args.iterations), measure(after, args.iterations)
+            print(f"{name:30} {b:>10.1f} {a:>10.1f} {(a - b) / b * 100:>+7.0f}%")
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()